@@ -0,0 +1,6 @@
+"""Benchmarks, in the style of `asv <https://asv.readthedocs.io>`_.
+
+Each ``bench_*`` module holds classes with ``time_*`` methods, an optional
+``setup``, and optional ``params`` and ``param_names``. Run them with asv, or
+offline with ``python -m benchmarks.run``.
+"""
@@ -0,0 +1,28 @@
+"""Types shared by the benchmarks."""
+
+from __future__ import annotations
+
+from override_toformat.mixin import ToFormatOverloadMixin
+from override_toformat.overload import ToFormatOverloader
+
+
+def convert(cls: type, obj: object) -> object:
+    """Trivial converter, so the benchmarks time the library."""
+    return obj
+
+
+def hierarchy(depth: int, /) -> list[type[ToFormatOverloadMixin]]:
+    """Make a chain of ``depth`` mixin classes, each subclassing the last.
+
+    The first class has a fresh ``FMT_OVERLOADS``.
+    """
+    base = type("Class0", (ToFormatOverloadMixin,), {"FMT_OVERLOADS": ToFormatOverloader()})
+    classes: list[type[ToFormatOverloadMixin]] = [base]
+    for i in range(1, depth):
+        classes.append(type(f"Class{i}", (classes[-1],), {}))
+    return classes
+
+
+def formats(n: int, /, prefix: str = "Format") -> list[type]:
+    """Make ``n`` unrelated classes."""
+    return [type(f"{prefix}{i}", (), {}) for i in range(n)]
@@ -0,0 +1,91 @@
+"""Cost of validating constraints."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from override_toformat.constraints import (
+    AnyOf,
+    Between,
+    Contravariant,
+    Covariant,
+    Invariant,
+    OneOfExact,
+    TypeConstraint,
+)
+from override_toformat.overload import ToFormatOverloader
+
+from ._data import convert, formats, hierarchy
+
+
+class TimeValidateType:
+    """``validate_type`` of each constraint class, for a type that passes."""
+
+    params = ["Invariant", "Covariant", "Contravariant", "Between"]
+    param_names = ["constraint"]
+
+    def setup(self, name: str) -> None:
+        root, mid, leaf = hierarchy(3)
+        self.arg = mid
+        constraints: dict[str, TypeConstraint] = {
+            "Invariant": Invariant(mid),
+            "Covariant": Covariant(root),
+            "Contravariant": Contravariant(leaf),
+            "Between": Between(leaf, root),
+        }
+        self.constraint = constraints[name]
+
+    def time_validate_type(self, name: str) -> None:
+        self.constraint.validate_type(self.arg)
+
+
+class LoopAnyOf(TypeConstraint):
+    """A hand-written "any of these formats" constraint, looping in Python."""
+
+    def __init__(self, *bounds: type) -> None:
+        self.bounds = bounds
+
+    def validate_type(self, arg_type: type, /) -> bool:
+        """Validate the argument type."""
+        return any(issubclass(arg_type, b) for b in self.bounds)
+
+
+class TimeAnyOf:
+    """Checking a type against ``n`` formats, for the last format."""
+
+    params = (["loop", "AnyOf", "OneOfExact", "AnyOf(Sequence)"], [5, 50])
+    param_names = ["constraint", "n"]
+
+    def setup(self, name: str, n: int) -> None:
+        bounds = formats(n)
+        self.arg = bounds[-1]
+        constraints: dict[str, TypeConstraint] = {
+            "loop": LoopAnyOf(*bounds),
+            "AnyOf": AnyOf(*bounds),
+            "OneOfExact": OneOfExact(*bounds),
+            # An ABC bound, whose verdicts are cached.
+            "AnyOf(Sequence)": AnyOf(Sequence, *bounds),
+        }
+        self.constraint = constraints[name]
+
+    def time_validate_type(self, name: str, n: int) -> None:
+        self.constraint.validate_type(self.arg)
+
+
+class TimeValidate:
+    """``Implements.validate``, with and without a memoized verdict."""
+
+    def setup(self) -> None:
+        (source,) = formats(1, prefix="Source")
+        (self.target,) = formats(1)
+        overloader = ToFormatOverloader()
+        overloader.implements(to_format=self.target, from_format=source)(convert)
+        self.impl = overloader.resolve(source, self.target)
+        self.obj = source()
+
+    def time_validate_warm(self) -> None:
+        self.impl.validate(self.obj, self.target)
+
+    def time_validate_cold(self) -> None:
+        object.__setattr__(self.impl, "_verdicts", None)
+        self.impl.validate(self.obj, self.target)
@@ -0,0 +1,124 @@
+"""Latency of ``to_format`` and its dispatch, against the baselines."""
+
+from __future__ import annotations
+
+from functools import singledispatch
+from typing import Any
+
+from override_toformat.overload import ToFormatOverloader
+
+from ._data import convert, formats, hierarchy
+
+
+class TimeToFormat:
+    """Convert an instance of the leaf of a ``depth``-deep hierarchy.
+
+    The implementation is registered for the root, so dispatch walks the whole
+    method resolution order when the caches are cold.
+    """
+
+    params = [1, 3, 10]
+    param_names = ["depth"]
+
+    def setup(self, depth: int) -> None:
+        classes = hierarchy(depth)
+        (self.target,) = formats(1)
+        self.overloader = classes[0].FMT_OVERLOADS
+        self.overloader.implements(to_format=self.target, from_format=classes[0])(convert)
+        self.leaf = classes[-1]
+        self.obj = self.leaf()
+        self.dispatcher = self.overloader[self.target]
+        self.obj.to_format(self.target)  # warm the caches
+
+    def time_to_format(self, depth: int) -> None:
+        self.obj.to_format(self.target)
+
+    def time_resolve_warm(self, depth: int) -> None:
+        self.overloader.resolve(self.leaf, self.target)
+
+    def time_resolve_cold(self, depth: int) -> None:
+        self.overloader._resolved.clear()  # noqa: SLF001
+        self.overloader._registry.state._cache.clear()  # noqa: SLF001
+        self.overloader.resolve(self.leaf, self.target)
+
+    def time_dispatch_warm(self, depth: int) -> None:
+        self.dispatcher.dispatch(self.leaf)
+
+    def time_dispatch_cold(self, depth: int) -> None:
+        self.overloader._registry.state._cache.clear()  # noqa: SLF001
+        self.dispatcher.dispatch(self.leaf)
+
+
+class TimeBaselines:
+    """What ``to_format`` is measured against, on the same hierarchy."""
+
+    params = [1, 3, 10]
+    param_names = ["depth"]
+
+    def setup(self, depth: int) -> None:
+        classes = hierarchy(depth)
+        (self.target,) = formats(1)
+        self.obj = classes[-1]()
+
+        @singledispatch
+        def dispatcher(obj: object, cls: type) -> Any:
+            raise NotImplementedError
+
+        dispatcher.register(classes[0], lambda obj, cls: convert(cls, obj))
+        self.singledispatch = dispatcher
+
+    def time_direct_call(self, depth: int) -> None:
+        convert(self.target, self.obj)
+
+    def time_singledispatch(self, depth: int) -> None:
+        self.singledispatch(self.obj, self.target)
+
+
+class TimeInstrumented:
+    """``to_format`` with :meth:`ToFormatOverloader.instrument` on."""
+
+    def setup(self) -> None:
+        (cls,) = hierarchy(1)
+        (self.target,) = formats(1)
+        cls.FMT_OVERLOADS.implements(to_format=self.target, from_format=cls)(convert)
+        cls.FMT_OVERLOADS.instrument()
+        self.obj = cls()
+
+    def time_to_format(self) -> None:
+        self.obj.to_format(self.target)
+
+
+class TimeTargetsFor:
+    """The formats a type can be converted to, out of ``n`` registered formats.
+
+    One in ten formats has an implementation from the source type. The scan
+    is the alternative without the indexes: trying every registered format.
+    """
+
+    params = [10, 100, 1000]
+    param_names = ["n"]
+
+    def setup(self, n: int) -> None:
+        (self.source,) = formats(1, prefix="Source")
+        (other,) = formats(1, prefix="Other")
+        self.overloader = ToFormatOverloader()
+        for i, fmt in enumerate(formats(n)):
+            from_format = self.source if i % 10 == 0 else other
+            self.overloader.implements(to_format=fmt, from_format=from_format)(convert)
+        self.overloader.targets_for(self.source)
+
+    def time_targets_for(self, n: int) -> None:
+        self.overloader.targets_for(self.source)
+
+    def time_targets_for_cold(self, n: int) -> None:
+        self.overloader._registry.state._clear_caches(bases=True)  # noqa: SLF001
+        self.overloader.targets_for(self.source)
+
+    def time_scan(self, n: int) -> None:
+        targets = []
+        for fmt, dispatcher in self.overloader.items():
+            try:
+                dispatcher.dispatch(self.source)
+            except NotImplementedError:
+                continue
+            targets.append(fmt)
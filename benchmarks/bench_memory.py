@@ -0,0 +1,66 @@
+"""Memory held by registrations."""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+from override_toformat.overload import ToFormatOverloader
+
+from ._data import convert, formats
+
+
+class TrackRegistration:
+    """Bytes allocated per registration, over ``overloaders`` overloaders of 20 x 20 pairs."""
+
+    params = [1, 10]
+    param_names = ["overloaders"]
+
+    def setup(self, n: int) -> None:
+        self.sources = formats(20, prefix="Source")
+        self.formats = formats(20)
+
+    def track_bytes_per_registration(self, n: int) -> float:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            overloaders = [ToFormatOverloader() for _ in range(n)]
+            for overloader in overloaders:
+                for fmt in self.formats:
+                    for src in self.sources:
+                        overloader.implements(to_format=fmt, from_format=src)(convert)
+            gc.collect()
+            used = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+        return used / (n * len(self.formats) * len(self.sources))
+
+    track_bytes_per_registration.unit = "bytes"  # type: ignore[attr-defined]
+
+
+class TrackFormats:
+    """Bytes allocated per format, registering one implementation each for ``n`` formats."""
+
+    params = [100, 1000]
+    param_names = ["n"]
+
+    def setup(self, n: int) -> None:
+        (self.source,) = formats(1, prefix="Source")
+        self.formats = formats(n)
+
+    def track_bytes_per_format(self, n: int) -> float:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            overloader = ToFormatOverloader()
+            for fmt in self.formats:
+                overloader.implements(to_format=fmt, from_format=self.source)(convert)
+            gc.collect()
+            used = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+        return used / n
+
+    track_bytes_per_format.unit = "bytes"  # type: ignore[attr-defined]
@@ -0,0 +1,72 @@
+"""Cost of registering implementations."""
+
+from __future__ import annotations
+
+from itertools import product
+
+from override_toformat.overload import FrozenToFormatOverloader, ToFormatOverloader
+
+from ._data import convert, formats
+
+
+class TimeImplements:
+    """Register every pair of ``formats`` formats and ``sources`` sources."""
+
+    params = ([1, 10, 50], [1, 10, 50])
+    param_names = ["formats", "sources"]
+
+    def setup(self, n_formats: int, n_sources: int) -> None:
+        self.formats = formats(n_formats)
+        self.sources = formats(n_sources, prefix="Source")
+
+    def time_implements(self, n_formats: int, n_sources: int) -> None:
+        overloader = ToFormatOverloader()
+        for fmt in self.formats:
+            for src in self.sources:
+                overloader.implements(to_format=fmt, from_format=src)(convert)
+
+
+class TimeRegisterWarm:
+    """Register ``n`` implementations with ``resolved`` pairs in the resolution cache.
+
+    Each registration scans the cache for stale pairs, unless registered
+    together with ``register_many``.
+    """
+
+    params = ([10, 100], [100, 1000])
+    param_names = ["n", "resolved"]
+
+    def setup(self, n: int, resolved: int) -> None:
+        self.overloader = ToFormatOverloader()
+        warm = formats(10, prefix="Warm")
+        sources = formats(resolved // 10, prefix="Source")
+        for fmt in warm:
+            for src in sources:
+                self.overloader.implements(to_format=fmt, from_format=src)(convert)
+                self.overloader.resolve(src, fmt)
+        self.table = dict.fromkeys(zip(formats(n, prefix="New"), formats(n)), convert)
+
+    def time_implements(self, n: int, resolved: int) -> None:
+        for (src, fmt), converter in self.table.items():
+            self.overloader.implements(to_format=fmt, from_format=src)(converter)
+
+    def time_register_many(self, n: int, resolved: int) -> None:
+        self.overloader.register_many(self.table)
+
+
+class TimeStartup:
+    """Build a frozen overloader of ``n`` formats and sources, or load its snapshot."""
+
+    params = [10, 50]
+    param_names = ["n"]
+
+    def setup(self, n: int) -> None:
+        self.overloader = ToFormatOverloader()
+        self.overloader.register_many(dict.fromkeys(product(formats(n, prefix="Source"), formats(n)), convert))
+        self.snapshot = self.overloader.snapshot()
+
+    def time_freeze(self, n: int) -> None:
+        self.overloader.freeze()
+
+    def time_from_snapshot(self, n: int) -> None:
+        FrozenToFormatOverloader.from_snapshot(self.snapshot)
@@ -0,0 +1,120 @@
+"""Compare ``to_format`` in a mypyc-compiled and an interpreted build.
+
+Build the extension modules in place, then run this script from the
+repository root::
+
+    OVERRIDETOFORMAT_USE_MYPYC=1 python setup.py build_ext --inplace
+    python benchmarks/compiled.py
+
+The compiled run imports ``src/``. The interpreted run imports a copy of
+only the ``.py`` files, as the import system prefers extension modules.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Run in a subprocess, with ``number`` formatted in.
+BENCHMARK = """
+import json
+from importlib.machinery import EXTENSION_SUFFIXES
+from timeit import repeat
+
+import override_toformat.dispatch
+from override_toformat.mixin import ToFormatOverloadMixin
+from override_toformat.overload import ToFormatOverloader
+
+compiled = override_toformat.dispatch.__file__.endswith(tuple(EXTENSION_SUFFIXES))
+
+
+class Target:
+    pass
+
+
+class Source(ToFormatOverloadMixin):
+    FMT_OVERLOADS = ToFormatOverloader()
+
+
+class SubSource(Source):
+    pass
+
+
+@Source.FMT_OVERLOADS.implements(to_format=Target, from_format=Source)
+def source_to_target(cls, obj):
+    return obj
+
+
+overloader = Source.FMT_OVERLOADS
+dispatcher = overloader[Target]
+obj = SubSource()
+
+
+def resolve_cold():
+    overloader._resolved.clear()
+    overloader._registry.state._cache.clear()
+    overloader.resolve(SubSource, Target)
+
+
+cases = {{
+    "to_format": lambda: obj.to_format(Target),
+    "dispatch": lambda: dispatcher.dispatch(SubSource),
+    "resolve (cold)": resolve_cold,
+}}
+times = {{name: min(repeat(func, number={number}, repeat=5)) / {number} for name, func in cases.items()}}
+print(json.dumps({{"compiled": compiled, "times": times}}))
+"""
+
+
+def run(path: Path, number: int) -> dict[str, object]:
+    """Run the benchmark, importing the package from ``path``."""
+    env = {**os.environ, "PYTHONPATH": str(path)}
+    out = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", BENCHMARK.format(number=number)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    result: dict[str, object] = json.loads(out.stdout)
+    return result
+
+
+def main() -> None:
+    """Run the benchmark and print a table of timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--number", type=int, default=100_000, help="calls per timing")
+    args = parser.parse_args()
+
+    compiled = run(SRC, args.number)
+    if not compiled["compiled"]:
+        sys.exit("override_toformat in src/ is not compiled, see the usage above.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(SRC / "override_toformat", Path(tmp) / "override_toformat", ignore=_ignore_compiled)
+        interpreted = run(Path(tmp), args.number)
+
+    print(f"{'case':<16}{'interpreted':>14}{'compiled':>14}{'speedup':>10}")
+    ctimes = compiled["times"]
+    itimes = interpreted["times"]
+    assert isinstance(ctimes, dict)
+    assert isinstance(itimes, dict)
+    for name, itime in itimes.items():
+        ctime = ctimes[name]
+        print(f"{name:<16}{itime * 1e9:>11.0f} ns{ctime * 1e9:>11.0f} ns{itime / ctime:>9.2f}x")
+
+
+def _ignore_compiled(directory: str, names: list[str]) -> list[str]:
+    return [n for n in names if not n.endswith((".py", ".typed"))]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Run the benchmarks offline, without asv.
+
+Usage::
+
+    python -m benchmarks.run                        # print a table
+    python -m benchmarks.run -k dispatch            # only matching names
+    python -m benchmarks.run --save before.json
+    python -m benchmarks.run --compare before.json  # exit 1 on regressions
+
+Each ``time_*`` benchmark is timed with `timeit.Timer.autorange`, taking
+the best of ``--repeat`` runs. ``track_*`` benchmarks return their own value,
+in the method's ``unit``. Names are ``module.Class.method(params)``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import pkgutil
+import sys
+from pathlib import Path
+from timeit import Timer
+from typing import Any, Callable, Iterator
+
+import benchmarks
+
+
+def collect(pattern: str = "") -> Iterator[tuple[str, type, str, tuple[Any, ...]]]:
+    """Yield ``(name, class, method name, params)`` for each benchmark.
+
+    Parameters
+    ----------
+    pattern : str, optional
+        Only yield benchmarks whose name contains this.
+
+    """
+    for info in pkgutil.iter_modules(benchmarks.__path__):
+        if not info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"benchmarks.{info.name}")
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            params = getattr(cls, "params", [])
+            names = getattr(cls, "param_names", [])
+            # asv allows a single list for one parameter
+            grid: list[tuple[Any, ...]] = (
+                list(itertools.product(*params)) if len(names) > 1 else [(p,) for p in params] or [()]
+            )
+            for method in (m for m in dir(cls) if m.startswith(("time_", "track_"))):
+                for p in grid:
+                    name = f"{info.name}.{cls_name}.{method}"
+                    if p:
+                        name += "(" + ", ".join(map(repr, p)) + ")"
+                    if pattern in name:
+                        yield name, cls, method, p
+
+
+def measure(cls: type, method: str, params: tuple[Any, ...], *, repeat: int = 5, quick: bool = False) -> float:
+    """Return the best time per call, in seconds, or the value of one benchmark.
+
+    Parameters
+    ----------
+    cls : type
+        The benchmark class.
+    method : str
+        The name of the ``time_*`` or ``track_*`` method.
+    params : tuple[Any, ...]
+        The parameters for ``setup`` and the method.
+    repeat : int, optional keyword-only
+        The number of timings to take the best of.
+    quick : bool, optional keyword-only
+        Call the method once, e.g. to check the benchmarks run.
+
+    """
+    bench = cls()
+    if hasattr(bench, "setup"):
+        bench.setup(*params)
+    func: Callable[..., Any] = getattr(bench, method)
+    try:
+        if method.startswith("track_"):
+            return float(func(*params))
+        timer = Timer(lambda: func(*params))
+        if quick:
+            return timer.timeit(number=1)
+        number, _ = timer.autorange()
+        return min(timer.repeat(repeat=repeat, number=number)) / number
+    finally:
+        if hasattr(bench, "teardown"):
+            bench.teardown(*params)
+
+
+def regressions(results: dict[str, float], baseline: dict[str, float], threshold: float) -> dict[str, float]:
+    """Return the ratio to ``baseline`` of each result slower by ``threshold``."""
+    ratios = {name: t / baseline[name] for name, t in results.items() if name in baseline}
+    return {name: r for name, r in ratios.items() if r > threshold}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks and return the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="timings to take the best of")
+    parser.add_argument("--quick", action="store_true", help="call each benchmark once")
+    parser.add_argument("--save", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="compare to the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    baseline: dict[str, float] = json.loads(args.compare.read_text()) if args.compare else {}
+    results: dict[str, float] = {}
+    for name, cls, method, params in collect(args.pattern):
+        results[name] = t = measure(cls, method, params, repeat=args.repeat, quick=args.quick)
+        unit = getattr(getattr(cls, method), "unit", None)
+        line = f"{name:<72}{t * 1e6:>12.3f} us" if unit is None else f"{name:<72}{t:>12.3f} {unit}"
+        if name in baseline:
+            line += f"{t / baseline[name]:>8.2f}x"
+        print(line)
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+
+    slower = regressions(results, baseline, args.threshold)
+    for name, ratio in slower.items():
+        print(f"REGRESSION {name}: {ratio:.2f}x slower", file=sys.stderr)
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,55 @@
-"""Add support for object conversion to registered formats."""
+"""Add support for object conversion to registered formats.
 
-from override_toformat import constraints
-from override_toformat.mixin import ToFormatOverloadMixin
-from override_toformat.overload import ToFormatOverloader
+The public names are imported on first access (:pep:`562`), so importing the
+package is cheap.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+
+# Not `typing.TYPE_CHECKING`, as `typing` is slow to import. Type checkers
+# treat any ``TYPE_CHECKING`` as true.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from override_toformat import constraints
+    from override_toformat.batch import ConversionError
+    from override_toformat.mixin import ToFormatOverloadMixin
+    from override_toformat.overload import ToFormatOverloader
 
 __all__ = [
-    # overloader
-    "ToFormatOverloader",
+    # errors
+    "ConversionError",
     # mixins
     "ToFormatOverloadMixin",
+    # overloader
+    "ToFormatOverloader",
     # modules
     "constraints",
 ]
+
+# The module of each public name. Modules map to themselves.
+_LAZY: dict[str, str] = {
+    "ToFormatOverloader": "override_toformat.overload",
+    "ToFormatOverloadMixin": "override_toformat.mixin",
+    "constraints": "override_toformat.constraints",
+    "ConversionError": "override_toformat.batch",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+
+    module = import_module(module_name)
+    value = module if module_name.endswith("." + name) else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
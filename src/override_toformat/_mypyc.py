@@ -0,0 +1,28 @@
+"""Compile-time decorators of mypyc, which are no-ops when not installed.
+
+``mypy_extensions`` is only needed to compile with mypyc.
+"""
+
+##############################################################################
+# IMPORTS
+
+from __future__ import annotations
+
+from typing import Callable, TypeVar
+
+__all__ = ["mypyc_attr"]
+
+_T = TypeVar("_T")
+
+
+##############################################################################
+# CODE
+##############################################################################
+
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:
+
+    def mypyc_attr(*attrs: str, **kwattrs: object) -> Callable[[_T], _T]:
+        """Return a no-op class decorator, standing in for mypy_extensions'."""
+        return lambda cls: cls
@@ -0,0 +1,381 @@
+"""Helpers for converting many objects at once."""
+
+from __future__ import annotations
+
+from inspect import isawaitable, iscoroutine
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, NoReturn, Sequence
+
+from override_toformat.implementation import is_async_converter
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+    from override_toformat.implementation import Implements
+
+__all__ = ["ConversionError"]
+
+
+##############################################################################
+# CODE
+##############################################################################
+
+
+class ConversionError(Exception):
+    """Errors from converting chunks of objects concurrently.
+
+    Parameters
+    ----------
+    errors : list[Exception]
+        The exception from each failed chunk, in input order.
+    num_chunks : int
+        The total number of chunks.
+
+    Attributes
+    ----------
+    errors : list[Exception]
+        The exception from each failed chunk, in input order.
+
+    """
+
+    def __init__(self, errors: list[Exception], num_chunks: int) -> None:
+        super().__init__(f"{len(errors)} of {num_chunks} chunks failed to convert: {errors[0]!r}")
+        self.errors = errors
+
+
+def group_by_type(objs: Sequence[object], /) -> dict[type, list[int]]:
+    """Group the indices of ``objs`` by the objects' types.
+
+    Parameters
+    ----------
+    objs : Sequence[object], positional-only
+        The objects to group.
+
+    Returns
+    -------
+    dict[type, list[int]]
+        Mapping of type to the indices of the objects of that type, in order of
+        first appearance.
+
+    """
+    groups: dict[type, list[int]] = {}
+    for i, obj in enumerate(objs):
+        cls = obj.__class__
+        if cls in groups:
+            groups[cls].append(i)
+        else:
+            groups[cls] = [i]
+    return groups
+
+
+def check_chunksize(chunksize: int, /) -> None:
+    """Check a number of objects per chunk.
+
+    Parameters
+    ----------
+    chunksize : int, positional-only
+        The maximum number of objects per chunk.
+
+    Raises
+    ------
+    ValueError
+        If ``chunksize`` is less than 1.
+
+    """
+    if chunksize < 1:
+        msg = "chunksize must be >= 1"
+        raise ValueError(msg)
+
+
+def check_limit(limit: int | None, /) -> None:
+    """Check a maximum number of conversions awaited at once.
+
+    Parameters
+    ----------
+    limit : int or None, positional-only
+        The maximum number of conversions awaited at once, or `None` for no
+        limit.
+
+    Raises
+    ------
+    ValueError
+        If ``limit`` is less than 1.
+
+    """
+    if limit is not None and limit < 1:
+        msg = "limit must be >= 1"
+        raise ValueError(msg)
+
+
+def check_sync(impl: Implements, to_format: type, /, *, batch: bool = True) -> None:
+    """Check the converter used to convert without an event loop is not ``async``.
+
+    Parameters
+    ----------
+    impl : `override_toformat.implementation.Implements`, positional-only
+        The implementation to convert with.
+    to_format : type, positional-only
+        The format to convert to.
+    batch : bool, optional keyword-only
+        Whether the batch converter is used if there is one, as by
+        `convert_group`. If `False` the single-object converter is used.
+
+    Raises
+    ------
+    TypeError
+        If the converter used is ``async``.
+
+    """
+    if batch and impl.batch_converter is not None:
+        if is_async_converter(impl.batch_converter):
+            _raise_async("batch converter", impl, to_format)
+    elif impl.is_async:
+        _raise_async("converter", impl, to_format)
+
+
+def _raise_async(kind: str, impl: Implements, to_format: type, /) -> NoReturn:
+    msg = (
+        f"the {kind} from {impl.from_format.__qualname__!r} to {to_format.__qualname__!r} is async, use ato_format_many"
+    )
+    raise TypeError(msg)
+
+
+def iter_runs(objs: Iterable[object], size: int, /) -> Iterator[list[object]]:
+    """Yield runs of consecutive same-typed objects.
+
+    Parameters
+    ----------
+    objs : Iterable[object], positional-only
+        The objects to split into runs. Consumed lazily.
+    size : int, positional-only
+        The maximum length of a run.
+
+    Yields
+    ------
+    list[object]
+        Consecutive objects of the same type, at most ``size`` of them.
+
+    """
+    run: list[object] = []
+    cls: type | None = None
+    for obj in objs:
+        if run and (obj.__class__ is not cls or len(run) == size):
+            yield run
+            run = []
+        cls = obj.__class__
+        run.append(obj)
+    if run:
+        yield run
+
+
+def convert_group(
+    impl: Implements,
+    to_format: type,
+    objs: Sequence[object],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    /,
+) -> list[Any]:
+    """Convert objects of one type with an already validated implementation.
+
+    The implementation's batch converter is used if it has one, otherwise the
+    single-object converter is called on each object.
+
+    Parameters
+    ----------
+    impl : `override_toformat.implementation.Implements`, positional-only
+        The implementation for the objects' type and ``to_format``.
+    to_format : type, positional-only
+        The format to convert to.
+    objs : Sequence[object], positional-only
+        The objects to convert, all of the same type.
+    args : tuple[Any, ...], positional-only
+        Positional arguments to pass to the converter.
+    kwargs : dict[str, Any], positional-only
+        Keyword arguments to pass to the converter.
+
+    Returns
+    -------
+    list[Any]
+        The converted objects, in the order of ``objs``.
+
+    Raises
+    ------
+    TypeError
+        If the converter is ``async``, see `check_sync`.
+    ValueError
+        If the batch converter does not return one result per object.
+
+    """
+    check_sync(impl, to_format)
+    if impl.batch_converter is not None:
+        out: Any = impl.batch_converter(to_format, objs, *args, **kwargs)
+        if isawaitable(out):  # e.g. a callable object returning a coroutine
+            if iscoroutine(out):
+                out.close()  # never awaited
+            _raise_async("batch converter", impl, to_format)
+        _check_batch_length(out, objs)
+        return list(out)
+
+    converter = impl.converter
+    return [converter(to_format, obj, *args, **kwargs) for obj in objs]
+
+
+def _check_batch_length(out: Sequence[Any], objs: Sequence[object], /) -> None:
+    if len(out) != len(objs):
+        msg = f"batch converter returned {len(out)} results for {len(objs)} objects"
+        raise ValueError(msg)
+
+
+def convert_chunks(  # noqa: PLR0913
+    executor: Executor,
+    tasks: list[tuple[Implements, list[int]]],
+    to_format: type,
+    objs: Sequence[object],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    /,
+) -> list[Any]:
+    """Convert chunks of objects on an executor.
+
+    Parameters
+    ----------
+    executor : `concurrent.futures.Executor`, positional-only
+        The executor on which to run `convert_group` for each chunk.
+    tasks : list[tuple[Implements, list[int]]], positional-only
+        The validated implementation and the indices into ``objs`` of each
+        chunk. The objects in a chunk must have the same type.
+    to_format : type, positional-only
+        The format to convert to.
+    objs : Sequence[object], positional-only
+        The objects to convert.
+    args : tuple[Any, ...], positional-only
+        Positional arguments to pass to the converters.
+    kwargs : dict[str, Any], positional-only
+        Keyword arguments to pass to the converters.
+
+    Returns
+    -------
+    list[Any]
+        The converted objects, in the order of ``objs``.
+
+    Raises
+    ------
+    ConversionError
+        If any chunk fails, after all the chunks have finished.
+
+    """
+    futures: list[Future[list[Any]]] = [
+        executor.submit(convert_group, impl, to_format, [objs[i] for i in indices], args, kwargs)
+        for impl, indices in tasks
+    ]
+
+    out: list[Any] = [None] * len(objs)
+    errors: list[Exception] = []
+    for (_, indices), future in zip(tasks, futures):
+        try:
+            converted = future.result()
+        except Exception as error:  # noqa: BLE001
+            errors.append(error)
+            continue
+        for i, result in zip(indices, converted):
+            out[i] = result
+
+    if errors:
+        raise ConversionError(errors, len(tasks))
+    return out
+
+
+async def aconvert_groups(  # noqa: PLR0913
+    groups: list[tuple[Implements, list[int]]],
+    to_format: type,
+    objs: Sequence[object],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    limit: int | None,
+    /,
+) -> list[Any]:
+    """Convert groups of objects concurrently on the running event loop.
+
+    Groups with a batch converter are converted in one call, other groups one
+    object at a time. Converters may be ``async`` or not; results that are
+    awaitable are awaited.
+
+    Parameters
+    ----------
+    groups : list[tuple[Implements, list[int]]], positional-only
+        The validated implementation and the indices into ``objs`` of each
+        group. The objects in a group must have the same type.
+    to_format : type, positional-only
+        The format to convert to.
+    objs : Sequence[object], positional-only
+        The objects to convert.
+    args : tuple[Any, ...], positional-only
+        Positional arguments to pass to the converters.
+    kwargs : dict[str, Any], positional-only
+        Keyword arguments to pass to the converters.
+    limit : int or None, positional-only
+        The maximum number of conversions awaited at once, at least 1. `None`
+        for no limit, with one coroutine per object, or per group with a
+        batch converter.
+
+    Returns
+    -------
+    list[Any]
+        The converted objects, in the order of ``objs``.
+
+    Raises
+    ------
+    ConversionError
+        If any conversion fails, after all the conversions have finished.
+
+    """
+    units: list[tuple[Implements, list[int]]] = []
+    for impl, indices in groups:
+        if impl.batch_converter is not None:
+            units.append((impl, indices))
+        else:
+            units.extend((impl, [i]) for i in indices)
+
+    out: list[Any] = [None] * len(objs)
+    errors: list[tuple[int, Exception]] = []
+    pending = iter(units)  # shared by the workers
+
+    async def worker() -> None:
+        for impl, indices in pending:
+            try:
+                converted = await _aconvert(impl, to_format, [objs[i] for i in indices], args, kwargs)
+            except Exception as error:  # noqa: BLE001
+                errors.append((indices[0], error))
+                continue
+            for i, result in zip(indices, converted):
+                out[i] = result
+
+    # `asyncio` is slow to import, and only needed in a running event loop.
+    import asyncio  # noqa: PLC0415
+
+    num_workers = len(units) if limit is None else min(limit, len(units))
+    await asyncio.gather(*(worker() for _ in range(num_workers)))
+
+    if errors:
+        raise ConversionError([error for _, error in sorted(errors, key=lambda e: e[0])], len(units))
+    return out
+
+
+async def _aconvert(
+    impl: Implements,
+    to_format: type,
+    objs: list[object],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    /,
+) -> Sequence[Any]:
+    """Convert a batch, or a single object if there is no batch converter."""
+    if impl.batch_converter is not None:
+        out = impl.batch_converter(to_format, objs, *args, **kwargs)
+        if isawaitable(out):
+            out = await out
+        _check_batch_length(out, objs)
+        return out
+
+    result = impl.converter(to_format, objs[0], *args, **kwargs)
+    return [await result if isawaitable(result) else result]
@@ -0,0 +1,211 @@
+"""Cache of conversion results."""
+
+from __future__ import annotations
+
+import sys
+import weakref
+from collections import OrderedDict
+from threading import RLock
+from typing import TYPE_CHECKING, Any, Callable, Hashable, NamedTuple
+
+if TYPE_CHECKING:
+    from typing_extensions import TypeAlias
+
+__all__ = ["CacheInfo", "ResultCache"]
+
+
+##############################################################################
+# TYPING
+
+_Key: TypeAlias = "tuple[Hashable, ...]"
+
+
+##############################################################################
+# CODE
+##############################################################################
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a `ResultCache`."""
+
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+    maxbytes: int | None
+    currbytes: int
+
+
+class ResultCache:
+    """Least-recently-used cache of conversion results.
+
+    Results are keyed on the source object, the format and the converter's
+    arguments. By default the source object is keyed on its identity, holding
+    only a weak reference so that its entries are dropped when it is garbage
+    collected. Objects that can't be weakly referenced are not cached. For
+    immutable value objects, ``key`` can instead compute a key from the
+    object's content.
+
+    Converters are only called on a miss, so the source objects must not be
+    mutated while their results are cached, and the cached results are shared
+    between callers. Arguments that are not hashable bypass the cache.
+
+    Parameters
+    ----------
+    maxsize : int or None, optional keyword-only
+        The maximum number of cached results. `None` for no limit.
+    maxbytes : int or None, optional keyword-only
+        The maximum total ``sizeof`` of the cached results. `None` (default)
+        for no limit.
+    key : Callable[[object], Hashable] or None, optional keyword-only
+        Compute the cache key of a source object from its content. If `None`
+        (default), objects are keyed on identity.
+    sizeof : Callable[[Any], int], optional keyword-only
+        The size of a result, in bytes. Default `sys.getsizeof`, which does not
+        include referenced objects, e.g. the buffer held by a wrapper.
+
+    Examples
+    --------
+    A cache can be shared between registrations, see
+    :meth:`override_toformat.ToFormatOverloader.implements`.
+
+        >>> from override_toformat.cache import ResultCache
+        >>> cache = ResultCache(maxsize=2)
+        >>> cache(lambda cls, obj: cls(obj), int, "1", (), {})
+        1
+        >>> cache.info()
+        CacheInfo(hits=0, misses=1, maxsize=2, currsize=0, maxbytes=None, currbytes=0)
+
+    `str` objects can't be weakly referenced, so the result was not cached.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int | None = 128,
+        maxbytes: int | None = None,
+        key: Callable[[object], Hashable] | None = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+    ) -> None:
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.key = key
+        self.sizeof = sizeof
+
+        self._results: OrderedDict[_Key, tuple[Any, int]] = OrderedDict()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Identity keys: the weak reference keeping each id valid, and the
+        # cache keys to drop when the object is collected.
+        self._refs: dict[int, weakref.ref[Any]] = {}
+        self._keys_by_id: dict[int, set[_Key]] = {}
+        self._lock = RLock()
+
+    def __call__(
+        self,
+        converter: Callable[..., Any],
+        to_format: type,
+        from_obj: object,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        /,
+    ) -> Any:
+        """Return the cached result, calling ``converter`` on a miss.
+
+        Parameters
+        ----------
+        converter : Callable[..., Any], positional-only
+            Called as ``converter(to_format, from_obj, *args, **kwargs)``.
+        to_format : type, positional-only
+            The format to convert to.
+        from_obj : object, positional-only
+            The object to convert.
+        args : tuple[Any, ...], positional-only
+            Positional arguments to pass to the converter.
+        kwargs : dict[str, Any], positional-only
+            Keyword arguments to pass to the converter.
+
+        Returns
+        -------
+        Any
+            The converted object.
+
+        """
+        key_func = self.key
+        obj_id = id(from_obj) if key_func is None else None
+        source_key = obj_id if key_func is None else key_func(from_obj)
+        key: _Key | None
+        try:
+            key = (source_key, converter, to_format, args, frozenset(kwargs.items()))
+            hash(key)
+        except TypeError:
+            key = None
+        if key is None:  # unhashable arguments
+            self.misses += 1
+            return converter(to_format, from_obj, *args, **kwargs)
+
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        result = converter(to_format, from_obj, *args, **kwargs)
+
+        with self._lock:
+            if obj_id is not None and not self._track(from_obj, obj_id):
+                return result
+            if key not in self._results:
+                nbytes = self.sizeof(result)
+                self._results[key] = (result, nbytes)
+                self._nbytes += nbytes
+                if obj_id is not None:
+                    self._keys_by_id[obj_id].add(key)
+                self._evict()
+        return result
+
+    def _track(self, obj: object, obj_id: int, /) -> bool:
+        """Weakly reference ``obj``, returning whether that's possible."""
+        if obj_id in self._refs:
+            return True
+        try:
+            self._refs[obj_id] = weakref.ref(obj, lambda _: self._forget(obj_id))
+        except TypeError:
+            return False
+        self._keys_by_id[obj_id] = set()
+        return True
+
+    def _forget(self, obj_id: int, /) -> None:
+        """Drop the entries of a garbage collected object."""
+        with self._lock:
+            self._refs.pop(obj_id, None)
+            for key in self._keys_by_id.pop(obj_id, ()):
+                self._nbytes -= self._results.pop(key)[1]  # evicted keys are discarded
+
+    def _evict(self) -> None:
+        while self._results and (
+            (self.maxsize is not None and len(self._results) > self.maxsize)
+            or (self.maxbytes is not None and self._nbytes > self.maxbytes)
+        ):
+            key, (_, nbytes) = self._results.popitem(last=False)
+            self._nbytes -= nbytes
+            if self.key is None:
+                self._keys_by_id[key[0]].discard(key)  # type: ignore[index]
+
+    def info(self) -> CacheInfo:
+        """Return the cache statistics."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._results), self.maxbytes, self._nbytes)
+
+    def clear(self) -> None:
+        """Clear the cache and its statistics."""
+        with self._lock:
+            self._results.clear()
+            self._nbytes = 0
+            self.hits = self.misses = 0
+            self._refs.clear()
+            self._keys_by_id.clear()
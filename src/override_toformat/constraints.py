@@ -14,12 +14,22 @@ flexibility to set constrains on a per-overloaded function basis.
 
 from __future__ import annotations
 
-from abc import ABCMeta, abstractmethod
+from abc import ABCMeta, abstractmethod, get_cache_token
 from dataclasses import dataclass
 
-from mypy_extensions import mypyc_attr
-
-__all__ = ["TypeConstraint", "Invariant", "Covariant", "Contravariant", "Between"]
+from override_toformat._mypyc import mypyc_attr
+
+__all__ = [
+    "AllOf",
+    "AnyOf",
+    "Between",
+    "Contravariant",
+    "Covariant",
+    "Invariant",
+    "Not",
+    "OneOfExact",
+    "TypeConstraint",
+]
 __doctest_skip__ = ["*"]  # TODO: figure out weird dataclass error
 
 
@@ -369,3 +379,293 @@ class Between(TypeConstraint):
 
         """
         return (self.lower_bound, self.upper_bound)
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+@dataclass(frozen=True, init=False)
+class OneOfExact(TypeConstraint):
+    r"""Type constraint for one of several exact types.
+
+    This is equivalent to ``arg_type in types``, a single `frozenset` lookup.
+
+    Parameters
+    ----------
+    *types : type
+        The exact types of the argument.
+
+    Examples
+    --------
+    Construct the constraint object:
+
+        >>> constraint = OneOfExact(int, float)
+
+    This can be used to validate argument types:
+
+        >>> constraint.validate_type(float)  # exact type
+        True
+        >>> constraint.validate_type(bool)  # subclass
+        False
+
+    """
+
+    types: frozenset[type]
+
+    def __init__(self, *types: type) -> None:
+        object.__setattr__(self, "types", frozenset(types))
+
+    def validate_type(self, arg_type: type, /) -> bool:
+        """Validate the argument type.
+
+        Parameters
+        ----------
+        arg_type : type, positional-only
+            The type of the argument that must fit the type constraint.
+
+        Returns
+        -------
+        bool
+            Whether the type is valid.
+
+        """
+        return arg_type in self.types
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+@dataclass(frozen=True, init=False)
+class Not(TypeConstraint):
+    r"""The negation of a type constraint.
+
+    Parameters
+    ----------
+    constraint : type or TypeConstraint
+        The constraint the argument must not fit. A type means
+        :class:`~override_toformat.constraints.Covariant` with the type.
+
+    Examples
+    --------
+    Construct the constraint object:
+
+        >>> constraint = Not(bool)
+
+    This can be used to validate argument types:
+
+        >>> constraint.validate_type(int)
+        True
+        >>> constraint.validate_type(bool)
+        False
+
+    """
+
+    constraint: TypeConstraint
+
+    def __init__(self, constraint: type | TypeConstraint) -> None:
+        object.__setattr__(self, "constraint", _as_constraint(constraint))
+
+    def validate_type(self, arg_type: type, /) -> bool:
+        """Validate the argument type.
+
+        Parameters
+        ----------
+        arg_type : type, positional-only
+            The type of the argument that must fit the type constraint.
+
+        Returns
+        -------
+        bool
+            Whether the type is valid.
+
+        """
+        return not self.constraint.validate_type(arg_type)
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+@dataclass(frozen=True, init=False)
+class _Combination(TypeConstraint):
+    """Base class of the combinations of type constraints.
+
+    The constraints are compiled into the cheapest checks: `frozenset`
+    membership for exact types, `issubclass` for covariant bounds, and the
+    constraints' own checks for the rest. The verdicts are cached on the type
+    if a bound is an abstract base class, whose `issubclass` is slow, or
+    there are other constraints, until the next ABC registration.
+    """
+
+    constraints: tuple[TypeConstraint, ...]
+
+    def __init__(self, *constraints: type | TypeConstraint) -> None:
+        flat: list[TypeConstraint] = []
+        for c in map(_as_constraint, constraints):
+            # Nested combinations of the same kind are merged.
+            flat.extend(c.constraints if isinstance(c, _Combination) and type(c) is type(self) else (c,))
+        object.__setattr__(self, "constraints", tuple(flat))
+
+        exact: list[frozenset[type]] = []
+        bounds: list[type] = []
+        others: list[TypeConstraint] = []
+        for c in flat:
+            # Subclasses can override `validate_type`, so match exact types.
+            if isinstance(c, Invariant) and type(c) is Invariant:
+                exact.append(frozenset((c.bound,)))
+            elif isinstance(c, OneOfExact) and type(c) is OneOfExact:
+                exact.append(c.types)
+            elif isinstance(c, Covariant) and type(c) is Covariant:
+                bounds.append(c.bound)
+            else:
+                others.append(c)
+        self._compile(exact, tuple(bounds), tuple(others))
+
+        cached = bool(others) or any(isinstance(b, ABCMeta) for b in bounds)
+        self._verdicts: dict[type, bool] | None
+        object.__setattr__(self, "_verdicts", {} if cached else None)
+        self._cache_token: object | None
+        object.__setattr__(self, "_cache_token", None)
+
+    @abstractmethod
+    def _compile(
+        self,
+        exact: list[frozenset[type]],
+        bounds: tuple[type, ...],
+        others: tuple[TypeConstraint, ...],
+    ) -> None:
+        """Set the checks, from the exact types, covariant bounds and other constraints."""
+
+    @abstractmethod
+    def _check(self, arg_type: type, /) -> bool:
+        """Validate the argument type, without the cache."""
+
+    def validate_type(self, arg_type: type, /) -> bool:
+        """Validate the argument type.
+
+        Parameters
+        ----------
+        arg_type : type, positional-only
+            The type of the argument that must fit the type constraint.
+
+        Returns
+        -------
+        bool
+            Whether the type is valid.
+
+        """
+        verdicts = self._verdicts
+        if verdicts is None:
+            return self._check(arg_type)
+
+        token = get_cache_token()
+        if self._cache_token != token:
+            verdicts.clear()
+            object.__setattr__(self, "_cache_token", token)
+        verdict = verdicts.get(arg_type)
+        if verdict is None:
+            verdict = verdicts[arg_type] = self._check(arg_type)
+        return verdict
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+@dataclass(frozen=True, init=False)
+class AnyOf(_Combination):
+    r"""Type constraint for any of several constraints.
+
+    Exact types, e.g. from :class:`~override_toformat.constraints.Invariant`
+    and :class:`~override_toformat.constraints.OneOfExact`, are checked with
+    a single `frozenset` lookup, and covariant bounds with a single
+    `issubclass` call.
+
+    Parameters
+    ----------
+    *constraints : type or TypeConstraint
+        The constraints, of which the argument must fit at least one. A type
+        means :class:`~override_toformat.constraints.Covariant` with the type.
+
+    Examples
+    --------
+    Construct the constraint object:
+
+        >>> constraint = AnyOf(int, str, Invariant(float))
+
+    This can be used to validate argument types:
+
+        >>> constraint.validate_type(bool)  # subclass of int
+        True
+        >>> constraint.validate_type(float)  # exact type
+        True
+        >>> constraint.validate_type(bytes)
+        False
+
+    """
+
+    def _compile(
+        self,
+        exact: list[frozenset[type]],
+        bounds: tuple[type, ...],
+        others: tuple[TypeConstraint, ...],
+    ) -> None:
+        self._exact: frozenset[type]
+        object.__setattr__(self, "_exact", frozenset().union(*exact))
+        self._bounds: tuple[type, ...]
+        object.__setattr__(self, "_bounds", bounds)
+        self._others: tuple[TypeConstraint, ...]
+        object.__setattr__(self, "_others", others)
+
+    def _check(self, arg_type: type, /) -> bool:
+        if arg_type in self._exact or (self._bounds and issubclass(arg_type, self._bounds)):
+            return True
+        return any(c.validate_type(arg_type) for c in self._others)
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+@dataclass(frozen=True, init=False)
+class AllOf(_Combination):
+    r"""Type constraint for all of several constraints.
+
+    Exact types, e.g. from :class:`~override_toformat.constraints.Invariant`
+    and :class:`~override_toformat.constraints.OneOfExact`, are intersected
+    into a single `frozenset` lookup.
+
+    Parameters
+    ----------
+    *constraints : type or TypeConstraint
+        The constraints, all of which the argument must fit. A type means
+        :class:`~override_toformat.constraints.Covariant` with the type.
+
+    Examples
+    --------
+    Construct the constraint object:
+
+        >>> constraint = AllOf(int, Not(bool))
+
+    This can be used to validate argument types:
+
+        >>> constraint.validate_type(int)
+        True
+        >>> constraint.validate_type(bool)
+        False
+
+    """
+
+    def _compile(
+        self,
+        exact: list[frozenset[type]],
+        bounds: tuple[type, ...],
+        others: tuple[TypeConstraint, ...],
+    ) -> None:
+        # `None` if there are no exact types to check.
+        self._exact: frozenset[type] | None
+        object.__setattr__(self, "_exact", frozenset.intersection(*exact) if exact else None)
+        self._bounds: tuple[type, ...]
+        object.__setattr__(self, "_bounds", bounds)
+        self._others: tuple[TypeConstraint, ...]
+        object.__setattr__(self, "_others", others)
+
+    def _check(self, arg_type: type, /) -> bool:
+        if self._exact is not None and arg_type not in self._exact:
+            return False
+        for bound in self._bounds:
+            if not issubclass(arg_type, bound):
+                return False
+        return all(c.validate_type(arg_type) for c in self._others)
+
+
+def _as_constraint(constraint: type | TypeConstraint, /) -> TypeConstraint:
+    """Return ``constraint``, or `Covariant` with it if it's a type."""
+    return constraint if isinstance(constraint, TypeConstraint) else Covariant(constraint)
@@ -1,9 +1,16 @@
-"""`~functools.singledispatch`.
-
-.. todo::
-
-    - mypyc compile when https://github.com/python/mypy/issues/13613 and
-      https://github.com/python/mypy/issues/13304 are resolved.
+"""Type dispatch, by walking the method resolution order.
+
+The implementations of an overloader are in one flat `RegistryState`, a
+plain `dict` table keyed by ``(from_type, to_format)`` with one cache of
+resolved lookups, and bitset indexes of which formats each type can be
+converted to. A `Registry` adds registrations to a copy of the state and
+publishes it by swapping the reference, so a published state is never
+changed. Lookups only take a short lock to publish the registrations made
+since the last lookup. A `Dispatcher` is a view of the implementations for
+one format.
+
+Unlike `~functools.singledispatch` this compiles with mypyc, so the lookup on
+every conversion is native code in compiled builds.
 """
 
 ##############################################################################
@@ -11,13 +18,13 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from functools import singledispatch
-from typing import TYPE_CHECKING, Any, Generic, TypeVar, cast, final
+from abc import get_cache_token
+from threading import Lock, RLock, get_ident
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Iterable, final
 
 if TYPE_CHECKING:
-    import functools
-    from types import MappingProxyType
+    from collections.abc import KeysView
 
     from override_toformat.implementation import Implements
 
@@ -25,99 +32,634 @@ __all__: list[str] = []
 
 
 ##############################################################################
-# TYPING
+# CODE
+##############################################################################
 
-T = TypeVar("T")
 
+def _virtual(cls: type, /) -> bool:
+    """Whether ``cls`` can have subclasses outside their method resolution order.
 
-##############################################################################
-# CODE
-##############################################################################
+    That is, its metaclass customizes ``issubclass``, e.g. ``cls`` is an ABC.
+    """
+    return type(cls).__subclasscheck__ is not type.__subclasscheck__
+
+
+def _closest_virtual(cls: type, candidates: Iterable[type], /) -> type | None:
+    """Find the most derived of ``candidates`` that ``cls`` virtually subclasses.
+
+    Parameters
+    ----------
+    cls : type, positional-only
+        The type to look up.
+    candidates : Iterable[type], positional-only
+        Registered types with virtual subclasses, see `_virtual`.
+
+    Returns
+    -------
+    type | None
+        `None` if ``cls`` virtually subclasses none of ``candidates``.
+
+    Raises
+    ------
+    RuntimeError
+        If ``cls`` virtually subclasses several unrelated candidates.
+
+    """
+    mro = cls.__mro__
+    best: type | None = None
+    for typ in candidates:
+        if typ in mro or not issubclass(cls, typ):
+            continue
+        if best is None or issubclass(typ, best):
+            best = typ
+        elif not issubclass(best, typ):
+            msg = f"ambiguous dispatch for {cls.__qualname__!r}: {best.__qualname__!r} or {typ.__qualname__!r}"
+            raise RuntimeError(msg)
+    return best
+
+
+def _members(mask: int, items: list[type], /) -> list[type]:
+    """Return the ``items`` at the set bits of ``mask``, in order."""
+    members: list[type] = []
+    while mask:
+        low = mask & -mask
+        members.append(items[low.bit_length() - 1])
+        mask ^= low
+    return members
 
 
 @final
-class Dispatcher:
-    """`~functools.singledispatch` instance."""
+class RegistryState:
+    """Registered implementations, by source type and format.
 
-    def __init__(self) -> None:
-        @singledispatch
-        def dispatcher(obj: object, /, *args: Any, **kwargs: Any) -> Implements:
-            raise NotImplementedError  # See Mixin for handling.
+    Lookups find the closest registered format, then the closest source type
+    registered for it. Bases in the method resolution order come first, then
+    registered abstract base classes that the type virtually subclasses (most
+    derived first), then `object`. This is the precedence of
+    `~functools.singledispatch`.
 
-        self._dispatcher: functools._SingleDispatchCallable[Implements]
-        self._dispatcher = dispatcher
+    Which formats a type can be converted to, and from, is answered from
+    indexes kept up to date by :meth:`add`, see :meth:`targets`.
 
-    def __call__(self, obj: object, /) -> Implements:
-        """Get correct wrapper for the calling object's type.
+    A state is only added to before it is published by its `Registry`. Once
+    published, only its caches change.
+    """
+
+    def __init__(self) -> None:
+        self._table: dict[tuple[type, type], Implements] = {}
+        # The formats and source types, in order of registration, by their
+        # bit in the masks of the indexes below.
+        self._formats: dict[type, int] = {}
+        self._format_list: list[type] = []
+        self._source_bits: dict[type, int] = {}
+        self._source_list: list[type] = []
+        # The registered types with virtual subclasses, checked after the
+        # method resolution order. Other types only subclass their bases.
+        self._virtual_sources: dict[type, None] = {}
+        self._virtual_formats: dict[type, None] = {}
+
+        # Indexes of the registered pairs, as bitsets: the formats registered
+        # for each source type, and the source types registered for each format.
+        self._targets: dict[type, int] = {}
+        self._sources: dict[type, int] = {}
+
+        self._cache: dict[tuple[type, type], Implements] = {}
+        # The registered formats that each looked up type subclasses.
+        self._bases: dict[type, int] = {}
+        # The formats reachable from each looked up type, by ``max_hops``.
+        self._reach: dict[tuple[type, int], int] = {}
+        self._reach_formats: dict[tuple[type, int], tuple[type, ...]] = {}
+        # Set once an ABC is registered, as its virtual subclasses can change.
+        self._cache_token: object | None = None
+
+    def copy(self) -> RegistryState:
+        """Return a copy of the registrations, with empty caches."""
+        state = RegistryState()
+        state._table = self._table.copy()
+        state._formats = self._formats.copy()
+        state._format_list = self._format_list.copy()
+        state._source_bits = self._source_bits.copy()
+        state._source_list = self._source_list.copy()
+        state._virtual_sources = self._virtual_sources.copy()
+        state._virtual_formats = self._virtual_formats.copy()
+        state._targets = self._targets.copy()
+        state._sources = self._sources.copy()
+        state._cache_token = self._cache_token
+        return state
+
+    def dispatch(self, from_type: type, to_format: type, /) -> Implements:
+        """Get the implementation converting ``from_type`` to ``to_format``.
 
         Parameters
         ----------
-        obj : object, positional-only
-            object for calling the `~functools.singledispatch` .
+        from_type : type, positional-only
+            The source type to dispatch on.
+        to_format : type, positional-only
+            The format to dispatch on.
 
         Returns
         -------
         `override_toformat.func.Implements`
 
+        Raises
+        ------
+        NotImplementedError
+            If there is no implementation for the pair.
+
         """
-        return self._dispatcher(obj)
+        self._check_cache_token()
+
+        key = (from_type, to_format)
+        impl = self._cache.get(key)
+        if impl is None:
+            fmt = self.find_format(to_format)
+            impl = None if fmt is None else self._find_source(from_type, fmt)
+            if impl is None:
+                raise NotImplementedError  # See Mixin for handling.
+            self._cache[key] = impl
+        return impl
+
+    def _check_cache_token(self) -> None:
+        """Clear the caches if an ABC has registered a virtual subclass since."""
+        if self._cache_token is not None:
+            token = get_cache_token()
+            if self._cache_token != token:
+                self._clear_caches(bases=True)
+                self._cache_token = token
+
+    def _clear_caches(self, *, bases: bool) -> None:
+        self._cache.clear()
+        self._reach.clear()
+        self._reach_formats.clear()
+        if bases:
+            self._bases.clear()
+
+    def find_format(self, to_format: type, /) -> type | None:
+        """Return the closest registered format of ``to_format``, if there is one.
+
+        Raises
+        ------
+        RuntimeError
+            If ``to_format`` virtually subclasses several unrelated formats.
 
-    def register(self, cls: type, impl: Implements, /) -> None:
-        """Register a new implementation.
+        """
+        formats = self._formats
+        for base in to_format.__mro__[:-1]:  # `object` is last
+            if base in formats:
+                return base
+        best = _closest_virtual(to_format, self._virtual_formats)
+        if best is not None:
+            return best
+        return object if object in formats else None
+
+    def _find_source(self, from_type: type, to_format: type, /) -> Implements | None:
+        """Find the implementation for the closest source type registered for ``to_format``."""
+        table = self._table
+        for base in from_type.__mro__[:-1]:  # `object` is last
+            impl = table.get((base, to_format))
+            if impl is not None:
+                return impl
+        best = _closest_virtual(from_type, [typ for typ in self._virtual_sources if (typ, to_format) in table])
+        if best is not None:
+            return table[(best, to_format)]
+        return table.get((object, to_format))
+
+    def get(self, from_type: type, to_format: type, /) -> Implements | None:
+        """Return the implementation registered for exactly ``(from_type, to_format)``."""
+        return self._table.get((from_type, to_format))
+
+    def add(self, from_type: type, to_format: type, impl: Implements, /) -> bool:
+        """Add an implementation, before the state is published.
 
         Parameters
         ----------
-        cls : type, positional-only
-            Type to register.
+        from_type : type, positional-only
+            Source type to register.
+        to_format : type, positional-only
+            Format to register.
         impl : `override_toformat.func.Implements`, positional-only
             Implementation to register.
 
+        Returns
+        -------
+        bool
+            Whether ``to_format`` is a new format.
+
         """
-        self._dispatcher.register(cls, DispatchWrapper(impl))
+        self._table[(from_type, to_format)] = impl
+
+        bit = self._formats.get(to_format)
+        new_format = bit is None
+        if bit is None:
+            bit = self._formats[to_format] = len(self._format_list)
+            self._format_list.append(to_format)
+        source_bit = self._source_bits.get(from_type)
+        if source_bit is None:
+            source_bit = self._source_bits[from_type] = len(self._source_list)
+            self._source_list.append(from_type)
+        self._targets[from_type] = self._targets.get(from_type, 0) | 1 << bit
+        self._sources[to_format] = self._sources.get(to_format, 0) | 1 << source_bit
+
+        if _virtual(from_type):
+            self._virtual_sources[from_type] = None
+        if _virtual(to_format):
+            self._virtual_formats[to_format] = None
+
+        self._clear_caches(bases=new_format)
+        if self._cache_token is None and (_virtual(from_type) or _virtual(to_format)):
+            self._cache_token = get_cache_token()
+        return new_format
+
+    def targets(self, from_type: type, max_hops: int = 1, /) -> tuple[type, ...]:
+        """Return the registered formats that ``from_type`` can be converted to.
+
+        As in :meth:`~override_toformat.ToFormatOverloader.resolve`, an
+        implementation converts from the subclasses of its source type, and to
+        the registered subclasses of its format. With ``max_hops`` > 1, the
+        formats reachable by chaining implementations are included.
+        Constraints are not checked.
 
+        Parameters
+        ----------
+        from_type : type, positional-only
+            The type to convert from.
+        max_hops : int, optional positional-only
+            The maximum number of implementations chained.
+
+        Returns
+        -------
+        tuple[type, ...]
+            In order of registration.
+
+        """
+        self._check_cache_token()
+        key = (from_type, max_hops)
+        formats = self._reach_formats.get(key)
+        if formats is None:
+            mask = self._reachable(from_type, max_hops)
+            formats = self._reach_formats[key] = tuple(_members(mask, self._format_list))
+        return formats
+
+    def sources(self, to_format: type, /) -> tuple[type, ...]:
+        """Return the registered source types that can be converted to ``to_format``.
+
+        These have an implementation for ``to_format`` or one of its registered
+        bases. Their subclasses can be converted too. Constraints are not
+        checked.
+
+        Returns
+        -------
+        tuple[type, ...]
+            In order of registration.
+
+        """
+        self._check_cache_token()
+        mask = 0
+        for fmt in _members(self._bases_of(to_format), self._format_list):
+            mask |= self._sources[fmt]
+        return tuple(_members(mask, self._source_list))
+
+    def reaches(self, from_type: type, to_format: type, max_hops: int = 1, /) -> bool:
+        """Whether ``from_type`` can be converted to ``to_format``, see :meth:`targets`."""
+        self._check_cache_token()
+        return bool(self._reachable(from_type, max_hops) & self._bases_of(to_format))
+
+    def _bases_of(self, cls: type, /) -> int:
+        """Return the mask of the registered formats that ``cls`` subclasses."""
+        mask = self._bases.get(cls)
+        if mask is None:
+            formats = self._formats
+            mask = 0
+            mro = cls.__mro__
+            for base in mro:
+                bit = formats.get(base)
+                if bit is not None:
+                    mask |= 1 << bit
+            for typ in self._virtual_formats:
+                if typ not in mro and issubclass(cls, typ):
+                    mask |= 1 << formats[typ]
+            self._bases[cls] = mask
+        return mask
+
+    def _reachable(self, from_type: type, max_hops: int, /) -> int:
+        """Return the mask of the formats reachable from ``from_type``, see :meth:`targets`."""
+        key = (from_type, max_hops)
+        mask = self._reach.get(key)
+        if mask is not None:
+            return mask
+
+        if max_hops > 1:
+            # Breadth-first, from the formats reached in one hop fewer.
+            mask = frontier = self._reachable(from_type, 1)
+            for _ in range(max_hops - 1):
+                step = 0
+                for fmt in _members(frontier, self._format_list):
+                    step |= self._reachable(fmt, 1)
+                frontier = step & ~mask
+                if not frontier:
+                    break
+                mask |= frontier
+        else:
+            mask = self._direct_targets(from_type)
+        self._reach[key] = mask
+        return mask
+
+    def _direct_targets(self, from_type: type, /) -> int:
+        """Return the mask of the formats with an implementation from ``from_type``."""
+        registered = 0
+        mro = from_type.__mro__
+        for base in mro:
+            registered |= self._targets.get(base, 0)
+        for typ in self._virtual_sources:
+            if typ not in mro and issubclass(from_type, typ):
+                registered |= self._targets[typ]
+        if not registered:
+            return 0
+
+        # Implementations also convert to the subclasses of their format.
+        mask = 0
+        for i, fmt in enumerate(self._format_list):
+            if self._bases_of(fmt) & registered:
+                mask |= 1 << i
+        return mask
+
+    @property
+    def table(self) -> MappingProxyType[tuple[type, type], Implements]:
+        """Mapping of ``(from_type, to_format)`` to implementations."""
+        return MappingProxyType(self._table)
+
+    @property
+    def formats(self) -> KeysView[type]:
+        """The registered formats, in order of registration."""
+        return self._formats.keys()
 
-@dataclass(frozen=True)
-class DispatchWrapper(Generic[T]):
-    """Wrapper for `~functools.singledispatch`.
 
-    `~functools.singledispatch` calls the dispatched functions.
-    This wraps that function so the single-dispatch instead returns the function.
+@final
+class Registry:
+    """Copy-on-write registry of implementations, by source type and format.
+
+    Lookups use the published :attr:`state` without the writer lock. Writers
+    hold :attr:`lock`, add to a copy of the state and publish it by swapping
+    the reference, so lookups never see a partial registration. The copy is
+    kept for the next registrations until a lookup publishes it, taking a
+    short lock only then, so a run of registrations copies the state once,
+    not once each. Between
+    :meth:`hold` and :meth:`release`, registrations are added to one copy and
+    published together, or dropped together, and other writers wait.
 
     Parameters
     ----------
-    __wrapped__ : `Implements`
-        The result of calling ``Dispatch``.
+    on_register : Callable[[type, type], None] | None, optional
+        Called holding the lock after each registration with the
+        ``(from_type, to_format)`` whose lookups may have changed: the
+        registered pair, or ``(object, to_format)`` for the first registration
+        for a format, as its subclasses may have resolved to a base format
+        before.
 
     """
 
-    __wrapped__: T  # Dispatch wrapper
+    def __init__(self, on_register: Callable[[type, type], None] | None = None) -> None:
+        self.lock = RLock()
+        self._state = RegistryState()
+        # The copy with the registrations not yet looked up, published on the
+        # next lookup. Its lock guards the swap, not the registrations.
+        self._pending: RegistryState | None = None
+        self._pending_lock = Lock()
+        # The copy being added to in a hold, and the thread holding it, if any.
+        self._draft: RegistryState | None = None
+        self._owner: int | None = None
+        self._holds: int = 0
+        # The draft at the start of each nested hold, to roll back to.
+        self._savepoints: list[RegistryState | None] = []
+
+        self._on_register: Callable[[type, type], None] | None = on_register
+
+    @property
+    def state(self) -> RegistryState:
+        """The published state, or the draft for the thread holding it."""
+        if self._pending is not None:
+            self._publish_pending()
+        draft = self._draft
+        if draft is not None and self._owner == get_ident():
+            return draft
+        return self._state
+
+    @property
+    def holds(self) -> int:
+        """The depth of nested :meth:`hold`, for the thread holding the lock."""
+        return self._holds
+
+    @property
+    def owned(self) -> bool:
+        """Whether the calling thread is in a :meth:`hold`."""
+        return self._owner == get_ident()
+
+    def hold(self) -> None:
+        """Hold the lock, publishing the registrations only on :meth:`release`.
+
+        Calls nest, publishing when the outermost is released.
+        """
+        self.lock.acquire()
+        self._publish_pending()
+        if self._holds:
+            draft = self._draft
+            self._savepoints.append(None if draft is None else draft.copy())
+        self._holds += 1
+        self._owner = get_ident()
 
-    def __call__(self, *_: Any, **__: Any) -> T:
-        """Return ``__wrapped__``, ignoring input."""
-        return self.__wrapped__  # `Dispatch` wrapper
+    def release(self, *, commit: bool = True) -> None:
+        """Release a :meth:`hold`.
+
+        Parameters
+        ----------
+        commit : bool, optional keyword-only
+            Whether to keep the registrations made since the :meth:`hold`. If
+            `False` they are dropped, unpublished.
+
+        """
+        self._holds -= 1
+        if self._holds:
+            savepoint = self._savepoints.pop()
+            if not commit:
+                self._draft = savepoint
+        else:
+            if commit:
+                self.publish()
+            self._draft = None
+            self._owner = None
+        self.lock.release()
+
+    def publish(self) -> None:
+        """Publish the registrations added so far, e.g. while held."""
+        with self.lock:
+            self._publish_pending()
+            draft = self._draft
+            if draft is not None:
+                self._state = draft
+                self._draft = None
+
+    def _publish_pending(self) -> None:
+        with self._pending_lock:
+            pending = self._pending
+            if pending is not None:
+                self._state = pending
+                self._pending = None
+
+    def register(self, from_type: type, to_format: type, impl: Implements, /) -> None:
+        """Register a new implementation.
+
+        Parameters
+        ----------
+        from_type : type, positional-only
+            Source type to register.
+        to_format : type, positional-only
+            Format to register.
+        impl : `override_toformat.func.Implements`, positional-only
+            Implementation to register.
+
+        """
+        with self.lock:
+            self._add(from_type, to_format, impl)
+
+    def update(
+        self,
+        from_type: type,
+        to_format: type,
+        make: Callable[[Implements | None], Implements],
+        /,
+    ) -> Implements:
+        """Register the implementation made from the one registered for a pair.
+
+        The read and the registration are one write, so concurrent
+        registrations for the pair are not lost.
+
+        Parameters
+        ----------
+        from_type : type, positional-only
+            Source type to register.
+        to_format : type, positional-only
+            Format to register.
+        make : Callable[[Implements | None], Implements], positional-only
+            Called holding the lock with the implementation registered for
+            exactly the pair, if any, returning the implementation to register.
+
+        Returns
+        -------
+        `override_toformat.func.Implements`
+            The registered implementation.
+
+        """
+        with self.lock:
+            state = self._draft if self._holds else self._pending
+            if state is None:
+                state = self._state
+            impl = make(state.get(from_type, to_format))
+            self._add(from_type, to_format, impl)
+        return impl
+
+    def _add(self, from_type: type, to_format: type, impl: Implements, /) -> None:
+        if self._holds:
+            draft = self._draft
+            if draft is None:
+                draft = self._draft = self._state.copy()
+            new_format = draft.add(from_type, to_format, impl)
+        else:
+            # A lookup may publish the pending copy at any time, after which
+            # it must not change.
+            with self._pending_lock:
+                pending = self._pending
+                if pending is None:
+                    pending = self._pending = self._state.copy()
+                new_format = pending.add(from_type, to_format, impl)
+
+        if self._on_register is not None:
+            self._on_register(object if new_format else from_type, to_format)
 
 
 @final
-class FormatDispatcher:
-    """`~functools.singledispatch` instance."""
+class Dispatcher:
+    """Registry of implementations for one format, by source type.
 
-    def __init__(self) -> None:
-        @singledispatch
-        def dispatcher(obj: object, /, *args: Any, **kwargs: Any) -> Dispatcher:
-            raise NotImplementedError  # See Mixin for handling.
+    A view of the implementations for ``to_format`` in a `Registry`, looked
+    up in its current state.
+
+    Parameters
+    ----------
+    registry : `Registry`, positional-only
+        The registry of the implementations.
+    to_format : type, positional-only
+        The format.
+
+    """
+
+    def __init__(self, registry: Registry, to_format: type, /) -> None:
+        self._registry = registry
+        self.to_format = to_format
+
+    def __eq__(self, other: object) -> bool:
+        # Views are made on demand, so equal views are of the same format.
+        if not isinstance(other, Dispatcher):
+            return NotImplemented
+        return self._registry is other._registry and self.to_format is other.to_format
+
+    def __hash__(self) -> int:
+        return hash((id(self._registry), self.to_format))
+
+    def __call__(self, obj: object, /) -> Implements:
+        """Get the implementation for the calling object's type.
 
-        self._dispatcher: functools._SingleDispatchCallable[Dispatcher]
-        self._dispatcher = dispatcher
+        Parameters
+        ----------
+        obj : object, positional-only
+            The object to dispatch on.
+
+        Returns
+        -------
+        `override_toformat.func.Implements`
+
+        Raises
+        ------
+        NotImplementedError
+            If there is no implementation for the type of ``obj``.
+
+        """
+        return self._registry.state.dispatch(obj.__class__, self.to_format)
+
+    def dispatch(self, cls: type, /) -> Implements:
+        """Get the implementation for ``cls``, without an instance.
+
+        Parameters
+        ----------
+        cls : type, positional-only
+            The type to dispatch on.
+
+        Returns
+        -------
+        `override_toformat.func.Implements`
+
+        Raises
+        ------
+        NotImplementedError
+            If there is no implementation for ``cls``.
+
+        """
+        return self._registry.state.dispatch(cls, self.to_format)
+
+    def register(self, cls: type, impl: Implements, /) -> None:
+        """Register a new implementation.
 
-    def __call__(self, type_: type, /) -> Dispatcher:
-        """Call the dispatcher for ``type``."""
-        return self._dispatcher.dispatch(type_)()
+        Parameters
+        ----------
+        cls : type, positional-only
+            Type to register.
+        impl : `override_toformat.func.Implements`, positional-only
+            Implementation to register.
 
-    def register(self, cls: type, dispatcher: Dispatcher, /) -> None:
-        """Register a new type with a dispatcher."""
-        self._dispatcher.register(cls, DispatchWrapper(dispatcher))
+        """
+        self._registry.register(cls, self.to_format, impl)
 
     @property
-    def registry(self) -> MappingProxyType[type, DispatchWrapper[Dispatcher]]:
-        """Mapping of types to dispatchers."""
-        return cast("MappingProxyType[type, DispatchWrapper[Dispatcher]]", self._dispatcher.registry)
+    def registry(self) -> MappingProxyType[type, Implements]:
+        """Mapping of types to implementations, a copy."""
+        fmt = self.to_format
+        return MappingProxyType({src: impl for (src, to), impl in self._registry.state.table.items() if to is fmt})
@@ -2,19 +2,27 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from abc import get_cache_token
+from array import array
+from dataclasses import dataclass, replace
+from inspect import isawaitable, iscoroutinefunction
 from typing import (
     TYPE_CHECKING,
     Any,
+    Awaitable,
     Callable,
+    Sequence,
     TypeVar,
 )
 
+from override_toformat.cache import ResultCache
 from override_toformat.constraints import Covariant, TypeConstraint
-from override_toformat.dispatch import Dispatcher
+from override_toformat.stats import TimedConverter
 
 if TYPE_CHECKING:
+    from override_toformat.dispatch import Registry
     from override_toformat.overload import ToFormatOverloader
+    from override_toformat.stats import PairCounter
 
 __all__: list[str] = []
 
@@ -24,6 +32,11 @@ __all__: list[str] = []
 
 C = TypeVar("C", bound="Callable[..., Any]")
 
+# Constraint verdicts, memoized in `Implements`.
+_VALID = 0
+_INVALID_FROM = 1
+_INVALID_TO = 2
+
 
 ##############################################################################
 # CODE
@@ -32,13 +45,45 @@ C = TypeVar("C", bound="Callable[..., Any]")
 
 @dataclass(frozen=True)
 class Implements:
-    """A class that implements an overload."""
+    """A class that implements an overload.
+
+    ``converter`` is called as ``converter(to_format, from_obj, *args,
+    **kwargs)``. The optional ``batch_converter`` is called as
+    ``batch_converter(to_format, from_objs, *args, **kwargs)`` with a sequence
+    of same-typed objects and must return a sequence of the same length.
+    Either may be ``async``, in which case calling the implementation returns
+    an awaitable. ``cost`` is the relative cost of the conversion, used to
+    choose between competing implementations. ``view`` declares that the
+    converter returns an object sharing memory with ``from_obj``, e.g. a
+    `memoryview` or NumPy view of its buffer, rather than a copy. If ``cache``
+    is set, single conversions are memoized in it. ``counter`` is set on the
+    instrumented copies made by
+    :meth:`override_toformat.ToFormatOverloader.instrument`, to count
+    constraint failures.
+
+    """
 
     converter: Callable[..., Any]
     from_format: type
     to_format: type
     from_constraint: TypeConstraint
     to_constraint: TypeConstraint
+    batch_converter: Callable[..., Sequence[Any]] | None = None
+    cost: float = 1.0
+    view: bool = False
+    cache: ResultCache | None = None
+    counter: PairCounter | None = None
+
+    def __post_init__(self) -> None:
+        # Constraint verdicts, keyed on ``(from_type, to_format)``. Constraints
+        # only depend on the types, so each pair need only be checked once.
+        # Made on the first check, as many registrations are never called.
+        # Registering a type with an ABC can change a verdict, so they are
+        # dropped when the ABC cache token changes.
+        self._verdicts: dict[tuple[type, type], int] | None
+        object.__setattr__(self, "_verdicts", None)
+        self._cache_token: object | None
+        object.__setattr__(self, "_cache_token", None)
 
     def __call__(
         self,
@@ -72,25 +117,304 @@ class Implements:
             If the object or format is not compatible with the constraints.
 
         """
-        if not self.from_constraint.validate_type(from_obj.__class__):
+        verdicts = self._verdicts
+        if (
+            verdicts is None
+            or verdicts.get((from_obj.__class__, to_format)) != _VALID
+            or self._cache_token != get_cache_token()
+        ):
+            self.validate(from_obj, to_format)
+
+        if self.cache is not None:
+            return self.cache(self.converter, to_format, from_obj, args, kwargs)
+        return self.converter(to_format, from_obj, *args, **kwargs)
+
+    def convert(
+        self,
+        from_obj: object,
+        to_format: type,
+        /,
+        *args: Any,
+        copy_policy: bool | None,
+        **kwargs: Any,
+    ) -> Any:
+        """Call the converter, with a copy policy.
+
+        Parameters
+        ----------
+        from_obj : object, positional-only
+            object to convert from.
+        to_format : type, positional-only
+            format to convert to.
+        *args : Any
+            positional arguments to pass to the converter.
+        copy_policy : bool or None, keyword-only
+            If `True` the result never shares memory with ``from_obj``: the
+            result of a ``view`` converter is copied. If `False` the result
+            must share memory with ``from_obj``, so the converter must be a
+            ``view`` converter. If `None`, the converter's result is returned
+            as is.
+        **kwargs : Any
+            keyword arguments to pass to the converter, including any
+            ``copy``.
+
+        Returns
+        -------
+        Any
+            The converted object.
+
+        Raises
+        ------
+        TypeError
+            If ``copy_policy`` is `True` and the result of the ``view``
+            converter can't be copied, see `copy_result`.
+        ValueError
+            If the object or format is not compatible with the constraints, or
+            ``copy_policy`` is `False` and the converter is not a ``view``
+            converter.
+
+        """
+        self._check_view(to_format, copy_policy=copy_policy)
+        out = self(from_obj, to_format, *args, **kwargs)
+        return copy_result(out) if copy_policy and self.view else out
+
+    async def aconvert(
+        self,
+        from_obj: object,
+        to_format: type,
+        /,
+        *args: Any,
+        copy_policy: bool | None,
+        **kwargs: Any,
+    ) -> Any:
+        """Call the converter, awaiting an ``async`` one, with a copy policy.
+
+        See :meth:`convert` for the parameters.
+        """
+        self._check_view(to_format, copy_policy=copy_policy)
+        out = self(from_obj, to_format, *args, **kwargs)
+        if isawaitable(out):
+            out = await out
+        return copy_result(out) if copy_policy and self.view else out
+
+    def _check_view(self, to_format: type, /, *, copy_policy: bool | None) -> None:
+        if copy_policy is False and not self.view:
+            msg = f"cannot convert {self.from_format.__qualname__!r} to {to_format.__qualname__!r} without a copy"
+            raise ValueError(msg)
+
+    def validate(self, from_obj: object, to_format: type, /) -> None:
+        """Check the object and format against the constraints.
+
+        The verdict is memoized on the object's type and the format, whether it
+        passes or fails, until a type is registered with an ABC.
+
+        Parameters
+        ----------
+        from_obj : object, positional-only
+            object to convert from.
+        to_format : type, positional-only
+            format to convert to.
+
+        Raises
+        ------
+        ValueError
+            If the object or format is not compatible with the constraints.
+
+        """
+        verdict = self._verdict(from_obj.__class__, to_format)
+        if verdict != _VALID and self.counter is not None:
+            self.counter.add_failure()
+
+        if verdict == _INVALID_FROM:
             msg = f"object {from_obj!r} is not compatible with from_constraint {self.from_constraint}"
             raise ValueError(msg)
-        elif not self.to_constraint.validate_type(to_format):
+        elif verdict == _INVALID_TO:
             msg = f"format {to_format.__qualname__!r} is not compatible with to_constraint {self.to_constraint}"
             raise ValueError(msg)
 
-        return self.converter(to_format, from_obj, *args, **kwargs)
+    def is_valid(self, from_type: type, to_format: type, /) -> bool:
+        """Return whether the types are compatible with the constraints.
+
+        Parameters
+        ----------
+        from_type : type, positional-only
+            type to convert from.
+        to_format : type, positional-only
+            format to convert to.
+
+        Returns
+        -------
+        bool
+
+        """
+        return self._verdict(from_type, to_format) == _VALID
+
+    def _verdict(self, from_type: type, to_format: type, /) -> int:
+        verdicts = self._verdicts
+        token = get_cache_token()
+        if verdicts is None or self._cache_token != token:
+            verdicts = {}
+            object.__setattr__(self, "_verdicts", verdicts)
+            object.__setattr__(self, "_cache_token", token)
+
+        key = (from_type, to_format)
+        verdict = verdicts.get(key)
+        if verdict is None:
+            if not self.from_constraint.validate_type(from_type):
+                verdict = _INVALID_FROM
+            elif not self.to_constraint.validate_type(to_format):
+                verdict = _INVALID_TO
+            else:
+                verdict = _VALID
+            verdicts[key] = verdict
+        return verdict
 
     @property
     def formats(self) -> tuple[type, type]:
         """Return the from-to format tuple."""
         return (self.from_format, self.to_format)
 
+    @property
+    def is_async(self) -> bool:
+        """Whether the converter is ``async``, returning an awaitable."""
+        return is_async_converter(self.converter)
+
+    @property
+    def route(self) -> tuple[Implements, ...]:
+        """Return the chain of registered implementations this runs."""
+        if isinstance(self.converter, ConversionChain):
+            return (*(impl for impl, _ in self.converter.hops), self.converter.last)
+        return (self,)
+
+
+def is_async_converter(converter: Callable[..., Any], /) -> bool:
+    """Whether ``converter`` is ``async``, looking through the wrappers of this package.
+
+    Parameters
+    ----------
+    converter : Callable[..., Any], positional-only
+        A single or batch converter, e.g. an `Implements.converter`.
+
+    Returns
+    -------
+    bool
+
+    """
+    while True:
+        if isinstance(converter, TimedConverter):
+            converter = converter.converter
+        elif isinstance(converter, BatchToSingle):
+            converter = converter.batch_converter
+        elif isinstance(converter, ConversionChain):
+            converter = converter.last.converter
+        else:
+            return iscoroutinefunction(converter)
+
+
+def copy_result(obj: Any, /) -> Any:
+    """Copy the result of a ``view`` converter.
+
+    A `memoryview` is copied into a new writable buffer with the same format
+    and shape, and an `array.array` into a new array. Other objects are copied
+    with their ``copy()`` method, e.g. NumPy arrays and `bytearray`.
+
+    Parameters
+    ----------
+    obj : Any, positional-only
+        The object to copy.
+
+    Returns
+    -------
+    Any
+        The copy, sharing no memory with ``obj``.
+
+    Raises
+    ------
+    TypeError
+        If ``obj`` is of another type, without a ``copy()`` method.
+
+    """
+    if isinstance(obj, memoryview):
+        return memoryview(bytearray(obj.tobytes())).cast(obj.format, obj.shape)  # type: ignore[call-overload]
+    if isinstance(obj, array):
+        return array(obj.typecode, obj)
+    copy = getattr(obj, "copy", None)
+    if callable(copy):
+        return copy()
+    msg = f"can't copy the {obj.__class__.__qualname__!r} result of a view converter, which has no copy() method"
+    raise TypeError(msg)
+
+
+@dataclass(frozen=True)
+class BatchToSingle:
+    """Convert a single object with a batch converter.
+
+    Parameters
+    ----------
+    batch_converter : Callable[..., Sequence[Any]]
+        Called with a one-element `list` of the object.
+
+    """
+
+    batch_converter: Callable[..., Sequence[Any]]
+
+    def __call__(self, to_format: type, from_obj: object, /, *args: Any, **kwargs: Any) -> Any:
+        """Convert ``from_obj`` as a batch of one."""
+        out = self.batch_converter(to_format, [from_obj], *args, **kwargs)
+        if isawaitable(out):  # `async` batch converter
+            return _first(out)
+        return out[0]
+
+
+@dataclass(frozen=True)
+class ConversionChain:
+    """Convert through a chain of implementations.
+
+    Each hop converts the previous result to the format of that hop. The
+    arguments are only passed to the last implementation. The constraints are
+    checked when the chain is built, assuming each hop returns an object of
+    exactly the hop's format. Only the last implementation may be ``async``.
+
+    Parameters
+    ----------
+    hops : tuple[tuple[Implements, type], ...]
+        The implementation and format of each intermediate hop.
+    last : Implements
+        The implementation converting to the final format.
+
+    """
+
+    hops: tuple[tuple[Implements, type], ...]
+    last: Implements
+
+    def __call__(self, to_format: type, from_obj: object, /, *args: Any, **kwargs: Any) -> Any:
+        """Convert ``from_obj`` through each hop to ``to_format``."""
+        obj = from_obj
+        for impl, fmt in self.hops:
+            obj = impl.converter(fmt, obj)
+        return self.last.converter(to_format, obj, *args, **kwargs)
+
+
+async def _first(batch: Awaitable[Sequence[Any]], /) -> Any:
+    return (await batch)[0]
+
 
 class RegisterImplementsDecorator:
     """Decorator to register an ``implements`` overload."""
 
-    def __init__(
+    __slots__ = (
+        "batch",
+        "cache",
+        "cost",
+        "from_constraint",
+        "from_format",
+        "registry",
+        "to_constraint",
+        "to_format",
+        "view",
+    )
+
+    def __init__(  # noqa: PLR0913
         self,
         *,
         from_format: type,
@@ -98,42 +422,72 @@ class RegisterImplementsDecorator:
         overloader: ToFormatOverloader,
         from_constraint: type | TypeConstraint | None,
         to_constraint: type | TypeConstraint | None,
+        batch: bool = False,
+        cost: float = 1.0,
+        view: bool = False,
+        cache: bool | ResultCache = False,
     ) -> None:
         self.from_format = from_format
         self.to_format = to_format
+        self.batch = batch
+        self.cost = cost
+        self.view = view
+        self.cache: ResultCache | None = (
+            overloader.result_cache if cache is True else cache if isinstance(cache, ResultCache) else None
+        )
+        if from_constraint is not None or to_constraint is not None:
+            overloader._track_abcs()  # noqa: SLF001
+        # Equal constraints made from types are shared, see `ToFormatOverloader._intern`.
         self.from_constraint = (
             from_constraint
             if isinstance(from_constraint, TypeConstraint)
-            else Covariant(from_format if from_constraint is None else from_constraint)
+            else overloader._intern(Covariant(from_format if from_constraint is None else from_constraint))  # noqa: SLF001
         )
         self.to_constraint = (
             to_constraint
             if isinstance(to_constraint, TypeConstraint)
-            else Covariant(to_format if to_constraint is None else to_constraint)
+            else overloader._intern(Covariant(to_format if to_constraint is None else to_constraint))  # noqa: SLF001
         )
         self.__post_init__(overloader)
 
     def __post_init__(self, overloader: ToFormatOverloader) -> None:
-        # Make single-dispatcher for format
-        if not overloader.__contains__(self.to_format):
-            dispatcher = Dispatcher()
-            overloader._dispatcher.register(self.to_format, dispatcher)  # noqa: SLF001
-        else:
-            dispatcher = overloader._dispatcher.registry[self.to_format]()  # noqa: SLF001
-
-        self.dispatcher: Dispatcher
-        object.__setattr__(self, "dispatcher", dispatcher)
+        # All formats share the overloader's flat registry.
+        self.registry: Registry
+        object.__setattr__(self, "registry", overloader._registry)  # noqa: SLF001
 
     def __call__(self, converter: C, /) -> C:
         """Register an format overload."""
-        # Adding a new format
-        implementation = Implements(
-            from_format=self.from_format,
-            to_format=self.to_format,
-            converter=converter,
-            from_constraint=self.from_constraint,
-            to_constraint=self.to_constraint,
-        )
-        # Register the function
-        self.dispatcher.register(self.from_format, implementation)
+        if self.cache is not None and iscoroutinefunction(converter):
+            msg = "results of async converters can't be cached"
+            raise TypeError(msg)
+
+        def make(previous: Implements | None) -> Implements:
+            # A single and a batch converter can be registered for the same
+            # formats, so keep the other kind from an existing registration.
+            single: Callable[..., Any]
+            batch_converter: Callable[..., Sequence[Any]] | None
+            if self.batch:
+                if previous is not None and not isinstance(previous.converter, BatchToSingle):
+                    # The cost, view and cache of single conversions stay.
+                    return replace(previous, batch_converter=converter)
+                batch_converter = converter
+                single = BatchToSingle(converter)
+            else:
+                single = converter
+                batch_converter = None if previous is None else previous.batch_converter
+
+            return Implements(
+                from_format=self.from_format,
+                to_format=self.to_format,
+                converter=single,
+                from_constraint=self.from_constraint,
+                to_constraint=self.to_constraint,
+                batch_converter=batch_converter,
+                cost=self.cost,
+                view=self.view,
+                cache=self.cache,
+            )
+
+        # Register the function, atomically with reading the previous one.
+        self.registry.update(self.from_format, self.to_format, make)
         return converter
@@ -5,9 +5,10 @@ r"""Mixins for adding |to_format| methods."""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, ClassVar
+from inspect import isawaitable
+from typing import TYPE_CHECKING, Any, ClassVar, Iterable, Iterator
 
-from mypy_extensions import mypyc_attr
+from override_toformat._mypyc import mypyc_attr
 
 if TYPE_CHECKING:
     from override_toformat.overload import ToFormatOverloader
@@ -35,7 +36,14 @@ class ToFormatOverloadMixin:
     FMT_OVERLOADS: ClassVar[ToFormatOverloader]
     """A class-attribute of an instance of |ToFormatOverloader|."""
 
-    def to_format(self, format: type, /, *args: Any, **kwargs: Any) -> Any:  # noqa: A002
+    def to_format(
+        self,
+        format: type,  # noqa: A002
+        /,
+        *args: Any,
+        copy_policy: bool | None = None,
+        **kwargs: Any,
+    ) -> Any:
         """Transform width to specified format.
 
         Parameters
@@ -44,6 +52,58 @@ class ToFormatOverloadMixin:
             The format type to which to transform this width.
         *args : Any
             Arguments into ``to_format``.
+        copy_policy : bool or None, optional keyword-only
+            If `True`, the result never shares memory with this object; results
+            of converters registered with ``view=True`` are copied. If `False`,
+            the result must share memory with this object, so the converter
+            must be registered with ``view=True``. If `None` (default), the
+            converter's result is returned as is.
+        **kwargs : Any
+            Keyword-arguments into ``to_format``, e.g. a ``copy`` argument of
+            the converter.
+
+        Returns
+        -------
+        object
+            Width transformed to specified type.
+
+        Raises
+        ------
+        ValueError
+            If format is not one of the recognized types, or ``copy_policy``
+            is `False` and the conversion is not a view.
+
+        """
+        overloader = self.FMT_OVERLOADS
+        if overloader.profiler is not None:
+            return overloader.profiler.to_format(self, format, *args, copy_policy=copy_policy, **kwargs)
+
+        impl = overloader.resolve(type(self), format)
+        if copy_policy is None:
+            return impl(self, format, *args, **kwargs)
+        return impl.convert(self, format, *args, copy_policy=copy_policy, **kwargs)
+
+    async def ato_format(
+        self,
+        format: type,  # noqa: A002
+        /,
+        *args: Any,
+        copy_policy: bool | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Transform width to specified format, awaiting ``async`` converters.
+
+        Synchronous converters are called as in :meth:`to_format`. Calling
+        :meth:`to_format` on an ``async`` converter returns an awaitable.
+
+        Parameters
+        ----------
+        format : type, positional-only
+            The format type to which to transform this width.
+        *args : Any
+            Arguments into ``to_format``.
+        copy_policy : bool or None, optional keyword-only
+            The copy policy, see :meth:`to_format`.
         **kwargs : Any
             Keyword-arguments into ``to_format``.
 
@@ -52,10 +112,131 @@ class ToFormatOverloadMixin:
         object
             Width transformed to specified type.
 
+        Raises
+        ------
+        ValueError
+            If format is not one of the recognized types, or ``copy_policy``
+            is `False` and the conversion is not a view.
+
+        """
+        impl = self.FMT_OVERLOADS.resolve(type(self), format)
+        if copy_policy is not None:
+            return await impl.aconvert(self, format, *args, copy_policy=copy_policy, **kwargs)
+        result = impl(self, format, *args, **kwargs)
+        if isawaitable(result):
+            result = await result
+        return result
+
+    @classmethod
+    def to_format_many(cls, objs: Iterable[object], format: type, /, *args: Any, **kwargs: Any) -> list[Any]:  # noqa: A002
+        """Transform many objects to specified format.
+
+        The objects are grouped by type, so dispatch happens once per type
+        rather than once per object.
+
+        Parameters
+        ----------
+        objs : Iterable[object], positional-only
+            The objects to transform. They may be of different types.
+        format : type, positional-only
+            The format type to which to transform the objects.
+        *args : Any
+            Arguments into ``to_format``.
+        **kwargs : Any
+            Keyword-arguments into ``to_format``.
+
+        Returns
+        -------
+        list[Any]
+            Objects transformed to specified type, in the order of ``objs``.
+
+        Raises
+        ------
+        ValueError
+            If format is not one of the recognized types.
+
+        """
+        return cls.FMT_OVERLOADS.to_format_many(objs, format, *args, **kwargs)
+
+    @classmethod
+    def iter_to_format(
+        cls,
+        objs: Iterable[object],
+        format: type,  # noqa: A002
+        /,
+        *args: Any,
+        chunksize: int = 1,
+        **kwargs: Any,
+    ) -> Iterator[Any]:
+        """Lazily transform objects to specified format.
+
+        See :meth:`override_toformat.ToFormatOverloader.iter_to_format` for
+        converting chunks on an executor.
+
+        Parameters
+        ----------
+        objs : Iterable[object], positional-only
+            The objects to transform. They may be of different types.
+        format : type, positional-only
+            The format type to which to transform the objects.
+        *args : Any
+            Arguments into ``to_format``.
+        chunksize : int, optional keyword-only
+            The maximum number of consecutive same-typed objects to transform
+            at once, e.g. with a batch converter. Default 1.
+        **kwargs : Any
+            Keyword-arguments into ``to_format``.
+
+        Returns
+        -------
+        Iterator[Any]
+            Objects transformed to specified type, in the order of ``objs``.
+
         Raises
         ------
         ValueError
             If format is not one of the recognized types.
 
         """
-        return self.FMT_OVERLOADS(format)(self)(self, format, *args, **kwargs)
+        return cls.FMT_OVERLOADS.iter_to_format(objs, format, *args, chunksize=chunksize, **kwargs)
+
+    @classmethod
+    async def ato_format_many(
+        cls,
+        objs: Iterable[object],
+        format: type,  # noqa: A002
+        /,
+        *args: Any,
+        limit: int | None = None,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Transform many objects to specified format, awaiting ``async`` converters.
+
+        Parameters
+        ----------
+        objs : Iterable[object], positional-only
+            The objects to transform. They may be of different types.
+        format : type, positional-only
+            The format type to which to transform the objects.
+        *args : Any
+            Arguments into ``to_format``.
+        limit : int or None, optional keyword-only
+            The maximum number of conversions awaited at once, at least 1. If
+            `None` (default), there is no limit: one coroutine is started per
+            object, or per group with a batch converter.
+        **kwargs : Any
+            Keyword-arguments into ``to_format``.
+
+        Returns
+        -------
+        list[Any]
+            Objects transformed to specified type, in the order of ``objs``.
+
+        Raises
+        ------
+        ValueError
+            If format is not one of the recognized types, or ``limit`` is less
+            than 1.
+
+        """
+        return await cls.FMT_OVERLOADS.ato_format_many(objs, format, *args, limit=limit, **kwargs)
@@ -2,16 +2,37 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Mapping, overload
+import os
+from abc import get_cache_token
+from collections import deque
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping, Sequence, overload
 
-from override_toformat.dispatch import Dispatcher, FormatDispatcher
-from override_toformat.implementation import RegisterImplementsDecorator
+from override_toformat.batch import (
+    aconvert_groups,
+    check_chunksize,
+    check_limit,
+    check_sync,
+    convert_chunks,
+    convert_group,
+    group_by_type,
+    iter_runs,
+)
+from override_toformat.cache import ResultCache
+from override_toformat.dispatch import Dispatcher, Registry
+from override_toformat.implementation import BatchToSingle, ConversionChain, Implements, RegisterImplementsDecorator
 from override_toformat.many import RegisterManyImplementsDecorator
+from override_toformat.plugins import PluginTable, entry_point_targets
+from override_toformat.sampling import DEFAULT_BUCKETS, SamplingProfiler
+from override_toformat.snapshot import RegistrySnapshot, dump_registry, load_registry
+from override_toformat.stats import ConversionStats
 
 if TYPE_CHECKING:
     from collections.abc import ItemsView, Iterator, KeysView, ValuesView
+    from concurrent.futures import Executor, Future
 
     from override_toformat.constraints import TypeConstraint
+    from override_toformat.stats import PairStats
 
 
 __all__: list[str] = []
@@ -24,47 +45,1034 @@ __all__: list[str] = []
 
 # @dataclass(frozen=True)  # TODO: make a dataclass when mypyc allows
 class ToFormatOverloader(Mapping[type, Dispatcher]):
-    """Overload for ``to_format``."""
+    """Overload for ``to_format``.
+
+    Parameters
+    ----------
+    max_hops : int, optional keyword-only
+        The maximum number of implementations chained together to convert
+        between formats without a direct implementation. The default, 1, only
+        uses direct implementations.
+
+    Attributes
+    ----------
+    result_cache : `~override_toformat.cache.ResultCache`
+        The cache of conversion results for implementations registered with
+        ``cache=True``.
+    profiler : `~override_toformat.sampling.SamplingProfiler` or None
+        The sampling profiler of ``to_format``, set by :meth:`profile`.
+
+    """
+
+    def __init__(self, *, max_hops: int = 1) -> None:
+        self._max_hops: int
+        object.__setattr__(self, "_max_hops", max_hops)
 
-    def __init__(self) -> None:
         # Initialize by calling `__post_init__`, which is included for
         # `dataclasses.dataclass` subclasses.
         self.__post_init__()
 
     def __post_init__(self) -> None:
-        self._dispatcher: FormatDispatcher
-        object.__setattr__(self, "_dispatcher", FormatDispatcher())
+        # All the registered implementations, in one table keyed by
+        # ``(from_type, to_format)``. `Dispatcher`s are views of it.
+        self._registry: Registry
+        object.__setattr__(self, "_registry", Registry(on_register=self._clear_resolved))
+
+        # Flat cache of ``(from_type, to_format) -> Implements``, short-cutting
+        # the registry's lookups. Entries are dropped as
+        # registrations are added, see ``_clear_resolved``.
+        self._resolved: dict[tuple[type, type], Implements]
+        object.__setattr__(self, "_resolved", {})
+        # The cached pairs resolved by chaining implementations. Any
+        # registration can shorten a route, so these are all dropped together.
+        self._routed: set[tuple[type, type]]
+        object.__setattr__(self, "_routed", set())
+        # Like the registry's, the cache is only sensitive to
+        # ABC registrations once needed, see `_track_abcs`.
+        self._cache_token: object | None
+        object.__setattr__(self, "_cache_token", None)
+        # Inside `registering` blocks, the pairs whose cached resolutions may
+        # be stale are collected and dropped together, see ``_clear_resolved``.
+        self._stale: set[tuple[type, type]]
+        object.__setattr__(self, "_stale", set())
+
+        # Shared cache for registrations with ``cache=True``.
+        self.result_cache: ResultCache
+        object.__setattr__(self, "result_cache", ResultCache())
+
+        # Set by `instrument`. Then the cached resolutions are instrumented
+        # copies of the implementations, so there is no cost when it's off.
+        self._stats: ConversionStats | None
+        object.__setattr__(self, "_stats", None)
+        self.profiler: SamplingProfiler | None
+        object.__setattr__(self, "profiler", None)
+
+        # Converter modules to import on the first conversion to a format.
+        self._plugins: PluginTable
+        object.__setattr__(self, "_plugins", PluginTable())
+
+        # Constraints made by registrations, see `_intern`.
+        self._constraints: dict[TypeConstraint, TypeConstraint]
+        object.__setattr__(self, "_constraints", {})
+
+    @property
+    def max_hops(self) -> int:
+        """The maximum number of implementations chained together.
+
+        Setting it drops the cached resolutions.
+        """
+        return self._max_hops
+
+    @max_hops.setter
+    def max_hops(self, value: int) -> None:
+        with self._registry.lock:
+            object.__setattr__(self, "_max_hops", value)
+            self._routed.clear()
+            object.__setattr__(self, "_resolved", {})
 
     def __call__(self, key: type, /) -> Dispatcher:
         """Return the dispatcher for ``key``."""
-        return self._dispatcher(key)
+        if self._plugins:
+            self._plugins.load(key, self)
+        fmt = self._registry.state.find_format(key)
+        if fmt is None:
+            raise NotImplementedError  # See Mixin for handling.
+        return Dispatcher(self._registry, fmt)
+
+    def resolve(self, from_type: type, to_format: type, /) -> Implements:
+        """Return the implementation converting ``from_type`` to ``to_format``.
+
+        Like ``self(to_format).dispatch(from_type)``, this uses the
+        implementations for the closest registered format of ``to_format``,
+        but the result is cached until a registration that could change it.
+        If there is no direct implementation and ``max_hops`` > 1, the shortest
+        chain of implementations is compiled into a single implementation, see
+        `~override_toformat.implementation.ConversionChain`.
+
+        If the implementations for that format have different costs, the
+        cheapest valid one (or chain, if ``max_hops`` > 1) is used instead of
+        the first in method resolution order. The chosen route and its total
+        cost are the ``route`` and ``cost`` of the returned implementation.
+
+        Parameters
+        ----------
+        from_type : type, positional-only
+            The type of the object to convert.
+        to_format : type, positional-only
+            The format to convert to.
+
+        Returns
+        -------
+        `override_toformat.implementation.Implements`
+
+        Raises
+        ------
+        NotImplementedError
+            If there is no implementation for the ``(from_type, to_format)`` pair.
+
+        """
+        if self._cache_token is not None and self._cache_token != get_cache_token():
+            with self._registry.lock:
+                self._routed.clear()
+                object.__setattr__(self, "_resolved", {})
+                object.__setattr__(self, "_cache_token", get_cache_token())
+        key = (from_type, to_format)
+        if self._stale and self._registry.owned:
+            # Resolving inside this thread's `registering` block, from its
+            # unpublished registrations, which the cache doesn't know of.
+            impl = self._resolve_uncached(from_type, to_format)
+            return impl if self._stats is None else self._stats.instrument(key, impl)
+
+        # Writers replace the cache rather than change it, see `_drop_resolved`,
+        # so a resolution made while registering is stored in the dropped cache.
+        resolved = self._resolved
+        try:
+            cached = resolved[key]
+        except KeyError:
+            pass
+        else:
+            if self._stats is not None:
+                self._stats.counter(key).add_hit()
+            return cached
+
+        impl = self._resolve_uncached(from_type, to_format)
+        if self._stats is not None:
+            impl = self._stats.instrument(key, impl)
+        resolved[key] = impl
+        return impl
+
+    def _resolve_uncached(self, from_type: type, to_format: type, /) -> Implements:
+        """Resolve ``(from_type, to_format)`` without the cache, see :meth:`resolve`."""
+        if self._plugins:
+            self._plugins.load(to_format, self)
+
+        key = (from_type, to_format)
+        impl = self._direct(from_type, to_format)
+        if self.max_hops > 1:
+            # A new registration anywhere can make a cheaper route.
+            self._routed.add(key)
+            impl = self._find_route(from_type, to_format, impl) or impl
+
+        if impl is None:
+            # There is no valid implementation. An invalid one, if any, raises
+            # the constraint error when called.
+            try:
+                impl = self._index().state.dispatch(from_type, to_format)
+            except NotImplementedError:
+                self._routed.discard(key)
+                if self.max_hops < 2:  # noqa: PLR2004
+                    raise
+                msg = f"no route from {from_type.__qualname__!r} to {to_format.__qualname__!r} in {self.max_hops} hops"
+                raise NotImplementedError(msg) from None
+        return impl
+
+    def _direct(self, from_type: type, to_format: type, /) -> Implements | None:
+        """Return the cheapest valid direct implementation, if there is one.
+
+        Only the implementations for the closest registered format are
+        candidates, as in the registry's resolution. Ties go to the registry's
+        resolution, then to the closest source in the method resolution order.
+        """
+        state = self._index().state
+        fmt = state.find_format(to_format)
+        if fmt is None:
+            return None
+
+        best: Implements | None
+        try:
+            best = state.dispatch(from_type, to_format)
+        except NotImplementedError:
+            return None  # no source is registered for the format
+        best = best if best.is_valid(from_type, to_format) else None
+
+        for src in from_type.__mro__:
+            impl = state.get(src, fmt)
+            if impl is None:
+                continue
+            if (best is None or impl.cost < best.cost) and impl.is_valid(from_type, to_format):
+                best = impl
+        return best
+
+    def _find_route(self, from_type: type, to_format: type, direct: Implements | None, /) -> Implements | None:
+        """Search for a chain of implementations cheaper than ``direct``.
+
+        Each registered format is a node and each valid direct implementation
+        between nodes an edge, weighted by its cost. ``async`` implementations
+        can only be the last hop, as the chain passes each result on. Routes
+        are relaxed one hop at a time, up to ``max_hops``. Ties go to
+        ``direct``, then to fewer hops.
+        """
+        formats = list(self._index().state.formats)
+
+        best: Implements | None = None
+        best_cost = direct.cost if direct is not None else float("inf")
+
+        layer: dict[type, tuple[float, tuple[tuple[Implements, type], ...]]] = {from_type: (0.0, ())}
+        for _ in range(self.max_hops - 1):
+            next_layer: dict[type, tuple[float, tuple[tuple[Implements, type], ...]]] = {}
+            for node, (cost, hops) in layer.items():
+                for fmt in formats:
+                    edge = self._direct(node, fmt)
+                    if edge is None or cost + edge.cost >= best_cost or edge.is_async:
+                        continue
+                    if fmt not in next_layer or cost + edge.cost < next_layer[fmt][0]:
+                        next_layer[fmt] = (cost + edge.cost, (*hops, (edge, fmt)))
+
+            for node, (cost, hops) in next_layer.items():
+                last = self._direct(node, to_format)
+                if last is not None and cost + last.cost < best_cost:
+                    best_cost = cost + last.cost
+                    best = Implements(
+                        converter=ConversionChain(hops, last),
+                        from_format=hops[0][0].from_format,
+                        to_format=last.to_format,
+                        from_constraint=hops[0][0].from_constraint,
+                        to_constraint=last.to_constraint,
+                        cost=best_cost,
+                        view=last.view and all(impl.view for impl, _ in hops),
+                    )
+            layer = next_layer
+
+        return best
+
+    def targets_for(self, from_type: type, /, *, max_hops: int | None = None) -> tuple[type, ...]:
+        """Return the registered formats that ``from_type`` can be converted to.
+
+        The answer comes from indexes kept up to date on registration, and is
+        cached until the next registration, so it does not resolve any pair.
+        Implementations registered for the bases of ``from_type`` count, and
+        also convert to the registered subclasses of their format, as in
+        :meth:`resolve`. Unregistered subclasses of the returned formats can
+        be converted to as well. Constraints are not checked, and formats of
+        pending plugins are not known until loaded, see :meth:`load_plugins`.
+
+        Parameters
+        ----------
+        from_type : type, positional-only
+            The type to convert from.
+        max_hops : int | None, optional keyword-only
+            The maximum number of implementations chained. By default the
+            ``max_hops`` of the overloader.
+
+        Returns
+        -------
+        tuple[type, ...]
+            In order of registration.
+
+        """
+        return self._index().state.targets(from_type, self.max_hops if max_hops is None else max_hops)
+
+    def sources_for(self, to_format: type, /) -> tuple[type, ...]:
+        """Return the registered source types with an implementation to ``to_format``.
+
+        Implementations registered for the bases of ``to_format`` count, as in
+        :meth:`resolve`. The subclasses of the returned types can be converted
+        too. Only direct implementations are included, and constraints are not
+        checked.
+
+        Parameters
+        ----------
+        to_format : type, positional-only
+            The format to convert to.
+
+        Returns
+        -------
+        tuple[type, ...]
+            In order of registration.
+
+        """
+        return self._index().state.sources(to_format)
+
+    def reachable(self, from_type: type, to_format: type, /, *, max_hops: int | None = None) -> bool:
+        """Whether a chain of registered implementations converts ``from_type`` to ``to_format``.
+
+        This checks the indexes of :meth:`targets_for`, without resolving the
+        pair. Pass a large ``max_hops``, e.g. ``len(overloader)``, for any
+        chain at all.
+
+        Parameters
+        ----------
+        from_type : type, positional-only
+            The type to convert from.
+        to_format : type, positional-only
+            The format to convert to.
+        max_hops : int | None, optional keyword-only
+            The maximum number of implementations chained. By default the
+            ``max_hops`` of the overloader.
+
+        Returns
+        -------
+        bool
+
+        """
+        return self._index().state.reaches(from_type, to_format, self.max_hops if max_hops is None else max_hops)
+
+    def registering(self) -> DeferredInvalidation:
+        """Return a context deferring cache invalidation to the end of the block.
+
+        Each registration drops the cached resolutions it could change, which
+        scans the resolution cache. Inside the block, the registrations are
+        collected and the cache is scanned once on exit. Resolutions in the
+        block see its registrations, but are not cached. Blocks can be nested.
+
+        The block is one write: other threads see its registrations together
+        when it ends, and their registrations wait for it to end. Their
+        conversions don't wait. If the block raises, its registrations are
+        dropped, nested blocks only dropping their own.
+
+        Returns
+        -------
+        `override_toformat.overload.DeferredInvalidation`
+
+        Examples
+        --------
+        ::
+
+            with overloader.registering():
+                for fmt in formats:
+                    overloader.implements(fmt, Source)(convert)
+
+        """
+        return DeferredInvalidation(self)
+
+    def register_many(self, table: Mapping[tuple[type, type], Callable[..., Any]], /, **options: Any) -> None:
+        """Register many converters, invalidating the cache once.
+
+        The converters are registered in a :meth:`registering` block, so all
+        or none of them are: if one fails to register, none is.
+
+        Parameters
+        ----------
+        table : Mapping[tuple[type, type], Callable[..., Any]], positional-only
+            The converter of each ``(from_format, to_format)`` pair.
+        **options : Any
+            The options of :meth:`implements`, e.g. ``cost``, for every
+            converter.
+
+        """
+        with self.registering():
+            for (from_format, to_format), converter in table.items():
+                self.implements(to_format, from_format, **options)(converter)
+
+    def calibrate(self, samples: Iterable[object], /, *, number: int = 100) -> dict[tuple[type, type], float]:
+        """Set the cost of implementations from their measured time per call.
+
+        Each registered implementation that can convert one of the samples is
+        timed on the first such sample and re-registered with its time
+        relative to the median time as its cost. So costs stay in the unit of
+        the default cost, 1, that of a typical implementation, and compare
+        with those of implementations that fail on the samples, e.g. because
+        they need arguments, which keep their cost. ``async`` implementations
+        are not timed either. An implementation with only a batch converter
+        is timed per object of a batch of ``number`` samples, as in bulk
+        conversions.
+
+        Parameters
+        ----------
+        samples : Iterable[object], positional-only
+            Example objects, e.g. one of each registered format.
+        number : int, optional keyword-only
+            The number of calls to time per implementation, or of objects in
+            the batch of a batch-only implementation.
+
+        Returns
+        -------
+        dict[tuple[type, type], float]
+            The new cost of each timed ``(from_format, to_format)``.
+
+        """
+        from timeit import timeit  # noqa: PLC0415
+
+        times: dict[tuple[type, type], float] = {}
+        timed: list[Implements] = []
+        for obj in samples:
+            for (src, fmt), impl in self._registry.state.table.items():
+                if (src, fmt) in times or impl.is_async:
+                    continue
+                if not isinstance(obj, src) or not impl.is_valid(obj.__class__, fmt):
+                    continue
+                converter = impl.converter
+                try:
+                    if isinstance(converter, BatchToSingle):
+                        batch = [obj] * number
+                        seconds = timeit(lambda: converter.batch_converter(fmt, batch), number=1)  # noqa: B023
+                    else:
+                        seconds = timeit(lambda: converter(fmt, obj), number=number)  # noqa: B023
+                except Exception:  # noqa: BLE001, S112
+                    continue
+                times[(src, fmt)] = seconds / number
+                timed.append(impl)
+
+        # Seconds would make any timed implementation far cheaper than an
+        # untimed one of the default cost.
+        ordered = sorted(times.values())
+        unit = (ordered[len(ordered) // 2] if ordered else 1.0) or 1.0
+        costs = {pair: time / unit for pair, time in times.items()}
+        for (src, fmt), impl in zip(times, timed):
+            self._registry.register(src, fmt, replace(impl, cost=costs[(src, fmt)]))
+        return costs
+
+    def register_plugin(self, to_format: str, target: str, /) -> None:
+        """Import a converter module on the first conversion to a format.
+
+        Parameters
+        ----------
+        to_format : str, positional-only
+            The qualified name of the format, e.g. ``"array.array"``. The target
+            is also loaded for conversions to subclasses of the format.
+        target : str, positional-only
+            The module registering the converters, e.g. with
+            :meth:`implements`, or ``"module:function"``, where ``function`` is
+            called with this overloader.
+
+        Examples
+        --------
+        ::
+
+            overloader.register_plugin("numpy.ndarray", "mypackage.converters.numpy")
+
+        """
+        self._plugins.add(to_format, target)
+
+    def load_entry_points(self, group: str, /) -> None:
+        """Register plugins for the entry points in ``group``.
+
+        Each entry point's name is the qualified name of a format and its
+        value a target, see :meth:`register_plugin`. Nothing is imported until
+        a conversion to the format.
+
+        Parameters
+        ----------
+        group : str, positional-only
+            The entry point group, e.g. declared in ``pyproject.toml`` as
+
+            .. code-block:: toml
+
+                [project.entry-points."mypackage.formats"]
+                "numpy.ndarray" = "mypackage.converters.numpy"
+
+        """
+        for name, target in entry_point_targets(group):
+            self._plugins.add(name, target)
+
+    def load_plugins(self) -> None:
+        """Import every pending plugin now, e.g. before forking workers."""
+        self._plugins.load_all(self)
+
+    def freeze(self) -> FrozenToFormatOverloader:
+        """Return an immutable copy, resolved into a single flat table.
+
+        Every pair of a registered (or chained, if ``max_hops`` > 1) source
+        type, or a source type resolved so far, and a registered or resolved
+        format is resolved up front. The frozen overloader looks pairs up in
+        one `dict`, without walking method resolution orders. Other pairs, e.g.
+        of subclasses not converted yet, are resolved from the registrations
+        on each lookup. Pending plugins are loaded first.
+
+        Returns
+        -------
+        `override_toformat.overload.FrozenToFormatOverloader`
+
+        """
+        table, edges = self._flatten()
+        return FrozenToFormatOverloader(
+            table,
+            edges,
+            max_hops=self.max_hops,
+            result_cache=self.result_cache,
+            stats=self._stats,
+        )
+
+    def snapshot(self) -> RegistrySnapshot:
+        """Return a snapshot of the registry, e.g. to pickle for fast startup.
+
+        The snapshot holds the registered implementations and the table of
+        resolved pairs of :meth:`freeze`, with the converters by import path.
+        Loading it with
+        :meth:`~override_toformat.overload.FrozenToFormatOverloader.from_snapshot`
+        makes a frozen overloader without resolving any pair, and imports each
+        converter on its first call.
+
+        Returns
+        -------
+        `~override_toformat.snapshot.RegistrySnapshot`
+
+        Raises
+        ------
+        ValueError
+            If a converter can't be imported by its qualified name, e.g. it is
+            a lambda or defined in a function, or an implementation has its own
+            result cache.
+
+        Examples
+        --------
+        ::
+
+            # at build time
+            Path("registry.pickle").write_bytes(pickle.dumps(overloader.snapshot()))
+
+            # at startup
+            snapshot = pickle.loads(Path("registry.pickle").read_bytes())
+            overloader = FrozenToFormatOverloader.from_snapshot(snapshot)
+
+        """
+        table, edges = self._flatten()
+        return dump_registry(table, edges, max_hops=self.max_hops, result_cache=self.result_cache)
+
+    def _flatten(self) -> tuple[dict[tuple[type, type], Implements], dict[type, dict[type, Implements]]]:
+        """Return the resolved pairs and registered implementations, see :meth:`freeze`."""
+        self.load_plugins()
+
+        edges: dict[type, dict[type, Implements]] = {}
+        for (src, fmt), impl in self._registry.state.table.items():
+            edges.setdefault(fmt, {})[src] = impl
+        # Not the subclasses of the registered types, which depend on which
+        # modules happen to be imported, and may be garbage.
+        resolved = tuple(self._resolved)
+        sources = {src for impls in edges.values() for src in impls} | {src for src, _ in resolved}
+        formats = set(edges) | {fmt for _, fmt in resolved}
+        if self.max_hops > 1:
+            sources |= formats
+
+        table: dict[tuple[type, type], Implements] = {}
+        for src in sources:
+            for fmt in formats:
+                try:
+                    table[(src, fmt)] = self.resolve(src, fmt)
+                except NotImplementedError:  # noqa: PERF203
+                    continue
+        return table, edges
+
+    def instrument(self, *, enabled: bool = True) -> None:
+        """Turn on or off recording per-pair statistics of conversions.
+
+        When on, the resolved implementations are timed copies of the
+        registered ones, see :meth:`stats`. Turning it off discards the
+        recorded statistics.
+
+        Parameters
+        ----------
+        enabled : bool, optional keyword-only
+            Whether to record statistics.
+
+        """
+        with self._registry.lock:
+            stats = (self._stats or ConversionStats()) if enabled else None
+            object.__setattr__(self, "_stats", stats)
+            # Re-resolve, with or without instrumentation.
+            self._routed.clear()
+            object.__setattr__(self, "_resolved", {})
+
+    def profile(
+        self,
+        every: int | None = 100,
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> SamplingProfiler | None:
+        """Sample the latency of one in ``every`` calls of ``to_format``.
+
+        Sampled calls of :meth:`override_toformat.ToFormatOverloadMixin.to_format`
+        are timed by phase: resolving the implementation, validating the
+        constraints and converting. The timings are counted in fixed-bucket
+        histograms, see `~override_toformat.sampling.SamplingProfiler`.
+
+        Parameters
+        ----------
+        every : int or None, optional
+            The sampling period. `None` turns the profiler off.
+        buckets : Sequence[float], optional keyword-only
+            The upper bounds of the histogram buckets, in seconds.
+
+        Returns
+        -------
+        `~override_toformat.sampling.SamplingProfiler` or None
+            The new profiler, also the ``profiler`` attribute.
+
+        """
+        profiler = None if every is None else SamplingProfiler(self, every, buckets)
+        object.__setattr__(self, "profiler", profiler)
+        return profiler
+
+    def stats(self, *, reset: bool = False) -> dict[tuple[type, type], PairStats]:
+        """Return statistics of the conversions, by ``(from_type, to_format)``.
+
+        Recorded while :meth:`instrument` is on: the calls of and time in each
+        pair's converters, its lookups in the resolution cache, and the
+        conversions refused by its constraints.
+
+        Parameters
+        ----------
+        reset : bool, optional keyword-only
+            Whether to zero the statistics after taking this snapshot.
+
+        Returns
+        -------
+        dict[tuple[type, type], `~override_toformat.stats.PairStats`]
+            Empty if :meth:`instrument` has never been turned on.
+
+        """
+        return {} if self._stats is None else self._stats.snapshot(reset=reset)
+
+    def to_format_many(self, objs: Iterable[object], to_format: type, /, *args: Any, **kwargs: Any) -> list[Any]:
+        """Convert many objects to ``to_format``.
+
+        The objects are grouped by type, so the implementation is resolved and
+        its constraints validated once per type, not once per object.
+
+        Parameters
+        ----------
+        objs : Iterable[object], positional-only
+            The objects to convert. They may be of different types.
+        to_format : type, positional-only
+            The format to convert to.
+        *args : Any
+            Positional arguments to pass to the converters.
+        **kwargs : Any
+            Keyword arguments to pass to the converters.
+
+        Returns
+        -------
+        list[Any]
+            The converted objects, in the order of ``objs``.
+
+        Raises
+        ------
+        NotImplementedError
+            If any object's type has no implementation for ``to_format``.
+        TypeError
+            If a converter is ``async``, see :meth:`ato_format_many`.
+        ValueError
+            If any object or the format is not compatible with the constraints.
+
+        """
+        objs = objs if isinstance(objs, Sequence) else tuple(objs)
+
+        out: list[Any] = [None] * len(objs)
+        for from_type, indices in group_by_type(objs).items():
+            impl = self.resolve(from_type, to_format)
+            impl.validate(objs[indices[0]], to_format)
+            converted = convert_group(impl, to_format, [objs[i] for i in indices], args, kwargs)
+            for i, result in zip(indices, converted):
+                out[i] = result
+        return out
+
+    def map(
+        self,
+        objs: Iterable[object],
+        to_format: type,
+        /,
+        *args: Any,
+        executor: Executor | None = None,
+        chunksize: int | None = None,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Convert many objects to ``to_format`` concurrently.
+
+        Like :meth:`to_format_many`, the objects are grouped by type and the
+        implementations are resolved and validated on the calling thread. The
+        groups are then split into chunks, which are converted on
+        ``executor``. This is useful for converters that release the GIL, e.g.
+        NumPy-heavy ones, or on free-threaded builds of Python.
+
+        Parameters
+        ----------
+        objs : Iterable[object], positional-only
+            The objects to convert. They may be of different types.
+        to_format : type, positional-only
+            The format to convert to.
+        *args : Any
+            Positional arguments to pass to the converters.
+        executor : `concurrent.futures.Executor` or None, optional keyword-only
+            The executor on which to convert the chunks. If `None` (default), a
+            `~concurrent.futures.ThreadPoolExecutor` is made for the call.
+        chunksize : int or None, optional keyword-only
+            The maximum number of objects per chunk. If `None` (default), each
+            group is split into about 4 chunks per CPU.
+        **kwargs : Any
+            Keyword arguments to pass to the converters.
+
+        Returns
+        -------
+        list[Any]
+            The converted objects, in the order of ``objs``.
+
+        Raises
+        ------
+        NotImplementedError
+            If any object's type has no implementation for ``to_format``.
+        TypeError
+            If a converter is ``async``, see :meth:`ato_format_many`.
+        ValueError
+            If ``chunksize`` is less than 1, or any object or the format is not
+            compatible with the constraints.
+        `override_toformat.ConversionError`
+            If any chunk fails to convert. All chunks are run first.
+
+        """
+        if chunksize is not None:
+            check_chunksize(chunksize)
+        objs = objs if isinstance(objs, Sequence) else tuple(objs)
+
+        tasks: list[tuple[Implements, list[int]]] = []
+        for from_type, indices in group_by_type(objs).items():
+            impl = self.resolve(from_type, to_format)
+            impl.validate(objs[indices[0]], to_format)
+            check_sync(impl, to_format)
+            size = chunksize if chunksize is not None else -(-len(indices) // (4 * (os.cpu_count() or 1)))
+            tasks.extend((impl, indices[i : i + size]) for i in range(0, len(indices), size))
+
+        if executor is not None:
+            return convert_chunks(executor, tasks, to_format, objs, args, kwargs)
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415  # slow to import
+
+        with ThreadPoolExecutor() as pool:
+            return convert_chunks(pool, tasks, to_format, objs, args, kwargs)
+
+    def iter_to_format(
+        self,
+        objs: Iterable[object],
+        to_format: type,
+        /,
+        *args: Any,
+        chunksize: int = 1,
+        executor: Executor | None = None,
+        prefetch: int = 2,
+        **kwargs: Any,
+    ) -> Iterator[Any]:
+        """Lazily convert objects to ``to_format``.
+
+        Objects are consumed from ``objs`` as the results are consumed, so
+        neither need fit in memory. The implementation is only resolved and
+        validated when the type changes from one object to the next.
+
+        Parameters
+        ----------
+        objs : Iterable[object], positional-only
+            The objects to convert. They may be of different types.
+        to_format : type, positional-only
+            The format to convert to.
+        *args : Any
+            Positional arguments to pass to the converters.
+        chunksize : int, optional keyword-only
+            The maximum number of consecutive same-typed objects to convert at
+            once, e.g. with a batch converter. Default 1.
+        executor : `concurrent.futures.Executor` or None, optional keyword-only
+            If given, chunks are converted on the executor.
+        prefetch : int, optional keyword-only
+            The number of chunks converted on ``executor`` ahead of the one
+            being yielded. Default 2.
+        **kwargs : Any
+            Keyword arguments to pass to the converters.
+
+        Yields
+        ------
+        Any
+            The converted objects, in the order of ``objs``.
+
+        Raises
+        ------
+        NotImplementedError
+            If an object's type has no implementation for ``to_format``.
+        TypeError
+            If a converter is ``async``, see :meth:`ato_format_many`.
+        ValueError
+            If ``chunksize`` is less than 1, checked on the call, or an object
+            or the format is not compatible with the constraints.
+
+        """
+        check_chunksize(chunksize)
+        if chunksize == 1 and executor is None:
+            return self._iter_each(objs, to_format, args, kwargs)
+        return self._iter_chunks(objs, to_format, args, kwargs, chunksize, executor, prefetch)
+
+    def _iter_each(
+        self,
+        objs: Iterable[object],
+        to_format: type,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        /,
+    ) -> Iterator[Any]:
+        """Convert objects one at a time, see :meth:`iter_to_format`."""
+        last_type = None
+        for obj in objs:
+            if obj.__class__ is not last_type:
+                last_type = obj.__class__
+                impl = self.resolve(last_type, to_format)
+                check_sync(impl, to_format, batch=False)
+            yield impl(obj, to_format, *args, **kwargs)
+
+    def _iter_chunks(  # noqa: PLR0913
+        self,
+        objs: Iterable[object],
+        to_format: type,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        chunksize: int,
+        executor: Executor | None,
+        prefetch: int,
+        /,
+    ) -> Iterator[Any]:
+        """Convert runs of objects, see :meth:`iter_to_format`."""
+
+        def chunks() -> Iterator[tuple[Implements, list[object]]]:
+            last_type = None
+            for run in iter_runs(objs, chunksize):
+                if run[0].__class__ is not last_type:
+                    last_type = run[0].__class__
+                    impl = self.resolve(last_type, to_format)
+                    impl.validate(run[0], to_format)
+                    check_sync(impl, to_format)
+                yield impl, run
+
+        if executor is None:
+            for impl, run in chunks():
+                yield from convert_group(impl, to_format, run, args, kwargs)
+            return
+
+        pending: deque[Future[list[Any]]] = deque()
+        try:
+            for impl, run in chunks():
+                pending.append(executor.submit(convert_group, impl, to_format, run, args, kwargs))
+                if len(pending) > prefetch:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def ato_format_many(
+        self,
+        objs: Iterable[object],
+        to_format: type,
+        /,
+        *args: Any,
+        limit: int | None = None,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Convert many objects to ``to_format`` on the running event loop.
+
+        Like :meth:`to_format_many`, the objects are grouped by type and the
+        implementations are resolved and validated once per group. ``async``
+        converters are awaited concurrently, up to ``limit`` at a time. Batch
+        converters are called once per group.
+
+        Parameters
+        ----------
+        objs : Iterable[object], positional-only
+            The objects to convert. They may be of different types.
+        to_format : type, positional-only
+            The format to convert to.
+        *args : Any
+            Positional arguments to pass to the converters.
+        limit : int or None, optional keyword-only
+            The maximum number of conversions awaited at once, at least 1. If
+            `None` (default), there is no limit: one coroutine is started per
+            object, or per group with a batch converter.
+        **kwargs : Any
+            Keyword arguments to pass to the converters.
+
+        Returns
+        -------
+        list[Any]
+            The converted objects, in the order of ``objs``.
+
+        Raises
+        ------
+        NotImplementedError
+            If any object's type has no implementation for ``to_format``.
+        ValueError
+            If any object or the format is not compatible with the constraints,
+            or ``limit`` is less than 1.
+        `override_toformat.ConversionError`
+            If any conversion fails. All conversions are run first.
+
+        """
+        check_limit(limit)
+        objs = objs if isinstance(objs, Sequence) else tuple(objs)
+
+        groups: list[tuple[Implements, list[int]]] = []
+        for from_type, indices in group_by_type(objs).items():
+            impl = self.resolve(from_type, to_format)
+            impl.validate(objs[indices[0]], to_format)
+            groups.append((impl, indices))
+
+        return await aconvert_groups(groups, to_format, objs, args, kwargs, limit)
+
+    def _index(self) -> Registry:
+        """Return the registry of the implementations, to resolve and to query."""
+        return self._registry
+
+    def _intern(self, constraint: TypeConstraint, /) -> TypeConstraint:
+        """Return the registered constraint equal to ``constraint``, or add it.
+
+        Registrations share equal constraints, e.g. the ``Covariant(to_format)``
+        of every registration for a format. The table is per overloader, so
+        the types in it live as long as the registrations do.
+        """
+        return self._constraints.setdefault(constraint, constraint)
+
+    def _track_abcs(self) -> None:
+        """Drop the cached resolutions whenever a type is registered with an ABC.
+
+        Needed once a registration involves an ABC or an explicit constraint,
+        whose verdicts can change with ABC registrations.
+        """
+        if self._cache_token is None:
+            object.__setattr__(self, "_cache_token", get_cache_token())
+
+    def _clear_resolved(self, from_type: type, to_format: type, /) -> None:
+        """Drop cached resolutions affected by registering ``(from_type, to_format)``.
+
+        Only pairs whose source subclasses ``from_type`` and whose format
+        subclasses ``to_format`` can dispatch differently after the registration.
+        """
+        if hasattr(from_type, "__abstractmethods__") or hasattr(to_format, "__abstractmethods__"):
+            self._track_abcs()
+
+        if self._registry.holds:
+            self._stale.add((from_type, to_format))
+            return
+        self._drop_resolved(((from_type, to_format),))
+
+    @property
+    def _deferring(self) -> int:
+        """The depth of nested `registering` blocks, in the thread registering."""
+        return self._registry.holds
+
+    def _drop_stale(self) -> None:
+        """Publish the registrations deferred by `registering` and drop their cached resolutions.
+
+        Called holding the registry's lock.
+        """
+        self._registry.publish()
+        registered = tuple(self._stale)
+        self._stale.clear()
+        self._drop_resolved(registered)
+
+    def _drop_resolved(self, registered: tuple[tuple[type, type], ...], /) -> None:
+        """Drop cached resolutions affected by the ``(from_type, to_format)`` registrations.
+
+        Called holding the registry's lock, after publishing the registrations.
+        Resolutions are added concurrently, so the cache is copied and swapped.
+        A resolution of the previous registry state can only be added to the
+        copy before it's made, so it is dropped with the others.
+        """
+        if not self._resolved:
+            # Nothing to copy, but a resolution in progress is still dropped.
+            self._routed.clear()
+            object.__setattr__(self, "_resolved", {})
+            return
+        resolved = self._resolved.copy()
+        # Routes are added before their resolution, so all routes in the copy
+        # are in ``_routed`` by now.
+        for k in tuple(self._routed):
+            resolved.pop(k, None)
+        self._routed.clear()
+
+        stale = [
+            k
+            for k in resolved
+            if any(issubclass(k[0], from_type) and issubclass(k[1], to_format) for from_type, to_format in registered)
+        ]
+        for k in stale:
+            del resolved[k]
+        object.__setattr__(self, "_resolved", resolved)
 
     # ===============================================================
     # Mapping
 
+    def _registered(self) -> dict[type, Dispatcher]:
+        """Return the registered formats' dispatchers."""
+        registry = self._registry
+        return {fmt: Dispatcher(registry, fmt) for fmt in registry.state.formats}
+
     def __getitem__(self, key: type, /) -> Dispatcher:
-        return self._dispatcher.registry[key]()
+        if key not in self._registry.state.formats:
+            raise KeyError(key)
+        return Dispatcher(self._registry, key)
 
     def __contains__(self, o: object, /) -> bool:
-        return o in self._dispatcher.registry
+        return o in self._registry.state.formats
 
     def __iter__(self) -> Iterator[type]:
-        return iter(self._dispatcher.registry)
+        return iter(self._registered())
 
     def __len__(self) -> int:
-        return len(self._dispatcher.registry)
+        return len(self._registered())
 
     def keys(self) -> KeysView[type]:
         """Return a view of the keys."""
-        return self._dispatcher.registry.keys()
+        return self._registered().keys()
 
     def values(self) -> ValuesView[Dispatcher]:
         """Return a view of a copy of the values."""
-        return {k: v() for k, v in self._dispatcher.registry.items()}.values()
+        return self._registered().values()
 
     def items(self) -> ItemsView[type, Dispatcher]:
         """Return a view of a copy of the items."""
-        return {k: v() for k, v in self._dispatcher.registry.items()}.items()
+        return self._registered().items()
 
     # ===============================================================
 
@@ -76,6 +1084,10 @@ class ToFormatOverloader(Mapping[type, Dispatcher]):
         *,
         from_constraint: type | TypeConstraint | None = ...,
         to_constraint: type | TypeConstraint | None = ...,
+        batch: bool = ...,
+        cost: float = ...,
+        view: bool = ...,
+        cache: bool | ResultCache = ...,
     ) -> RegisterImplementsDecorator: ...
 
     @overload
@@ -86,17 +1098,64 @@ class ToFormatOverloader(Mapping[type, Dispatcher]):
         *,
         from_constraint: type | TypeConstraint | None = ...,
         to_constraint: type | TypeConstraint | None = ...,
+        batch: bool = ...,
+        cost: float = ...,
+        view: bool = ...,
+        cache: bool | ResultCache = ...,
     ) -> RegisterManyImplementsDecorator: ...
 
-    def implements(
+    def implements(  # noqa: PLR0913
         self,
         to_format: type | set[type],
         from_format: type,
         *,
         from_constraint: type | TypeConstraint | None = None,
         to_constraint: type | TypeConstraint | None = None,
+        batch: bool = False,
+        cost: float = 1.0,
+        view: bool = False,
+        cache: bool | ResultCache = False,
     ) -> RegisterImplementsDecorator | RegisterManyImplementsDecorator:
-        """Register an assistance function."""
+        """Register an assistance function.
+
+        Parameters
+        ----------
+        to_format : type or set[type]
+            The format(s) to convert to.
+        from_format : type
+            The type to convert from.
+        from_constraint, to_constraint : type or TypeConstraint or None, optional
+            Constraints on the source type and the format. `None` (default)
+            means `~override_toformat.constraints.Covariant` with the format.
+        batch : bool, optional
+            Whether the decorated function is a batch converter, taking a
+            sequence of same-typed objects and returning a sequence of
+            results. A batch converter and a single-object converter can be
+            registered for the same formats; bulk conversions use the batch
+            converter and single conversions the single one, falling back to
+            whichever exists. A batch converter added to a single converter's
+            registration keeps its ``cost``, ``view`` and ``cache``.
+        cost : float, optional
+            The relative cost of the conversion, e.g. higher for converters that
+            copy large buffers. Among competing implementations and chains of
+            implementations the cheapest is used. Default 1. See also
+            :meth:`calibrate`.
+        view : bool, optional
+            Whether the converter returns a view sharing memory with the
+            source object, e.g. a `memoryview` of its buffer, rather than a
+            copy. See the ``copy_policy`` argument of
+            :meth:`override_toformat.ToFormatOverloadMixin.to_format`.
+        cache : bool or `~override_toformat.cache.ResultCache`, optional
+            Whether to memoize the results of single conversions. `True` uses
+            the overloader's :attr:`result_cache`, or a ``ResultCache`` can be
+            given, e.g. with a content ``key`` for immutable value objects.
+            Default `False`.
+
+        Returns
+        -------
+        RegisterImplementsDecorator or RegisterManyImplementsDecorator
+
+        """
         if not isinstance(to_format, set):
             # `methods` is ignored for funcs
             return RegisterImplementsDecorator(
@@ -105,6 +1164,10 @@ class ToFormatOverloader(Mapping[type, Dispatcher]):
                 from_format=from_format,
                 from_constraint=from_constraint,
                 to_constraint=to_constraint,
+                batch=batch,
+                cost=cost,
+                view=view,
+                cache=cache,
             )
 
         else:
@@ -117,8 +1180,269 @@ class ToFormatOverloader(Mapping[type, Dispatcher]):
                             to_format=fmt,
                             from_constraint=from_constraint,
                             to_constraint=to_constraint,
+                            batch=batch,
+                            cost=cost,
+                            view=view,
+                            cache=cache,
                         )
                     )
                     for fmt in to_format
                 ),
             )
+
+
+class FrozenToFormatOverloader(ToFormatOverloader):
+    """Immutable ``to_format`` overloader, backed by a flat table.
+
+    Made by :meth:`ToFormatOverloader.freeze`. Pairs that were not resolved
+    when freezing, e.g. of classes defined afterwards, are resolved like
+    the dispatchers from the registered implementations: the
+    closest registered format in the format's method resolution order, then
+    the cheapest valid source type registered for it, ties going to the
+    closest. These lookups do not consider chains, and are added to the table.
+
+    Parameters
+    ----------
+    table : dict[tuple[type, type], Implements]
+        The resolved implementation of each ``(from_type, to_format)`` pair.
+    edges : dict[type, dict[type, Implements]]
+        The registered implementations, by format then source type.
+    max_hops : int, keyword-only
+        The ``max_hops`` of the frozen overloader.
+    result_cache : `~override_toformat.cache.ResultCache`, keyword-only
+        The ``result_cache`` of the frozen overloader.
+    stats : `~override_toformat.stats.ConversionStats` or None, keyword-only
+        The statistics of the frozen overloader, if it was instrumented. The
+        implementations in ``table`` record into it, except for lookups.
+
+    """
+
+    def __init__(
+        self,
+        table: dict[tuple[type, type], Implements],
+        edges: dict[type, dict[type, Implements]],
+        *,
+        max_hops: int,
+        result_cache: ResultCache,
+        stats: ConversionStats | None = None,
+    ) -> None:
+        self._max_hops: int
+        object.__setattr__(self, "_max_hops", max_hops)
+        self.result_cache: ResultCache
+        object.__setattr__(self, "result_cache", result_cache)
+        self._stats: ConversionStats | None
+        object.__setattr__(self, "_stats", stats)
+        self.profiler: SamplingProfiler | None
+        object.__setattr__(self, "profiler", None)
+        self._plugins: PluginTable
+        object.__setattr__(self, "_plugins", PluginTable())
+
+        self._table: dict[tuple[type, type], Implements]
+        object.__setattr__(self, "_table", table)
+        self._edges: dict[type, dict[type, Implements]]
+        object.__setattr__(self, "_edges", edges)
+        # Built from the edges by the first `targets_for` or the like.
+        self._indexed: Registry | None
+        object.__setattr__(self, "_indexed", None)
+        # The bookkeeping of the inherited resolution, e.g. of chains. There
+        # are no registrations, so no cached resolutions to drop.
+        self._routed: set[tuple[type, type]]
+        object.__setattr__(self, "_routed", set())
+        self._stale: set[tuple[type, type]]
+        object.__setattr__(self, "_stale", set())
+        self._cache_token: object | None
+        object.__setattr__(self, "_cache_token", None)
+        self._constraints: dict[TypeConstraint, TypeConstraint]
+        object.__setattr__(self, "_constraints", {})
+
+    @classmethod
+    def from_snapshot(cls, snapshot: RegistrySnapshot, /) -> FrozenToFormatOverloader:
+        """Load a snapshot made by :meth:`ToFormatOverloader.snapshot`.
+
+        Parameters
+        ----------
+        snapshot : `~override_toformat.snapshot.RegistrySnapshot`, positional-only
+            The snapshot to load.
+
+        Returns
+        -------
+        `override_toformat.overload.FrozenToFormatOverloader`
+            With a new ``result_cache``.
+
+        Raises
+        ------
+        ValueError
+            If the snapshot was made by an incompatible version.
+
+        """
+        result_cache = ResultCache()
+        table, edges = load_registry(snapshot, result_cache=result_cache)
+        return cls(table, edges, max_hops=snapshot.max_hops, result_cache=result_cache)
+
+    def __call__(self, key: type, /) -> Dispatcher:
+        """Return a copy of the dispatcher for ``key``."""
+        for fmt in key.__mro__:
+            if fmt in self._edges:
+                return self[fmt]
+        raise NotImplementedError
+
+    def resolve(self, from_type: type, to_format: type, /) -> Implements:
+        """Return the implementation converting ``from_type`` to ``to_format``.
+
+        Parameters
+        ----------
+        from_type : type, positional-only
+            The type of the object to convert.
+        to_format : type, positional-only
+            The format to convert to.
+
+        Returns
+        -------
+        `override_toformat.implementation.Implements`
+
+        Raises
+        ------
+        NotImplementedError
+            If there is no implementation for the ``(from_type, to_format)`` pair.
+
+        """
+        key = (from_type, to_format)
+        try:
+            return self._table[key]
+        except KeyError:
+            pass
+
+        for fmt in to_format.__mro__:
+            impls = self._edges.get(fmt)
+            if impls is None:
+                continue
+            # The closest format decides, then the cheapest valid source, as
+            # in `ToFormatOverloader`. If none is valid, the closest source
+            # raises the constraint error when called.
+            first: Implements | None = None
+            best: Implements | None = None
+            for src in from_type.__mro__:
+                impl = impls.get(src)
+                if impl is None:
+                    continue
+                first = impl if first is None else first
+                if (best is None or impl.cost < best.cost) and impl.is_valid(from_type, to_format):
+                    best = impl
+            found = best or first
+            if found is None:
+                break
+            self._table[key] = found
+            return found
+        raise NotImplementedError
+
+    def freeze(self) -> FrozenToFormatOverloader:
+        """Return ``self``, which is already frozen."""
+        return self
+
+    @property
+    def max_hops(self) -> int:
+        """The ``max_hops`` of the overloader when frozen."""
+        return self._max_hops
+
+    @max_hops.setter
+    def max_hops(self, value: int) -> None:
+        msg = "can't change max_hops of a frozen overloader"
+        raise TypeError(msg)
+
+    @property
+    def _deferring(self) -> int:
+        """A frozen overloader is never registered to, so never defers."""
+        return 0
+
+    def _index(self) -> Registry:
+        registry = self._indexed
+        if registry is None:
+            registry = Registry()
+            for fmt, impls in self._edges.items():
+                for src, impl in impls.items():
+                    registry.register(src, fmt, impl)
+            object.__setattr__(self, "_indexed", registry)
+        return registry
+
+    def _flatten(self) -> tuple[dict[tuple[type, type], Implements], dict[type, dict[type, Implements]]]:
+        return self._table, self._edges
+
+    def implements(self, *args: Any, **kwargs: Any) -> Any:
+        """Raise `TypeError`, as a frozen overloader can't be registered to."""
+        msg = "can't register implementations with a frozen overloader"
+        raise TypeError(msg)
+
+    def calibrate(self, *args: Any, **kwargs: Any) -> Any:
+        """Raise `TypeError`, as a frozen overloader can't be re-registered."""
+        msg = "can't calibrate a frozen overloader"
+        raise TypeError(msg)
+
+    def registering(self) -> DeferredInvalidation:
+        """Raise `TypeError`, as a frozen overloader can't be registered to."""
+        msg = "can't register implementations with a frozen overloader"
+        raise TypeError(msg)
+
+    def instrument(self, *, enabled: bool = True) -> None:
+        """Raise `TypeError`, as the table of a frozen overloader is fixed."""
+        msg = "can't instrument a frozen overloader, instrument it before freezing"
+        raise TypeError(msg)
+
+    def register_plugin(self, *args: Any, **kwargs: Any) -> Any:
+        """Raise `TypeError`, as a frozen overloader can't be registered to."""
+        msg = "can't register plugins with a frozen overloader"
+        raise TypeError(msg)
+
+    def load_entry_points(self, *args: Any, **kwargs: Any) -> Any:
+        """Raise `TypeError`, as a frozen overloader can't be registered to."""
+        msg = "can't register plugins with a frozen overloader"
+        raise TypeError(msg)
+
+    # ===============================================================
+    # Mapping
+
+    def _registered(self) -> dict[type, Dispatcher]:
+        return {fmt: self[fmt] for fmt in self._edges}
+
+    def __getitem__(self, key: type, /) -> Dispatcher:
+        """Return a copy of the dispatcher for format ``key``."""
+        registry = Registry()
+        for src, impl in self._edges[key].items():
+            registry.register(src, key, impl)
+        return Dispatcher(registry, key)
+
+    def __contains__(self, o: object, /) -> bool:
+        return o in self._edges
+
+
+class DeferredInvalidation:
+    """Context deferring cache invalidation, see `ToFormatOverloader.registering`.
+
+    Parameters
+    ----------
+    overloader : `ToFormatOverloader`
+        The overloader whose cache invalidation is deferred.
+
+    """
+
+    def __init__(self, overloader: ToFormatOverloader, /) -> None:
+        self.overloader = overloader
+
+    def __enter__(self) -> ToFormatOverloader:
+        # Other threads' registrations wait until the block ends.
+        self.overloader._registry.hold()  # noqa: SLF001
+        return self.overloader
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: object) -> None:
+        # An error drops the registrations of the block, unpublished, so the
+        # cached resolutions stay valid.
+        overloader = self.overloader
+        registry = overloader._registry  # noqa: SLF001
+        commit = exc_type is None
+        try:
+            if registry.holds == 1:
+                if commit:
+                    overloader._drop_stale()  # noqa: SLF001
+                else:
+                    overloader._stale.clear()  # noqa: SLF001
+        finally:
+            registry.release(commit=commit)
@@ -0,0 +1,156 @@
+"""Lazily imported converter modules."""
+
+from __future__ import annotations
+
+import sys
+from importlib import import_module
+from threading import Event, RLock, get_ident
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from override_toformat.overload import ToFormatOverloader
+
+__all__: list[str] = []
+
+
+##############################################################################
+# CODE
+##############################################################################
+
+
+def qualified_name(cls: type, /) -> str:
+    """Return the name of ``cls`` plugins are registered under, e.g. ``"array.array"``."""
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def entry_point_targets(group: str, /) -> list[tuple[str, str]]:
+    """Return the ``(format name, target)`` of each entry point in ``group``.
+
+    Parameters
+    ----------
+    group : str, positional-only
+        The entry point group.
+
+    Returns
+    -------
+    list[tuple[str, str]]
+
+    """
+    # `importlib.metadata` is slow to import, so only import it when needed.
+    from importlib.metadata import entry_points  # noqa: PLC0415
+
+    if sys.version_info >= (3, 10):
+        found = entry_points(group=group)
+    else:
+        found = entry_points().get(group, [])
+    return [(ep.name, ep.value) for ep in found]
+
+
+class PluginTable:
+    """Converter modules to import on the first conversion to their formats.
+
+    Formats are keyed on their qualified name, see `qualified_name`, so the
+    modules defining them need not be imported either. A target is a module
+    path, whose import registers the converters, e.g. with
+    :meth:`override_toformat.ToFormatOverloader.implements`, or
+    ``"module:function"``, where ``function`` is then called with the
+    overloader.
+    """
+
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._pending: dict[str, list[str]] = {}
+        # The formats whose targets are being loaded, by a thread without the lock.
+        self._loading: dict[str, _Loading] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._pending or self._loading)
+
+    def add(self, format_name: str, target: str, /) -> None:
+        """Add a ``target`` to load for format ``format_name``."""
+        with self._lock:
+            self._pending.setdefault(format_name, []).append(target)
+
+    def load(self, to_format: type, overloader: ToFormatOverloader, /) -> bool:
+        """Load the targets of ``to_format`` and its bases, if any are pending.
+
+        The targets are dropped once loaded. If one fails to import, it is
+        kept, as are the targets after it, and the error is raised.
+
+        Parameters
+        ----------
+        to_format : type, positional-only
+            The format being converted to.
+        overloader : `override_toformat.ToFormatOverloader`, positional-only
+            The overloader passed to ``"module:function"`` targets.
+
+        Returns
+        -------
+        bool
+            Whether any target was loaded.
+
+        """
+        loaded = False
+        for cls in to_format.__mro__:
+            loaded = self._load_format(qualified_name(cls), overloader) or loaded
+        return loaded
+
+    def load_all(self, overloader: ToFormatOverloader, /) -> None:
+        """Load every pending target."""
+        with self._lock:
+            names = list(self._pending)
+        for name in names:
+            self._load_format(name, overloader)
+
+    def _load_format(self, name: str, overloader: ToFormatOverloader, /) -> bool:
+        """Load the targets of format ``name``, or wait for the thread loading them.
+
+        The targets are imported without the lock, as their registrations
+        take the registry's lock, which a thread in a `registering` block holds
+        while it resolves, and so loads. That thread doesn't wait for another
+        loading the targets, which needs the registry's lock to register, and
+        sees the registrations when its block ends.
+        """
+        claimed = _Loading()
+        while True:
+            with self._lock:
+                loading = self._loading.get(name)
+                targets = self._pending.pop(name, None) if loading is None else None
+                if targets:
+                    self._loading[name] = claimed
+            if targets:
+                break
+            # A target can convert to its own format as it loads.
+            if loading is None or loading.owner == get_ident() or overloader._registry.owned:  # noqa: SLF001
+                return False
+            loading.done.wait()
+
+        try:
+            while targets:
+                _load(targets[0], overloader)
+                targets.pop(0)
+        finally:
+            with self._lock:
+                del self._loading[name]
+                if targets:  # keep the failed target and those after it
+                    self._pending[name] = targets + self._pending.get(name, [])
+            claimed.done.set()
+        return True
+
+
+class _Loading:
+    """The thread loading the targets of a format, and when it is done."""
+
+    def __init__(self) -> None:
+        self.owner = get_ident()
+        self.done = Event()
+
+
+def _load(target: str, overloader: ToFormatOverloader, /) -> None:
+    module_name, _, attr = target.partition(":")
+    module = import_module(module_name.strip())
+    if attr:
+        obj: Any = module
+        for part in attr.strip().split("."):
+            obj = getattr(obj, part)
+        obj(overloader)
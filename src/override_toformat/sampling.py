@@ -0,0 +1,218 @@
+"""Sampling latency profiler of ``to_format``."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Sequence
+
+if TYPE_CHECKING:
+    from override_toformat.overload import ToFormatOverloader
+
+__all__ = ["DEFAULT_BUCKETS", "PHASES", "Histogram", "SamplingProfiler"]
+
+
+##############################################################################
+# PARAMETERS
+
+DEFAULT_BUCKETS: tuple[float, ...] = (*(float(f"{m}e{e}") for e in range(-7, 1) for m in (1, 2, 5)), 10.0)
+"""Upper bounds of the default histogram buckets, in seconds: 100 ns to 10 s."""
+
+PHASES: tuple[str, ...] = ("resolve", "validate", "convert", "total")
+"""The phases of a sampled ``to_format`` call."""
+
+
+##############################################################################
+# CODE
+##############################################################################
+
+
+class Histogram:
+    """Counts of values in fixed buckets.
+
+    Parameters
+    ----------
+    buckets : Sequence[float], optional
+        The increasing upper bounds of the buckets. Values above the last
+        bound are counted in an overflow bucket.
+
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets: tuple[float, ...] = tuple(buckets)
+        self.counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def add(self, value: float, /) -> None:
+        """Count ``value`` in its bucket."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, q: float, /) -> float:
+        """Return the upper bound of the bucket holding the ``q``-th percentile.
+
+        Parameters
+        ----------
+        q : float, positional-only
+            The percentile, between 0 and 100.
+
+        Returns
+        -------
+        float
+            `math.inf` if it is in the overflow bucket, and NaN if there are no
+            values.
+
+        """
+        if not self.count:
+            return float("nan")
+        rank = max(q / 100 * self.count, 1)
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export as a plain `dict`, e.g. for JSON.
+
+        Returns
+        -------
+        dict[str, Any]
+            The ``buckets`` upper bounds, their ``counts`` (with the overflow
+            bucket last), and the ``count`` and ``sum`` of the values.
+
+        """
+        return {"buckets": list(self.buckets), "counts": list(self.counts), "count": self.count, "sum": self.sum}
+
+
+class SamplingProfiler:
+    """Time one in ``every`` calls of ``to_format``, by phase.
+
+    Each sampled call is split into the phases of `PHASES`:
+
+    - ``resolve``: looking up the implementation, see
+      :meth:`override_toformat.ToFormatOverloader.resolve`. On a miss of its
+      cache this includes the format and source dispatch.
+    - ``validate``: checking the constraints, usually a memoized verdict.
+    - ``convert``: the converter, including the copy policy and any result
+      cache. For ``async`` converters this only covers making the awaitable.
+    - ``total``: the whole call.
+
+    Made by :meth:`override_toformat.ToFormatOverloader.profile`.
+
+    Parameters
+    ----------
+    overloader : `override_toformat.ToFormatOverloader`
+        The overloader to resolve implementations with.
+    every : int
+        The sampling period.
+    buckets : Sequence[float], optional
+        The upper bounds of the histogram buckets, in seconds.
+
+    """
+
+    def __init__(
+        self,
+        overloader: ToFormatOverloader,
+        every: int,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        if every < 1:
+            msg = f"every must be a positive integer, not {every}"
+            raise ValueError(msg)
+
+        self.overloader = overloader
+        self.every = every
+        self.buckets: tuple[float, ...] = tuple(buckets)
+        self._countdown = every
+        self._lock = Lock()
+        self._histograms: dict[tuple[type, type], dict[str, Histogram]] = {}
+
+    def to_format(self, obj: object, to_format: type, /, *args: Any, copy_policy: bool | None, **kwargs: Any) -> Any:
+        """Convert ``obj``, timing it if this call is sampled.
+
+        Parameters
+        ----------
+        obj : object, positional-only
+            The object to convert.
+        to_format : type, positional-only
+            The format to convert to.
+        *args : Any
+            Arguments into the converter.
+        copy_policy : bool or None, keyword-only
+            The copy policy, see
+            :meth:`override_toformat.ToFormatOverloadMixin.to_format`.
+        **kwargs : Any
+            Keyword-arguments into the converter.
+
+        Returns
+        -------
+        Any
+            The converted object.
+
+        """
+        # Racing threads can skip or double a sample, which is fine for sampling.
+        self._countdown -= 1
+        if self._countdown > 0:
+            impl = self.overloader.resolve(obj.__class__, to_format)
+            if copy_policy is None:
+                return impl(obj, to_format, *args, **kwargs)
+            return impl.convert(obj, to_format, *args, copy_policy=copy_policy, **kwargs)
+        self._countdown = self.every
+
+        t0 = perf_counter()
+        impl = self.overloader.resolve(obj.__class__, to_format)
+        t1 = perf_counter()
+        impl.validate(obj, to_format)
+        t2 = perf_counter()
+        out = (
+            impl(obj, to_format, *args, **kwargs)
+            if copy_policy is None
+            else impl.convert(obj, to_format, *args, copy_policy=copy_policy, **kwargs)
+        )
+        t3 = perf_counter()
+
+        self._record((obj.__class__, to_format), (t1 - t0, t2 - t1, t3 - t2, t3 - t0))
+        return out
+
+    def _record(self, key: tuple[type, type], times: tuple[float, float, float, float], /) -> None:
+        with self._lock:
+            histograms = self._histograms.get(key)
+            if histograms is None:
+                histograms = self._histograms[key] = {phase: Histogram(self.buckets) for phase in PHASES}
+            for phase, t in zip(PHASES, times):
+                histograms[phase].add(t)
+
+    def histograms(self) -> dict[tuple[type, type], dict[str, Histogram]]:
+        """Return the histograms, by ``(from_type, to_format)`` then phase."""
+        with self._lock:
+            return {key: dict(hists) for key, hists in self._histograms.items()}
+
+    def to_dict(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Export the histograms as plain `dict` objects, e.g. for JSON.
+
+        Returns
+        -------
+        dict[str, dict[str, dict[str, Any]]]
+            By ``"<from_type> -> <to_format>"``, with qualified type names, then
+            by phase. See :meth:`Histogram.to_dict`.
+
+        """
+        with self._lock:
+            return {
+                f"{_name(src)} -> {_name(fmt)}": {phase: hist.to_dict() for phase, hist in hists.items()}
+                for (src, fmt), hists in self._histograms.items()
+            }
+
+    def reset(self) -> None:
+        """Drop the recorded samples."""
+        with self._lock:
+            self._histograms.clear()
+
+
+def _name(cls: type, /) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
@@ -0,0 +1,349 @@
+"""Snapshots of a registry, for fast startup.
+
+A snapshot holds the registered implementations and the resolved dispatch
+table of an overloader as plain data: types, constraint arguments and the
+import paths of the converters. It can be pickled, and loading it builds a
+`~override_toformat.overload.FrozenToFormatOverloader` without resolving any
+pair, importing each converter on its first call.
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields, is_dataclass
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from override_toformat.constraints import AllOf, AnyOf, Not, OneOfExact, TypeConstraint
+from override_toformat.implementation import BatchToSingle, ConversionChain, Implements
+from override_toformat.stats import TimedConverter
+
+if TYPE_CHECKING:
+    from typing_extensions import TypeAlias
+
+    from override_toformat.cache import ResultCache
+
+__all__ = ["LazyConverter", "RegistrySnapshot"]
+
+
+##############################################################################
+# PARAMETERS
+
+VERSION: int = 1
+"""The version of the snapshot layout, checked when loading."""
+
+
+##############################################################################
+# TYPING
+
+# A converter's import path, ``("batch", path)`` for a batch converter
+# converting single objects, or ``("chain", ((index, format), ...), index)``
+# for a chain of the implementations at those indices.
+_ConverterRecord: TypeAlias = "str | tuple[Any, ...]"
+_ConstraintRecord: TypeAlias = "ConstraintRecord | TypeConstraint"
+
+_Table: TypeAlias = "dict[tuple[type, type], Implements]"
+_Edges: TypeAlias = "dict[type, dict[type, Implements]]"
+
+
+##############################################################################
+# CODE
+##############################################################################
+
+
+class LazyConverter:
+    """A converter imported on its first call.
+
+    Parameters
+    ----------
+    path : str, positional-only
+        The import path of the converter, ``"module:qualified.name"``.
+
+    """
+
+    def __init__(self, path: str, /) -> None:
+        self.path = path
+        self._converter: Callable[..., Any] | None = None
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        """Import the converter, if not yet imported, and call it."""
+        converter = self._converter
+        if converter is None:
+            converter = self._converter = import_path(self.path)
+        return converter(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.path!r})"
+
+
+class ConstraintRecord(NamedTuple):
+    """A constraint as its class and arguments, encoded in turn if constraints.
+
+    Constraints that are not dataclasses, nor a combination of constraints,
+    are not encoded and must be picklable.
+    """
+
+    cls: type[TypeConstraint]
+    args: tuple[Any, ...]
+
+
+class ImplementsRecord(NamedTuple):
+    """An `~override_toformat.implementation.Implements` as plain data."""
+
+    converter: _ConverterRecord
+    from_format: type
+    to_format: type
+    from_constraint: _ConstraintRecord
+    to_constraint: _ConstraintRecord
+    batch_converter: str | None
+    cost: float
+    view: bool
+    cache: bool  # whether it uses the overloader's result cache
+
+
+class RegistrySnapshot(NamedTuple):
+    """The registry of an overloader, as picklable plain data.
+
+    Made by :meth:`override_toformat.ToFormatOverloader.snapshot` and loaded by
+    :meth:`override_toformat.overload.FrozenToFormatOverloader.from_snapshot`.
+
+    Attributes
+    ----------
+    version : int
+        The version of the layout.
+    max_hops : int
+        The ``max_hops`` of the overloader.
+    implementations : tuple[ImplementsRecord, ...]
+        The implementations, each after those it chains.
+    edges : tuple[tuple[type, type, int], ...]
+        The ``(to_format, from_format, index)`` of each registered
+        implementation.
+    table : tuple[tuple[type, type, int], ...]
+        The ``(from_type, to_format, index)`` of each resolved pair.
+
+    """
+
+    version: int
+    max_hops: int
+    implementations: tuple[ImplementsRecord, ...]
+    edges: tuple[tuple[type, type, int], ...]
+    table: tuple[tuple[type, type, int], ...]
+
+
+def converter_path(converter: Callable[..., Any], /) -> str:
+    """Return the import path of ``converter``, ``"module:qualified.name"``.
+
+    Raises
+    ------
+    ValueError
+        If ``converter`` can't be imported by its qualified name, e.g. it is a
+        lambda or defined in a function.
+
+    """
+    if isinstance(converter, LazyConverter):
+        return converter.path
+
+    module = getattr(converter, "__module__", None)
+    qualname = getattr(converter, "__qualname__", None)
+    path = f"{module}:{qualname}"
+    try:
+        found = import_path(path)
+    except (AttributeError, ImportError, ValueError):
+        found = None
+    if found is not converter:
+        msg = f"can't snapshot converter {converter!r}, which is not importable as {path!r}"
+        raise ValueError(msg)
+    return path
+
+
+def import_path(path: str, /) -> Any:
+    """Import the object at ``path``, ``"module:qualified.name"``."""
+    module_name, _, qualname = path.partition(":")
+    obj: Any = import_module(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+class _Encoder:
+    """Encode implementations as `ImplementsRecord`, each only once."""
+
+    def __init__(self, result_cache: ResultCache, /) -> None:
+        self.result_cache = result_cache
+        self.records: list[ImplementsRecord] = []
+        self._index: dict[int, int] = {}
+
+    def add(self, impl: Implements, /) -> int:
+        """Encode ``impl``, if not yet encoded, and return its index."""
+        index = self._index.get(id(impl))
+        if index is not None:
+            return index
+
+        if impl.cache is not None and impl.cache is not self.result_cache:
+            msg = f"can't snapshot implementation {impl.formats} with its own result cache"
+            raise ValueError(msg)
+
+        converter: _ConverterRecord
+        single = _unwrap(impl.converter)
+        if isinstance(single, ConversionChain):
+            hops = tuple((self.add(hop), fmt) for hop, fmt in single.hops)
+            converter = ("chain", hops, self.add(single.last))
+        elif isinstance(single, BatchToSingle):
+            converter = ("batch", converter_path(_unwrap(single.batch_converter)))
+        else:
+            converter = converter_path(single)
+
+        batch = impl.batch_converter
+        record = ImplementsRecord(
+            converter=converter,
+            from_format=impl.from_format,
+            to_format=impl.to_format,
+            from_constraint=_encode_constraint(impl.from_constraint),
+            to_constraint=_encode_constraint(impl.to_constraint),
+            batch_converter=None if batch is None else converter_path(_unwrap(batch)),
+            cost=impl.cost,
+            view=impl.view,
+            cache=impl.cache is not None,
+        )
+        index = self._index[id(impl)] = len(self.records)
+        self.records.append(record)
+        return index
+
+
+def _unwrap(converter: Callable[..., Any], /) -> Callable[..., Any]:
+    """Return the converter of an instrumented converter."""
+    return converter.converter if isinstance(converter, TimedConverter) else converter
+
+
+def _encode_constraint(constraint: TypeConstraint, /) -> _ConstraintRecord:
+    args: tuple[Any, ...]
+    obj: Any = constraint  # constraints needn't be dataclasses
+    if isinstance(constraint, (AnyOf, AllOf)):
+        args = constraint.constraints
+    elif isinstance(constraint, Not):
+        args = (constraint.constraint,)
+    elif isinstance(constraint, OneOfExact):
+        args = tuple(constraint.types)
+    elif is_dataclass(obj):
+        args = tuple(getattr(constraint, f.name) for f in fields(obj))
+    else:
+        return constraint
+    return ConstraintRecord(
+        type(constraint),
+        tuple(_encode_constraint(a) if isinstance(a, TypeConstraint) else a for a in args),
+    )
+
+
+def _decode_constraint(record: _ConstraintRecord, /) -> TypeConstraint:
+    if isinstance(record, ConstraintRecord):
+        return record.cls(*(_decode_constraint(a) if isinstance(a, ConstraintRecord) else a for a in record.args))
+    return record
+
+
+def _decode_interned(record: _ConstraintRecord, interned: dict[ConstraintRecord, TypeConstraint], /) -> TypeConstraint:
+    if not isinstance(record, ConstraintRecord):
+        return record
+    try:
+        constraint = interned.get(record)
+    except TypeError:  # unhashable arguments
+        return _decode_constraint(record)
+    if constraint is None:
+        constraint = interned[record] = _decode_constraint(record)
+    return constraint
+
+
+def _importable(cls: type, /) -> bool:
+    return "<locals>" not in cls.__qualname__
+
+
+def dump_registry(table: _Table, edges: _Edges, /, *, max_hops: int, result_cache: ResultCache) -> RegistrySnapshot:
+    """Encode a registry as a `RegistrySnapshot`.
+
+    Parameters
+    ----------
+    table : dict[tuple[type, type], Implements], positional-only
+        The resolved implementation of each ``(from_type, to_format)`` pair.
+        Pairs of types defined in functions are left out, to be resolved
+        after loading.
+    edges : dict[type, dict[type, Implements]], positional-only
+        The registered implementations, by format then source type.
+    max_hops : int, keyword-only
+        The ``max_hops`` of the overloader.
+    result_cache : `~override_toformat.cache.ResultCache`, keyword-only
+        The ``result_cache`` of the overloader.
+
+    Returns
+    -------
+    `RegistrySnapshot`
+
+    Raises
+    ------
+    ValueError
+        If a converter can't be imported by its qualified name, or an
+        implementation has its own result cache.
+
+    """
+    encoder = _Encoder(result_cache)
+    edge_records = tuple((fmt, src, encoder.add(impl)) for fmt, impls in edges.items() for src, impl in impls.items())
+    table_records = tuple(
+        (src, fmt, encoder.add(impl)) for (src, fmt), impl in table.items() if _importable(src) and _importable(fmt)
+    )
+    return RegistrySnapshot(VERSION, max_hops, tuple(encoder.records), edge_records, table_records)
+
+
+def load_registry(snapshot: RegistrySnapshot, /, *, result_cache: ResultCache) -> tuple[_Table, _Edges]:
+    """Decode a `RegistrySnapshot`.
+
+    Parameters
+    ----------
+    snapshot : `RegistrySnapshot`, positional-only
+        The snapshot to load.
+    result_cache : `~override_toformat.cache.ResultCache`, keyword-only
+        The cache of the implementations that used the overloader's cache.
+
+    Returns
+    -------
+    table : dict[tuple[type, type], Implements]
+    edges : dict[type, dict[type, Implements]]
+
+    Raises
+    ------
+    ValueError
+        If the snapshot has a different layout version.
+
+    """
+    if snapshot.version != VERSION:
+        msg = f"can't load a snapshot of version {snapshot.version}, expected {VERSION}"
+        raise ValueError(msg)
+
+    impls: list[Implements] = []
+    # Equal constraints are shared, as by `ToFormatOverloader.implements`.
+    constraints: dict[ConstraintRecord, TypeConstraint] = {}
+    for record in snapshot.implementations:
+        converter: Callable[..., Any]
+        if isinstance(record.converter, str):
+            converter = LazyConverter(record.converter)
+        elif record.converter[0] == "batch":
+            converter = BatchToSingle(LazyConverter(record.converter[1]))
+        else:
+            _, hops, last = record.converter
+            converter = ConversionChain(tuple((impls[i], fmt) for i, fmt in hops), impls[last])
+
+        impls.append(
+            Implements(
+                converter=converter,
+                from_format=record.from_format,
+                to_format=record.to_format,
+                from_constraint=_decode_interned(record.from_constraint, constraints),
+                to_constraint=_decode_interned(record.to_constraint, constraints),
+                batch_converter=None if record.batch_converter is None else LazyConverter(record.batch_converter),
+                cost=record.cost,
+                view=record.view,
+                cache=result_cache if record.cache else None,
+            ),
+        )
+
+    edges: _Edges = {}
+    for fmt, src, i in snapshot.edges:
+        edges.setdefault(fmt, {})[src] = impls[i]
+    table: _Table = {(src, fmt): impls[i] for src, fmt, i in snapshot.table}
+    return table, edges
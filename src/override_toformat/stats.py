@@ -0,0 +1,196 @@
+"""Per-pair statistics of conversions."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from inspect import isawaitable
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, NamedTuple
+
+if TYPE_CHECKING:
+    from override_toformat.implementation import Implements
+
+__all__ = ["ConversionStats", "PairStats"]
+
+
+##############################################################################
+# CODE
+##############################################################################
+
+
+class PairStats(NamedTuple):
+    """Statistics of one ``(from_type, to_format)`` pair.
+
+    Attributes
+    ----------
+    calls : int
+        The number of objects converted by the converter. Results served by a
+        ``cache`` are not counted.
+    hits, misses : int
+        Lookups of the pair in the resolution cache.
+    failures : int
+        Conversions refused by the constraints.
+    time : float
+        The cumulative time in the converter, in seconds.
+
+    """
+
+    calls: int
+    hits: int
+    misses: int
+    failures: int
+    time: float
+
+
+class PairCounter:
+    """Thread-safe, mutable counters of one pair."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.calls: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.failures: int = 0
+        self.time: float = 0.0
+
+    def add_calls(self, n: int, elapsed: float, /) -> None:
+        """Count ``n`` converted objects, taking ``elapsed`` seconds."""
+        with self._lock:
+            self.calls += n
+            self.time += elapsed
+
+    def add_hit(self) -> None:
+        """Count a resolution cache hit."""
+        with self._lock:
+            self.hits += 1
+
+    def add_miss(self) -> None:
+        """Count a resolution cache miss."""
+        with self._lock:
+            self.misses += 1
+
+    def add_failure(self) -> None:
+        """Count a conversion refused by the constraints."""
+        with self._lock:
+            self.failures += 1
+
+    def snapshot(self, *, reset: bool = False) -> PairStats:
+        """Return the current counts, zeroing them if ``reset``."""
+        with self._lock:
+            out = PairStats(self.calls, self.hits, self.misses, self.failures, self.time)
+            if reset:
+                self.calls = self.hits = self.misses = self.failures = 0
+                self.time = 0.0
+            return out
+
+
+@dataclass(frozen=True)
+class TimedConverter:
+    """Time the calls of a converter, adding them to a `PairCounter`.
+
+    The results of ``async`` converters are timed until they complete.
+
+    Parameters
+    ----------
+    converter : Callable[..., Any]
+        The converter, called as ``converter(to_format, obj, *args, **kwargs)``.
+    counter : `PairCounter`
+        The counters to add to.
+    batch : bool
+        Whether ``converter`` is a batch converter, converting a sequence of
+        objects per call.
+
+    """
+
+    converter: Callable[..., Any]
+    counter: PairCounter
+    batch: bool
+
+    def __call__(self, to_format: type, obj: Any, /, *args: Any, **kwargs: Any) -> Any:
+        """Call and time the converter."""
+        n = len(obj) if self.batch else 1
+        start = perf_counter()
+        out = self.converter(to_format, obj, *args, **kwargs)
+        if isawaitable(out):
+            return self._atime(out, n, start)
+        self.counter.add_calls(n, perf_counter() - start)
+        return out
+
+    async def _atime(self, out: Awaitable[Any], n: int, start: float, /) -> Any:
+        try:
+            return await out
+        finally:
+            self.counter.add_calls(n, perf_counter() - start)
+
+
+class ConversionStats:
+    """Statistics of conversions, by ``(from_type, to_format)`` pair.
+
+    Made by :meth:`override_toformat.ToFormatOverloader.instrument`, which
+    records into it through instrumented copies of the resolved
+    implementations.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._pairs: dict[tuple[type, type], PairCounter] = {}
+
+    def counter(self, key: tuple[type, type], /) -> PairCounter:
+        """Return the counters of pair ``key``, adding them if needed."""
+        counter = self._pairs.get(key)
+        if counter is None:
+            with self._lock:
+                counter = self._pairs.setdefault(key, PairCounter())
+        return counter
+
+    def instrument(self, key: tuple[type, type], impl: Implements, /) -> Implements:
+        """Count a resolution miss of ``key`` and return an instrumented copy of ``impl``.
+
+        Parameters
+        ----------
+        key : tuple[type, type], positional-only
+            The ``(from_type, to_format)`` pair.
+        impl : `override_toformat.implementation.Implements`, positional-only
+            The resolved implementation.
+
+        Returns
+        -------
+        `override_toformat.implementation.Implements`
+            A copy of ``impl`` whose converters are timed and whose constraint
+            failures are counted.
+
+        """
+        counter = self.counter(key)
+        counter.add_miss()
+
+        batch = impl.batch_converter
+        return replace(
+            impl,
+            converter=TimedConverter(impl.converter, counter, batch=False),
+            batch_converter=None if batch is None else TimedConverter(batch, counter, batch=True),
+            counter=counter,
+        )
+
+    def snapshot(self, *, reset: bool = False) -> dict[tuple[type, type], PairStats]:
+        """Return the statistics of each pair.
+
+        Parameters
+        ----------
+        reset : bool, optional keyword-only
+            Whether to zero the statistics after taking the snapshot.
+
+        Returns
+        -------
+        dict[tuple[type, type], PairStats]
+
+        """
+        # Instrumented implementations hold their pair's counters, so these
+        # are zeroed in place rather than replaced.
+        with self._lock:
+            pairs = list(self._pairs.items())
+        return {key: counter.snapshot(reset=reset) for key, counter in pairs}
+
+    def reset(self) -> None:
+        """Zero the statistics of every pair."""
+        self.snapshot(reset=True)
@@ -0,0 +1,13 @@
+from benchmarks import run
+
+
+def test_benchmarks_run(tmp_path):
+    """Each benchmark runs, so the suite doesn't rot between releases."""
+    results = tmp_path / "results.json"
+    assert run.main(["--quick", "--save", str(results)]) == 0
+    assert results.exists()
+
+
+def test_regressions():
+    baseline = {"a": 1.0, "b": 1.0}
+    assert run.regressions({"a": 1.1, "b": 2.0, "c": 5.0}, baseline, 1.25) == {"b": 2.0}
@@ -0,0 +1,76 @@
+import asyncio
+from array import array
+
+import pytest
+
+from .data import Class1, Class2, ClassA, o1, o12
+
+
+@Class1.FMT_OVERLOADS.implements(to_format=ClassA, from_format=Class1, view=True)
+def number_to_letter(cls, obj):
+    return cls(obj.attr1)
+
+
+@Class1.FMT_OVERLOADS.implements(to_format=memoryview, from_format=Class1, view=True)
+def number_to_memoryview(cls, obj):
+    return cls(obj.attr1)
+
+
+@Class1.FMT_OVERLOADS.implements(to_format=array, from_format=Class1)
+def number_to_array(cls, obj):
+    return cls(obj.attr1.typecode, obj.attr1)
+
+
+def test_view():
+    assert o1.to_format(ClassA).x is o1.attr1
+    assert o1.to_format(ClassA, copy_policy=False).x is o1.attr1
+
+    got = o1.to_format(memoryview, copy_policy=False)
+    assert got.obj is o1.attr1
+
+
+@Class1.FMT_OVERLOADS.implements(to_format=array, from_format=Class2, view=True)
+def number2_to_array(cls, obj):
+    return obj.attr1
+
+
+def test_view_copy():
+    got = o12.to_format(array, copy_policy=True)
+    assert got is not o12.attr1
+    assert got == o12.attr1
+
+    got = o1.to_format(memoryview, copy_policy=True)
+    assert got.obj is not o1.attr1
+    assert got.format == "d"
+    assert got.tolist() == o1.attr1.tolist()
+
+
+def test_view_copy_unknown():
+    # only objects known to be copyable are copied
+    with pytest.raises(TypeError, match="can't copy the 'ClassA' result of a view converter"):
+        o1.to_format(ClassA, copy_policy=True)
+
+
+def test_not_view():
+    assert o1.to_format(array, copy_policy=True) == o1.attr1
+    with pytest.raises(ValueError, match="cannot convert 'Class1' to 'array' without a copy"):
+        o1.to_format(array, copy_policy=False)
+
+
+@Class1.FMT_OVERLOADS.implements(to_format=bytes, from_format=Class1)
+def number_to_bytes(cls, obj, copy=None):
+    return cls(obj.attr1) if copy is None else copy
+
+
+def test_copy_argument():
+    # ``copy`` is the converter's argument, not the copy policy
+    assert o1.to_format(bytes, copy=b"copy") == b"copy"
+    assert o1.to_format(bytes, copy=b"copy", copy_policy=True) == b"copy"
+
+
+def test_ato_format_copy_policy():
+    got = asyncio.run(o1.ato_format(memoryview, copy_policy=True))
+    assert got.obj is not o1.attr1
+    assert asyncio.run(o1.ato_format(ClassA, copy_policy=False)).x is o1.attr1
+    with pytest.raises(ValueError, match="cannot convert 'Class1' to 'array' without a copy"):
+        asyncio.run(o1.ato_format(array, copy_policy=False))
@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import override_toformat
+
+SLOW = ("asyncio", "concurrent.futures", "importlib.metadata", "timeit")
+
+# The most microseconds ``import override_toformat`` may take. It takes ~2 ms,
+# against ~95 ms when it imported its modules.
+MAX_IMPORT_US = 20_000
+
+
+def run(*args):
+    """Run a fresh interpreter with ``args``, returning its output."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    return subprocess.run([sys.executable, *args], check=True, capture_output=True, text=True, env=env)  # noqa: S603
+
+
+def imported_after(code):
+    """Return the modules imported by running ``code`` in a fresh interpreter."""
+    script = f"import sys; before = set(sys.modules); {code}; print(json.dumps(sorted(set(sys.modules) - before)))"
+    return set(json.loads(run("-c", "import json; " + script).stdout))
+
+
+def import_time(module):
+    """Return the microseconds taken to import ``module``, the best of 3."""
+    times = []
+    for _ in range(3):
+        out = run("-X", "importtime", "-c", f"import {module}")
+        for line in out.stderr.splitlines():
+            # The self and cumulative times and the module, split by "|".
+            _, cumulative, name = line.split("|")
+            if name.strip() == module:
+                times.append(int(cumulative))
+    return min(times)
+
+
+def test_import_is_lazy():
+    """Importing the package doesn't import its modules."""
+    modules = imported_after("import override_toformat")
+    assert "override_toformat" in modules
+    assert not {m for m in modules if m.startswith("override_toformat.")}
+    assert "typing" not in modules
+
+
+def test_import_skips_slow_modules():
+    """Modules only some features need aren't imported up front."""
+    modules = imported_after("from override_toformat import ToFormatOverloader, ToFormatOverloadMixin, constraints")
+    assert not modules.intersection(SLOW)
+
+
+def test_import_time():
+    assert import_time("override_toformat") < MAX_IMPORT_US
+
+
+def test_import_without_mypy_extensions():
+    """``mypy_extensions`` is only needed to compile with mypyc."""
+    code = "import sys; sys.modules['mypy_extensions'] = None; from override_toformat import ToFormatOverloadMixin"
+    run("-c", code)
+
+
+@pytest.mark.parametrize("name", override_toformat.__all__)
+def test_lazy_attribute(name):
+    value = getattr(override_toformat, name)
+    assert vars(override_toformat)[name] is value
+    assert name in dir(override_toformat)
+
+
+def test_missing_attribute():
+    with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+        override_toformat.missing  # noqa: B018
@@ -0,0 +1,94 @@
+"""Registering converters while other threads convert."""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from override_toformat.overload import ToFormatOverloader
+
+N_SOURCES = 4
+N_FORMATS = 40
+
+
+def convert(cls, obj):
+    return obj
+
+
+def convert_many(cls, objs):
+    return list(objs)
+
+
+@pytest.fixture
+def switch_often():
+    """Switch threads as often as possible, to interleave them."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def read(overloader, types, formats, done):
+    """Convert and query until ``done``, raising any error."""
+    while not done.is_set():
+        for cls in types:
+            for fmt in formats:
+                if overloader.reachable(cls, fmt):
+                    overloader.resolve(cls, fmt)
+            overloader.targets_for(cls)
+        for fmt, dispatcher in overloader.items():
+            assert fmt in overloader
+            assert dispatcher.registry
+
+
+def register(overloader, sources, subsources, formats, *, batch):
+    # Each pair of a subsource and format gets a single converter and a batch
+    # converter, from two threads, and neither may be lost.
+    for fmt in formats:
+        for src, sub in zip(sources, subsources):
+            overloader.implements(to_format=fmt, from_format=src)(convert)
+            overloader.implements(to_format=fmt, from_format=sub, batch=batch)(convert_many if batch else convert)
+
+
+def register_block(overloader, formats):
+    with overloader.registering():
+        for fmt in formats:
+            overloader.implements(to_format=fmt, from_format=int)(convert)
+
+
+@pytest.mark.usefixtures("switch_often")
+def test_register_while_converting():
+    overloader = ToFormatOverloader()
+    sources = [type(f"Source{i}", (), {}) for i in range(N_SOURCES)]
+    subsources = [type(f"SubSource{i}", (src,), {}) for i, src in enumerate(sources)]
+    formats = [type(f"Format{i}", (), {}) for i in range(N_FORMATS)]
+    for src in sources:
+        overloader.implements(to_format=formats[0], from_format=src)(convert)
+
+    done = threading.Event()
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        readers = [executor.submit(read, overloader, subsources, formats, done) for _ in range(3)]
+        try:
+            writers = [
+                executor.submit(register, overloader, sources, subsources, formats, batch=batch)
+                for batch in (False, True)
+            ]
+            writers.append(executor.submit(register_block, overloader, formats))
+            for future in writers:
+                future.result()
+        finally:
+            done.set()
+        for future in readers:
+            future.result()
+
+    # No resolution made before a registration outlives it.
+    for sub in subsources:
+        assert overloader.targets_for(sub) == tuple(formats)
+        for fmt in formats:
+            impl = overloader.resolve(sub, fmt)
+            assert impl.from_format is sub
+            assert impl.converter is convert
+            assert impl.batch_converter is convert_many
+    assert overloader.resolve(int, formats[-1]).from_format is int
+    assert len(overloader) == N_FORMATS
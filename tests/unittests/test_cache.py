@@ -0,0 +1,110 @@
+import gc
+
+import pytest
+
+from override_toformat.cache import ResultCache
+from override_toformat.overload import ToFormatOverloader
+
+
+class Source:
+    """Source."""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Target:
+    """Target format."""
+
+    def __init__(self, value):
+        self.value = value
+
+
+calls = []
+
+
+def convert(cls, obj, scale=1):
+    calls.append(obj.value)
+    return cls(obj.value * scale)
+
+
+@pytest.fixture(autouse=True)
+def _clear_calls():
+    calls.clear()
+
+
+def test_identity():
+    cache = ResultCache()
+    obj = Source(1)
+
+    first = cache(convert, Target, obj, (), {})
+    assert cache(convert, Target, obj, (), {}) is first
+    assert cache(convert, Target, obj, (2,), {}).value == 2  # noqa: PLR2004
+    assert cache(convert, Target, Source(1), (), {}) is not first
+    assert len(calls) == 3  # noqa: PLR2004
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 3, 2)
+
+
+def test_weakref():
+    cache = ResultCache()
+    obj = Source(1)
+    cache(convert, Target, obj, (), {})
+    assert cache.info().currsize == 1
+
+    del obj
+    gc.collect()
+    assert cache.info().currsize == 0
+    assert cache.info().currbytes == 0
+
+
+def test_content_key():
+    cache = ResultCache(key=lambda obj: obj.value)
+
+    first = cache(convert, Target, Source(1), (), {})
+    assert cache(convert, Target, Source(1), (), {}) is first
+    assert cache(convert, Target, Source(2), (), {}) is not first
+
+
+def test_unhashable_arguments():
+    cache = ResultCache()
+    obj = Source(1)
+    cache(convert, Target, obj, (), {"scale": [1]})
+    assert cache.info().currsize == 0
+    assert cache.info().misses == 1
+
+
+@pytest.mark.parametrize(("maxsize", "maxbytes"), [(2, None), (None, 2)])
+def test_eviction(maxsize, maxbytes):
+    cache = ResultCache(maxsize=maxsize, maxbytes=maxbytes, sizeof=lambda _: 1)
+    objs = [Source(i) for i in range(3)]
+
+    for obj in objs:
+        cache(convert, Target, obj, (), {})
+    cache(convert, Target, objs[1], (), {})  # recently used
+    cache(convert, Target, objs[0], (), {})  # evicted, so converted again
+
+    assert calls == [0, 1, 2, 0]
+    assert cache.info().currsize == 2  # noqa: PLR2004
+
+
+def test_registration():
+    overloader = ToFormatOverloader()
+    overloader.implements(to_format=Target, from_format=Source, cache=True)(convert)
+    own = ResultCache(key=lambda obj: obj)
+    overloader.implements(to_format=Target, from_format=int, cache=own)(lambda cls, obj: cls(obj))
+
+    obj = Source(1)
+    impl = overloader.resolve(Source, Target)
+    assert impl(obj, Target) is impl(obj, Target)
+    assert overloader.result_cache.info().hits == 1
+
+    assert overloader.resolve(int, Target)(1, Target) is overloader.resolve(int, Target)(1, Target)
+    assert own.info().hits == 1
+
+    with pytest.raises(TypeError, match="results of async converters can't be cached"):
+
+        @overloader.implements(to_format=Target, from_format=float, cache=True)
+        async def float_to_target(cls, obj):
+            return cls(obj)
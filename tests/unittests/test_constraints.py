@@ -0,0 +1,97 @@
+from abc import ABC
+from collections.abc import Sequence
+
+import pytest
+
+from override_toformat.constraints import (
+    AllOf,
+    AnyOf,
+    Between,
+    Contravariant,
+    Covariant,
+    Invariant,
+    Not,
+    OneOfExact,
+)
+
+
+class A:
+    """Base class."""
+
+
+class B(A):
+    """Subclass of A."""
+
+
+class C(B):
+    """Subclass of B."""
+
+
+class Abstract(ABC):  # noqa: B024
+    """An ABC."""
+
+
+class Counting(Covariant):
+    """Covariant constraint counting the validations, so not compiled."""
+
+    def __init__(self, bound):
+        super().__init__(bound)
+        object.__setattr__(self, "calls", [])
+
+    def validate_type(self, arg_type, /):
+        """Validate, recording the type."""
+        self.calls.append(arg_type)
+        return super().validate_type(arg_type)
+
+
+def test_one_of_exact():
+    constraint = OneOfExact(A, C)
+    assert constraint == OneOfExact(C, A)
+    assert [constraint.validate_type(t) for t in (A, B, C)] == [True, False, True]
+
+
+def test_not():
+    assert Not(B) == Not(Covariant(B))
+    assert [Not(B).validate_type(t) for t in (A, B, C)] == [True, False, False]
+    assert [Not(Invariant(B)).validate_type(t) for t in (A, B, C)] == [True, False, True]
+
+
+@pytest.mark.parametrize(
+    ("constraint", "expected"),
+    [
+        (AnyOf(), [False, False, False, False]),
+        (AnyOf(C, int), [False, False, True, True]),
+        (AnyOf(Invariant(A), OneOfExact(C)), [True, False, True, False]),
+        (AnyOf(Invariant(A), C, Contravariant(B)), [True, True, True, False]),
+        (AnyOf(Sequence, Invariant(B)), [False, True, False, False]),
+        (AllOf(), [True, True, True, True]),
+        (AllOf(A, Not(C)), [True, True, False, False]),
+        (AllOf(OneOfExact(A, B), OneOfExact(B, C)), [False, True, False, False]),
+        (AllOf(Between(C, A), Not(Invariant(B))), [True, False, True, False]),
+    ],
+)
+def test_combination(constraint, expected):
+    assert [constraint.validate_type(t) for t in (A, B, C, bool)] == expected
+
+
+def test_combination_flattened():
+    assert AnyOf(A, AnyOf(B, Invariant(C))).constraints == (Covariant(A), Covariant(B), Invariant(C))
+    assert AllOf(A, AnyOf(B)).constraints == (Covariant(A), AnyOf(B))
+
+
+def test_combination_cached():
+    counting = Counting(B)
+    constraint = AnyOf(Invariant(A), counting)
+    assert constraint.validate_type(C)
+    assert constraint.validate_type(C)
+    assert not constraint.validate_type(int)
+    assert counting.calls == [C, int]
+
+    # ABC registrations invalidate the verdicts
+    class Virtual:
+        """Virtual subclass of Abstract."""
+
+    constraint = AnyOf(Abstract)
+    assert not constraint.validate_type(Virtual)
+    Abstract.register(Virtual)
+    assert constraint.validate_type(Virtual)
@@ -0,0 +1,118 @@
+from abc import ABC
+
+import pytest
+
+from override_toformat.constraints import Covariant
+from override_toformat.dispatch import Dispatcher, Registry
+from override_toformat.implementation import Implements
+
+
+class Base:
+    """Base class."""
+
+
+class Sub(Base):
+    """Subclass of Base."""
+
+
+class AbstractA(ABC):  # noqa: B024
+    """An ABC."""
+
+
+class AbstractB(ABC):  # noqa: B024
+    """Another ABC."""
+
+
+def convert(cls, obj):
+    return obj
+
+
+def implements(from_format, to_format=object):
+    return Implements(
+        converter=convert,
+        from_format=from_format,
+        to_format=to_format,
+        from_constraint=Covariant(from_format),
+        to_constraint=Covariant(to_format),
+    )
+
+
+def test_dispatch_mro():
+    registered = []
+    dispatcher = Dispatcher(Registry(on_register=lambda *pair: registered.append(pair)), object)
+    base = implements(Base)
+    dispatcher.register(Base, base)
+
+    assert dispatcher.dispatch(Sub) is base
+    assert dispatcher(Sub()) is base
+    with pytest.raises(NotImplementedError):
+        dispatcher.dispatch(int)
+
+    # registration clears the cached lookups
+    sub = implements(Sub)
+    dispatcher.register(Sub, sub)
+    assert dispatcher.dispatch(Sub) is sub
+    # the first registration for a format can change lookups from any type
+    assert registered == [(object, object), (Sub, object)]
+    assert dict(dispatcher.registry) == {Base: base, Sub: sub}
+
+
+def test_registry_formats():
+    registry = Registry()
+    to_base, to_sub = implements(Base, Base), implements(Base, Sub)
+    registry.register(Base, Base, to_base)
+    registry.register(Base, Sub, to_sub)
+
+    state = registry.state
+    assert state.dispatch(Sub, Base) is to_base
+    assert state.dispatch(Sub, Sub) is to_sub
+    # the closest registered format decides
+    assert state.find_format(type("SubSub", (Sub,), {})) is Sub
+    with pytest.raises(NotImplementedError):
+        state.dispatch(int, Sub)
+    assert list(state.formats) == [Base, Sub]
+    assert dict(state.table) == {(Base, Base): to_base, (Base, Sub): to_sub}
+    assert dict(Dispatcher(registry, Sub).registry) == {Base: to_sub}
+
+
+def test_registry_copy_on_write():
+    registry = Registry()
+    to_base, to_sub = implements(Base, Base), implements(Sub, Base)
+    registry.register(Base, Base, to_base)
+    published = registry.state
+
+    # registrations don't change a published state...
+    registry.register(Sub, Base, to_sub)
+    assert dict(published.table) == {(Base, Base): to_base}
+    # ...and are seen by the next write and lookup
+    assert registry.update(Sub, Base, lambda impl: impl) is to_sub
+    assert dict(registry.state.table) == {(Base, Base): to_base, (Sub, Base): to_sub}
+    assert registry.state is registry.state
+
+
+def test_dispatch_abc():
+    class Virtual:
+        """Virtual subclass of the ABCs."""
+
+    registry = Registry()
+    impls = {k: implements(k, k) for k in (object, AbstractA, AbstractB)}
+    registry.register(object, object, impls[object])
+    registry.register(AbstractA, AbstractA, impls[AbstractA])
+    assert registry.state.find_format(Virtual) is object
+    assert registry.state.dispatch(Virtual, Virtual) is impls[object]
+
+    # ABC registrations after a lookup are seen, and come before `object`
+    AbstractA.register(Virtual)
+    assert registry.state.find_format(Virtual) is AbstractA
+    assert registry.state.dispatch(Virtual, Virtual) is impls[AbstractA]
+
+    AbstractB.register(Virtual)
+    registry.register(AbstractB, AbstractB, impls[AbstractB])
+    with pytest.raises(RuntimeError, match="ambiguous dispatch"):
+        registry.state.find_format(Virtual)
+
+    # virtual sources only match the formats they are registered for
+    registry.register(AbstractB, AbstractA, impls[AbstractB])
+    with pytest.raises(RuntimeError, match="ambiguous dispatch"):
+        registry.state.dispatch(Virtual, AbstractA)
+    assert registry.state.dispatch(Virtual, object) is impls[object]
@@ -0,0 +1,83 @@
+from abc import ABC
+from dataclasses import dataclass
+
+import pytest
+
+from override_toformat.constraints import Covariant
+from override_toformat.implementation import Implements
+from override_toformat.overload import ToFormatOverloader
+
+
+@dataclass(frozen=True)
+class CountingCovariant(Covariant):
+    """Covariant constraint counting the validations."""
+
+    calls: list
+
+    def validate_type(self, arg_type, /):
+        """Validate, recording the type."""
+        self.calls.append(arg_type)
+        return super().validate_type(arg_type)
+
+
+def converter(cls, obj):
+    return cls(obj)
+
+
+def test_validation_is_memoized():
+    from_calls, to_calls = [], []
+    impl = Implements(
+        converter=converter,
+        from_format=int,
+        to_format=float,
+        from_constraint=CountingCovariant(int, from_calls),
+        to_constraint=CountingCovariant(float, to_calls),
+    )
+
+    assert impl(1, float) == 1.0
+    assert impl(True, float) == 1.0
+    assert impl(1, float) == 1.0
+    assert from_calls == [int, bool]
+    assert to_calls == [float, float]
+
+
+def test_failed_validation_is_memoized():
+    from_calls, to_calls = [], []
+    impl = Implements(
+        converter=converter,
+        from_format=int,
+        to_format=float,
+        from_constraint=CountingCovariant(int, from_calls),
+        to_constraint=CountingCovariant(float, to_calls),
+    )
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="object 'a' is not compatible with from_constraint"):
+            impl("a", float)
+        with pytest.raises(ValueError, match="format 'complex' is not compatible with to_constraint"):
+            impl(1, complex)
+
+    assert from_calls == [str, int]
+    assert to_calls == [complex]
+
+
+def test_abc_registration_invalidates_verdicts():
+    class Numeric(ABC):  # noqa: B024
+        """An ABC."""
+
+    class Value:
+        def __init__(self, x):
+            self.x = x
+
+    class Target:
+        def __init__(self, obj):
+            self.x = obj.x
+
+    overloader = ToFormatOverloader()
+    overloader.implements(to_format=Target, from_format=object, from_constraint=Covariant(Numeric))(converter)
+
+    with pytest.raises(ValueError, match="is not compatible with from_constraint"):
+        overloader.resolve(Value, Target)(Value(1), Target)
+
+    Numeric.register(Value)
+    assert overloader.resolve(Value, Target)(Value(1), Target).x == 1
@@ -0,0 +1,108 @@
+import asyncio
+from typing import ClassVar
+
+import pytest
+
+from override_toformat import ConversionError
+from override_toformat.mixin import ToFormatOverloadMixin
+from override_toformat.overload import ToFormatOverloader
+
+
+class Value(ToFormatOverloadMixin):
+    """Value with registered formats."""
+
+    FMT_OVERLOADS: ClassVar[ToFormatOverloader] = ToFormatOverloader()
+
+    def __init__(self, value):
+        self.value = value
+
+
+class SubValue(Value):
+    """Subclass of Value."""
+
+
+@Value.FMT_OVERLOADS.implements(to_format=int, from_format=Value)
+def value_to_int(cls, obj):
+    return cls(obj.value)
+
+
+@Value.FMT_OVERLOADS.implements(to_format=str, from_format=Value)
+async def value_to_str(cls, obj, prefix=""):
+    await asyncio.sleep(0)
+    return prefix + cls(obj.value)
+
+
+@Value.FMT_OVERLOADS.implements(to_format=float, from_format=Value, batch=True)
+async def values_to_float(cls, objs):
+    if any(obj.value is None for obj in objs):
+        raise ValueError
+    return [cls(obj.value) for obj in objs]
+
+
+def test_to_format():
+    assert Value(1.5).to_format(int) == 1
+    assert Value.to_format_many([Value(1), SubValue(2)], int) == [1, 2]
+
+
+def test_to_format_many_async_batch():
+    with pytest.raises(TypeError, match="batch converter from 'Value' to 'float' is async, use ato_format_many"):
+        Value.to_format_many([Value(1)], float)
+
+
+@pytest.mark.filterwarnings("error")  # no coroutine is left unawaited
+def test_to_format_many_async():
+    match = "the converter from 'Value' to 'str' is async, use ato_format_many"
+    with pytest.raises(TypeError, match=match):
+        Value.to_format_many([Value(1)], str)
+    with pytest.raises(TypeError, match=match):
+        Value.FMT_OVERLOADS.map([Value(1), Value(2)], str)
+    for chunksize in (1, 2):
+        with pytest.raises(TypeError, match=match):
+            list(Value.iter_to_format([Value(1)], str, chunksize=chunksize))
+
+
+def test_ato_format():
+    assert asyncio.run(Value(1).ato_format(str, prefix="#")) == "#1"
+    assert asyncio.run(Value(1).ato_format(int)) == 1  # synchronous converter
+    assert asyncio.run(Value(1).ato_format(float)) == 1.0  # `async` batch converter
+
+
+def test_ato_format_many():
+    objs = [Value(1), SubValue(2), Value(3)]
+
+    got = asyncio.run(Value.ato_format_many(objs, str, "#", limit=2))
+    assert got == ["#1", "#2", "#3"]
+
+    assert asyncio.run(Value.ato_format_many(objs, int)) == [1, 2, 3]
+    assert asyncio.run(Value.ato_format_many(objs, float)) == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_ato_format_many_limit_checked(limit):
+    with pytest.raises(ValueError, match="limit must be >= 1"):
+        asyncio.run(Value.ato_format_many([Value(1)], str, limit=limit))
+
+
+def test_ato_format_many_errors():
+    objs = [Value(1), SubValue(None), Value(None)]
+    with pytest.raises(ConversionError, match="2 of 2 chunks failed") as excinfo:
+        asyncio.run(Value.ato_format_many(objs, float))
+    assert len(excinfo.value.errors) == 2  # noqa: PLR2004
+
+
+def test_profile():
+    profiler = Value.FMT_OVERLOADS.profile(every=2, buckets=[1e-9, 10.0])
+    try:
+        assert [Value(i).to_format(int) for i in range(5)] == list(range(5))
+    finally:
+        Value.FMT_OVERLOADS.profile(None)
+    assert Value.FMT_OVERLOADS.profiler is None
+
+    hists = profiler.histograms()[(Value, int)]
+    assert list(hists) == ["resolve", "validate", "convert", "total"]
+    assert hists["total"].count == 2  # noqa: PLR2004
+    assert hists["total"].counts == [0, 2, 0]
+    assert hists["total"].percentile(99) == 10.0  # noqa: PLR2004
+
+    exported = profiler.to_dict()
+    assert exported[f"{__name__}.Value -> builtins.int"]["convert"]["count"] == 2  # noqa: PLR2004
@@ -0,0 +1,794 @@
+import pickle
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import EntryPoint
+from itertools import islice
+
+import pytest
+
+from override_toformat import ConversionError
+from override_toformat.constraints import AnyOf, Invariant, Not, OneOfExact
+from override_toformat.overload import FrozenToFormatOverloader, ToFormatOverloader
+from override_toformat.snapshot import LazyConverter
+
+
+class Source:
+    """Source."""
+
+
+class SubSource(Source):
+    """Subclass of Source."""
+
+
+class Target:
+    """Target format."""
+
+
+class OtherTarget:
+    """Another target format."""
+
+
+def to_target(cls, obj):
+    return cls()
+
+
+def to_targets(cls, objs):
+    return [cls() for _ in objs]
+
+
+@pytest.fixture
+def overloader():
+    overloader = ToFormatOverloader()
+
+    @overloader.implements(to_format=Target, from_format=Source)
+    def source_to_target(cls, obj):
+        return cls()
+
+    return overloader
+
+
+def test_resolve_is_cached(overloader):
+    impl = overloader.resolve(SubSource, Target)
+
+    assert impl.formats == (Source, Target)
+    assert overloader._resolved[(SubSource, Target)] is impl  # noqa: SLF001
+    assert overloader.resolve(SubSource, Target) is impl
+
+
+def test_resolve_not_implemented(overloader):
+    with pytest.raises(NotImplementedError):
+        overloader.resolve(Source, OtherTarget)
+    with pytest.raises(NotImplementedError):
+        overloader.resolve(int, Target)
+
+
+def test_resolve_invalidated_by_registration(overloader):
+    overloader.resolve(Source, Target)
+    overloader.resolve(SubSource, Target)
+
+    @overloader.implements(to_format=Target, from_format=SubSource)
+    def subsource_to_target(cls, obj):
+        return cls()
+
+    # only the affected pair is dropped
+    assert (Source, Target) in overloader._resolved  # noqa: SLF001
+    assert (SubSource, Target) not in overloader._resolved  # noqa: SLF001
+    assert overloader.resolve(SubSource, Target).from_format is SubSource
+
+
+def test_resolve_invalidated_by_new_format(overloader):
+    overloader.resolve(Source, Target)
+
+    @overloader.implements(to_format=OtherTarget, from_format=Source)
+    def source_to_other(cls, obj):
+        return cls()
+
+    assert (Source, Target) in overloader._resolved  # noqa: SLF001
+    assert overloader.resolve(Source, OtherTarget).to_format is OtherTarget
+
+
+def test_to_format_many(overloader):
+    calls = []
+
+    @overloader.implements(to_format=Target, from_format=SubSource)
+    def subsource_to_target(cls, obj, tag):
+        calls.append(obj)
+        return (cls, tag)
+
+    objs = [SubSource(), SubSource()]
+    got = overloader.to_format_many(iter(objs), Target, tag="tag")
+    assert got == [(Target, "tag"), (Target, "tag")]
+    assert calls == objs
+
+
+def test_to_format_many_order(overloader):
+    @overloader.implements(to_format=Target, from_format=SubSource)
+    def subsource_to_target(cls, obj):
+        return obj
+
+    objs = [Source(), SubSource(), Source(), SubSource()]
+    got = overloader.to_format_many(objs, Target)
+    assert [type(x) for x in got] == [Target, SubSource, Target, SubSource]
+    assert got[1::2] == objs[1::2]
+
+
+def test_to_format_many_validates_per_type(overloader):
+    @overloader.implements(to_format=OtherTarget, from_format=Source, from_constraint=Invariant(Source))
+    def source_to_other(cls, obj):
+        return cls()
+
+    assert len(overloader.to_format_many([Source(), Source()], OtherTarget)) == 2  # noqa: PLR2004
+    with pytest.raises(ValueError, match="is not compatible with from_constraint"):
+        overloader.to_format_many([Source(), SubSource()], OtherTarget)
+
+
+def test_batch_converter(overloader):
+    calls = []
+
+    @overloader.implements(to_format=Target, from_format=Source, batch=True)
+    def sources_to_targets(cls, objs):
+        calls.append(len(objs))
+        return [cls() for _ in objs]
+
+    impl = overloader.resolve(Source, Target)
+    assert impl.batch_converter is sources_to_targets
+    assert impl.converter.__name__ == "source_to_target"  # single converter is kept
+
+    got = overloader.to_format_many([Source(), SubSource(), Source()], Target)
+    assert [type(x) for x in got] == [Target] * 3
+    assert calls == [2, 1]
+
+
+def test_batch_converter_keeps_single(overloader):
+    @overloader.implements(to_format=OtherTarget, from_format=Source, cost=2, view=True, cache=True)
+    def source_to_other(cls, obj):
+        return cls()
+
+    @overloader.implements(to_format=OtherTarget, from_format=Source, batch=True)
+    def sources_to_others(cls, objs):
+        return [cls() for _ in objs]
+
+    # the batch converter's registration doesn't change single conversions
+    impl = overloader.resolve(Source, OtherTarget)
+    assert impl.converter is source_to_other
+    assert impl.batch_converter is sources_to_others
+    assert (impl.cost, impl.view, impl.cache) == (2, True, overloader.result_cache)
+
+
+def test_batch_converter_only(overloader):
+    @overloader.implements(to_format=OtherTarget, from_format=Source, batch=True)
+    def sources_to_others(cls, objs):
+        return [cls() for _ in objs]
+
+    # single conversions fall back to the batch converter
+    assert isinstance(overloader.resolve(Source, OtherTarget)(Source(), OtherTarget), OtherTarget)
+
+    @overloader.implements(to_format=OtherTarget, from_format=Source)
+    def source_to_other(cls, obj):
+        return cls()
+
+    impl = overloader.resolve(Source, OtherTarget)
+    assert impl.converter is source_to_other
+    assert impl.batch_converter is sources_to_others
+
+
+def test_batch_converter_length(overloader):
+    @overloader.implements(to_format=Target, from_format=Source, batch=True)
+    def sources_to_targets(cls, objs):
+        return []
+
+    with pytest.raises(ValueError, match="batch converter returned 0 results for 1 objects"):
+        overloader.to_format_many([Source()], Target)
+
+
+def test_map(overloader):
+    threads = set()
+
+    @overloader.implements(to_format=Target, from_format=SubSource)
+    def subsource_to_target(cls, obj, tag):
+        threads.add(threading.get_ident())
+        return (obj, tag)
+
+    objs = [SubSource() for _ in range(10)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        got = overloader.map(objs, Target, "tag", executor=executor, chunksize=3)
+
+    assert got == [(obj, "tag") for obj in objs]
+    assert threading.get_ident() not in threads
+
+
+def test_map_errors(overloader):
+    @overloader.implements(to_format=Target, from_format=SubSource)
+    def subsource_to_target(cls, obj):
+        raise RuntimeError(obj)
+
+    objs = [Source(), SubSource(), Source(), SubSource()]
+    with pytest.raises(ConversionError, match="2 of 4 chunks failed to convert") as excinfo:
+        overloader.map(objs, Target, chunksize=1)
+    assert [e.args[0] for e in excinfo.value.errors] == objs[1::2]
+
+    # validation fails on the calling thread, before converting
+    with pytest.raises(NotImplementedError):
+        overloader.map([Source(), 1], Target)
+
+
+def test_iter_to_format_like_to_format():
+    overloader = ToFormatOverloader()
+    calls = []
+
+    @overloader.implements(to_format=Target, from_format=Source, cache=True)
+    def source_to_target(cls, obj):
+        calls.append(obj)
+        return cls()
+
+    overloader.instrument()
+    obj = Source()
+    got = list(overloader.iter_to_format([obj, obj], Target))
+    assert got[0] is got[1]  # cached result
+    assert calls == [obj]
+    assert overloader.stats()[Source, Target].calls == 1
+
+
+@pytest.mark.parametrize("chunksize", [0, -1])
+def test_chunksize_checked(overloader, chunksize):
+    with pytest.raises(ValueError, match="chunksize must be >= 1"):
+        overloader.map([Source(), Source()], Target, chunksize=chunksize)
+    with pytest.raises(ValueError, match="chunksize must be >= 1"):
+        overloader.iter_to_format([Source()], Target, chunksize=chunksize)
+
+
+def test_iter_to_format(overloader):
+    consumed = []
+
+    def sources():
+        while True:
+            obj = Source() if len(consumed) % 3 else SubSource()
+            consumed.append(obj)
+            yield obj
+
+    got = list(islice(overloader.iter_to_format(sources(), Target), 5))
+    assert len(got) == len(consumed) == 5  # noqa: PLR2004
+    assert all(isinstance(x, Target) for x in got)
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_iter_to_format_chunks(overloader, max_workers):
+    calls = []
+
+    @overloader.implements(to_format=Target, from_format=SubSource, batch=True)
+    def subsources_to_targets(cls, objs):
+        calls.append(len(objs))
+        return objs
+
+    objs = [SubSource(), SubSource(), SubSource(), Source(), SubSource()]
+    executor = None if max_workers is None else ThreadPoolExecutor(max_workers=max_workers)
+    got = list(overloader.iter_to_format(iter(objs), Target, chunksize=2, executor=executor, prefetch=1))
+    if executor is not None:
+        executor.shutdown()
+
+    assert got[:3] == objs[:3]
+    assert isinstance(got[3], Target)
+    assert got[4] is objs[4]
+    assert calls == [2, 1, 1]
+
+
+def test_route():
+    overloader = ToFormatOverloader(max_hops=3)
+
+    @overloader.implements(to_format=Target, from_format=Source)
+    def source_to_target(cls, obj):
+        return cls()
+
+    @overloader.implements(to_format=OtherTarget, from_format=Target)
+    def target_to_other(cls, obj, tag=None):
+        return (cls, type(obj), tag)
+
+    impl = overloader.resolve(SubSource, OtherTarget)
+    assert [hop.converter for hop, _ in impl.converter.hops] == [source_to_target]
+    assert impl.converter.last.converter is target_to_other
+    assert impl.formats == (Source, OtherTarget)
+    assert impl(SubSource(), OtherTarget, tag="tag") == (OtherTarget, Target, "tag")
+    assert overloader.resolve(SubSource, OtherTarget) is impl
+
+    # registrations drop cached routes
+    @overloader.implements(to_format=OtherTarget, from_format=Source)
+    def source_to_other(cls, obj):
+        return cls()
+
+    assert overloader.resolve(SubSource, OtherTarget).converter is source_to_other
+
+
+def test_route_max_hops(overloader):
+    @overloader.implements(to_format=OtherTarget, from_format=Target)
+    def target_to_other(cls, obj):
+        return cls()
+
+    with pytest.raises(NotImplementedError):
+        overloader.resolve(Source, OtherTarget)
+
+    overloader.max_hops = 2
+    assert isinstance(overloader.resolve(Source, OtherTarget)(Source(), OtherTarget), OtherTarget)
+
+    with pytest.raises(NotImplementedError, match="no route from 'int' to 'OtherTarget' in 2 hops"):
+        overloader.resolve(int, OtherTarget)
+
+
+def test_route_async_hop():
+    overloader = ToFormatOverloader(max_hops=2)
+
+    @overloader.implements(to_format=Target, from_format=Source)
+    async def source_to_target(cls, obj):
+        return cls()
+
+    @overloader.implements(to_format=OtherTarget, from_format=Target)
+    def target_to_other(cls, obj):
+        return cls()
+
+    # the async implementation would pass an awaitable on to the next hop
+    with pytest.raises(NotImplementedError, match="no route from 'Source' to 'OtherTarget'"):
+        overloader.resolve(Source, OtherTarget)
+
+
+def test_cost_direct(overloader):
+    # the exact-type implementation is first in MRO order...
+    @overloader.implements(to_format=Target, from_format=SubSource, cost=5)
+    def subsource_to_target(cls, obj):
+        return cls()
+
+    # ...but the covariant-parent implementation is cheaper
+    impl = overloader.resolve(SubSource, Target)
+    assert impl.converter.__name__ == "source_to_target"
+    assert impl.cost == 1
+    assert impl.route == (impl,)
+
+    # as do the lookups of a frozen overloader
+    frozen = overloader.freeze()
+
+    class Leaf(SubSource):
+        """Defined after freezing."""
+
+    assert frozen.resolve(Leaf, Target).converter.__name__ == "source_to_target"
+
+
+def test_cost_closest_format():
+    class Format:
+        """A format."""
+
+    class SubFormat(Format):
+        """Subclass of Format."""
+
+    overloader = ToFormatOverloader()
+    overloader.implements(to_format=Format, from_format=Source)(to_target)
+    overloader.implements(to_format=SubFormat, from_format=int)(to_target)
+
+    # the closest registered format decides, however cheap the base format's
+    # implementation is
+    with pytest.raises(NotImplementedError):
+        overloader.resolve(Source, SubFormat)
+    with pytest.raises(NotImplementedError):
+        overloader[SubFormat].dispatch(Source)
+    with pytest.raises(NotImplementedError):
+        overloader.freeze().resolve(Source, SubFormat)
+
+
+def test_cost_route():
+    overloader = ToFormatOverloader(max_hops=3)
+
+    @overloader.implements(to_format=OtherTarget, from_format=Source, cost=10)
+    def source_to_other(cls, obj):
+        return cls()
+
+    @overloader.implements(to_format=Target, from_format=Source, cost=2)
+    def source_to_target(cls, obj):
+        return cls()
+
+    @overloader.implements(to_format=OtherTarget, from_format=Target, cost=3)
+    def target_to_other(cls, obj):
+        return cls()
+
+    impl = overloader.resolve(Source, OtherTarget)
+    assert [hop.converter for hop in impl.route] == [source_to_target, target_to_other]
+    assert impl.cost == 5  # noqa: PLR2004
+
+    overloader.max_hops = 1
+    assert overloader.resolve(Source, OtherTarget).converter is source_to_other
+
+
+def test_calibrate(overloader):
+    @overloader.implements(to_format=OtherTarget, from_format=Source)
+    def source_to_other(cls, obj, required):
+        return cls()
+
+    @overloader.implements(to_format=OtherTarget, from_format=Target)
+    def target_to_other(cls, obj):
+        time.sleep(0.001)
+        return cls()
+
+    costs = overloader.calibrate([SubSource(), Source(), Target()], number=2)
+
+    assert list(costs) == [(Source, Target), (Target, OtherTarget)]  # `source_to_other` fails without arguments
+    assert overloader.resolve(Source, Target).cost == costs[(Source, Target)]
+    assert overloader.resolve(Source, OtherTarget).cost == 1
+    # in units of the median time, here of the slower implementation
+    assert costs[(Target, OtherTarget)] == 1
+    assert costs[(Source, Target)] < 0.5  # noqa: PLR2004
+
+
+@pytest.mark.filterwarnings("error")  # no coroutine is left unawaited
+def test_calibrate_async_and_batch():
+    overloader = ToFormatOverloader()
+
+    @overloader.implements(to_format=Target, from_format=Source)
+    async def source_to_target(cls, obj):
+        return cls()
+
+    @overloader.implements(to_format=OtherTarget, from_format=Source, batch=True)
+    def sources_to_other(cls, objs):
+        time.sleep(0.01)  # per batch, not per object
+        return [cls() for _ in objs]
+
+    @overloader.implements(to_format=OtherTarget, from_format=Target)
+    def target_to_other(cls, obj):
+        time.sleep(0.001)
+        return cls()
+
+    costs = overloader.calibrate([Source(), Target()], number=50)
+
+    # the async implementation isn't timed...
+    assert list(costs) == [(Source, OtherTarget), (Target, OtherTarget)]
+    assert overloader.resolve(Source, Target).cost == 1
+    # ...and the batch converter is timed per object of a batch
+    assert costs[(Source, OtherTarget)] < costs[(Target, OtherTarget)]
+
+
+def test_registering(overloader):
+    overloader.resolve(Source, Target)
+    overloader.resolve(SubSource, Target)
+
+    with overloader.registering():
+
+        @overloader.implements(to_format=Target, from_format=SubSource)
+        def subsource_to_target(cls, obj):
+            return cls()
+
+        # the cache is not scanned until the block ends...
+        assert (SubSource, Target) in overloader._resolved  # noqa: SLF001
+        with overloader.registering():
+            overloader.implements(to_format=OtherTarget, from_format=Source)(subsource_to_target)
+        assert (SubSource, Target) in overloader._resolved  # noqa: SLF001
+
+    # ...then only the affected pairs are dropped
+    assert (Source, Target) in overloader._resolved  # noqa: SLF001
+    assert (SubSource, Target) not in overloader._resolved  # noqa: SLF001
+    assert overloader.resolve(SubSource, Target).converter is subsource_to_target
+
+
+def test_registering_resolve(overloader):
+    overloader.resolve(SubSource, Target)
+
+    with overloader.registering():
+
+        @overloader.implements(to_format=Target, from_format=SubSource)
+        def subsource_to_target(cls, obj):
+            return cls()
+
+        # resolving in the block sees the registrations made so far
+        assert overloader.resolve(SubSource, Target).converter is subsource_to_target
+
+
+def register_then_fail(overloader):
+    with overloader.registering():
+        overloader.implements(to_format=Target, from_format=SubSource)(to_targets)
+        raise RuntimeError
+
+
+def test_registering_rollback(overloader):
+    overloader.resolve(SubSource, Target)
+
+    async def ato_target(cls, obj):
+        return cls()
+
+    # async converters can't be cached, so the second registration fails...
+    with pytest.raises(TypeError, match="can't be cached"):
+        overloader.register_many({(Source, OtherTarget): to_target, (SubSource, Target): ato_target}, cache=True)
+    # ...and the first is dropped
+    assert list(overloader) == [Target]
+    assert overloader.resolve(SubSource, Target).converter.__name__ == "source_to_target"
+
+    # nested blocks drop their own registrations
+    with overloader.registering():
+        overloader.implements(to_format=OtherTarget, from_format=Source)(to_target)
+        with pytest.raises(RuntimeError):
+            register_then_fail(overloader)
+        assert overloader.resolve(SubSource, Target).converter.__name__ == "source_to_target"
+    assert list(overloader) == [Target, OtherTarget]
+    assert overloader.resolve(SubSource, Target).converter.__name__ == "source_to_target"
+    assert not overloader._deferring  # noqa: SLF001
+
+
+def test_register_many(overloader):
+    overloader.resolve(SubSource, Target)
+
+    def convert(cls, obj):
+        return cls()
+
+    overloader.register_many({(SubSource, Target): convert, (Source, OtherTarget): convert}, view=True)
+
+    assert set(overloader) == {Target, OtherTarget}
+    assert overloader.resolve(SubSource, Target).converter is convert
+    assert overloader.resolve(Source, OtherTarget).view
+    assert not overloader._deferring  # noqa: SLF001
+
+    with pytest.raises(TypeError, match="can't register"):
+        overloader.freeze().register_many({(Source, Target): convert})
+
+
+def test_constraints_interned(overloader):
+    overloader.implements(to_format=Target, from_format=SubSource)(to_target)
+    overloader.implements(to_format=OtherTarget, from_format=SubSource)(to_target)
+
+    source, subsource = overloader[Target].registry[Source], overloader[Target].registry[SubSource]
+    assert source.to_constraint is subsource.to_constraint
+    assert subsource.from_constraint is overloader[OtherTarget].registry[SubSource].from_constraint
+
+
+def test_mapping(overloader):
+    assert list(overloader) == [Target]
+    assert len(overloader) == 1
+    assert object not in overloader
+    assert list(overloader.values()) == [overloader[Target]]
+    with pytest.raises(KeyError):
+        overloader[object]
+
+
+def test_targets_for(overloader):
+    class Format:
+        """Format."""
+
+    class SubFormat(Format):
+        """Subclass of Format."""
+
+    overloader.implements(to_format=Format, from_format=Source)(to_target)
+    assert overloader.targets_for(SubSource) == (Target, Format)
+    assert overloader.targets_for(int) == ()
+    assert overloader.sources_for(SubFormat) == (Source,)
+    assert overloader.reachable(SubSource, SubFormat)
+
+    # the indexes are updated on registration, and an implementation
+    # for a format also converts to its registered subclasses
+    overloader.implements(to_format=SubFormat, from_format=int)(to_target)
+    overloader.implements(to_format=OtherTarget, from_format=Target)(to_target)
+    assert overloader.targets_for(SubSource) == (Target, Format, SubFormat)
+    assert overloader.targets_for(int) == (SubFormat,)
+    assert overloader.sources_for(SubFormat) == (Source, int)
+    assert overloader.sources_for(OtherTarget) == (Target,)
+
+    # chains
+    assert not overloader.reachable(Source, OtherTarget)
+    assert overloader.reachable(Source, OtherTarget, max_hops=2)
+    assert overloader.targets_for(Target, max_hops=2) == (OtherTarget,)
+    overloader.max_hops = 2
+    assert overloader.targets_for(Source) == (Target, Format, SubFormat, OtherTarget)
+    assert [impl.formats for impl in overloader.resolve(Source, OtherTarget).route] == [
+        (Source, Target),
+        (Target, OtherTarget),
+    ]
+
+    frozen = overloader.freeze()
+    assert frozen.targets_for(Source) == (Target, Format, SubFormat, OtherTarget)
+    assert frozen.sources_for(SubFormat) == (Source, int)
+    assert not frozen.reachable(OtherTarget, Target)
+
+
+def test_freeze(overloader):
+    @overloader.implements(to_format=Target, from_format=SubSource)
+    def subsource_to_target(cls, obj):
+        return cls()
+
+    class SubSubSource(SubSource):
+        """Subclass of SubSource, converted before freezing."""
+
+    class Leaf(SubSource):
+        """Subclass of SubSource, not converted before freezing."""
+
+    overloader.resolve(SubSubSource, Target)
+    frozen = overloader.freeze()
+
+    assert frozen.freeze() is frozen
+    assert frozen.resolve(Source, Target) is overloader.resolve(Source, Target)
+    assert frozen.resolve(SubSource, Target).converter is subsource_to_target
+    # the registered and resolved pairs, not those of every subclass
+    assert set(frozen._table) == {(Source, Target), (SubSource, Target), (SubSubSource, Target)}  # noqa: SLF001
+    with pytest.raises(NotImplementedError):
+        frozen.resolve(int, Target)
+
+    # other classes are resolved from the registrations
+    class SubTarget(Target):
+        """Subclass of Target."""
+
+    assert frozen.resolve(SubSubSource, SubTarget).converter is subsource_to_target
+    assert frozen.resolve(Leaf, Target).converter is subsource_to_target
+
+    # mapping of copies
+    assert list(frozen) == [Target]
+    assert Target in frozen
+    assert frozen[Target].dispatch(SubSource).converter is subsource_to_target
+    assert frozen(SubTarget).dispatch(Source).converter.__name__ == "source_to_target"
+
+    with pytest.raises(TypeError, match="can't register"):
+        frozen.implements(to_format=Target, from_format=int)
+    with pytest.raises(TypeError, match="can't register"):
+        frozen.register_many({(int, Target): to_target})
+    assert frozen.max_hops == 1
+    with pytest.raises(TypeError, match="can't change max_hops of a frozen overloader"):
+        frozen.max_hops = 2
+
+
+def test_snapshot(overloader):
+    with pytest.raises(ValueError, match="can't snapshot converter"):
+        overloader.snapshot()  # converter defined in a function
+
+    overloader = ToFormatOverloader(max_hops=2)
+    constraint = AnyOf(Source, Not(OneOfExact(int, float)))
+    overloader.implements(to_format=Target, from_format=Source, from_constraint=constraint)(to_target)
+    overloader.implements(to_format=Target, from_format=SubSource, cache=True)(to_target)
+    overloader.implements(to_format=OtherTarget, from_format=Target, batch=True)(to_targets)
+    overloader.instrument()  # converters are unwrapped
+
+    snapshot = pickle.loads(pickle.dumps(overloader.snapshot()))  # noqa: S301
+    loaded = FrozenToFormatOverloader.from_snapshot(snapshot)
+
+    # pairs of types defined in functions are left out
+    assert {(Source, OtherTarget), (SubSource, Target)} <= set(loaded._table) <= set(overloader.freeze()._table)  # noqa: SLF001
+    assert loaded.max_hops == 2  # noqa: PLR2004
+    assert set(loaded) == {Target, OtherTarget}
+
+    # converters are imported on their first call
+    impl = loaded.resolve(Source, Target)
+    assert impl.from_constraint == constraint
+    assert isinstance(impl.converter, LazyConverter)
+    assert impl.converter._converter is None  # noqa: SLF001
+    assert isinstance(impl(Source(), Target), Target)
+    assert impl.converter._converter is to_target  # noqa: SLF001
+
+    # chains, batch converters and the result cache
+    chain = loaded.resolve(Source, OtherTarget)
+    assert [hop.formats for hop in chain.route] == [(Source, Target), (Target, OtherTarget)]
+    assert isinstance(chain(Source(), OtherTarget), OtherTarget)
+    assert loaded.resolve(SubSource, Target).cache is loaded.result_cache
+
+    with pytest.raises(ValueError, match="version"):
+        FrozenToFormatOverloader.from_snapshot(snapshot._replace(version=0))
+
+
+def test_stats(overloader):
+    assert overloader.stats() == {}
+    overloader.instrument()
+
+    @overloader.implements(to_format=OtherTarget, from_format=Source, from_constraint=Invariant(Source))
+    def source_to_other(cls, obj):
+        return cls()
+
+    overloader.resolve(SubSource, Target)(SubSource(), Target)
+    pair = overloader.stats()[(SubSource, Target)]
+    assert (pair.calls, pair.hits, pair.misses) == (1, 0, 1)
+    assert pair.time > 0
+
+    overloader.to_format_many([SubSource(), SubSource()], Target)
+    with pytest.raises(ValueError, match="is not compatible with from_constraint"):
+        overloader.resolve(SubSource, OtherTarget)(SubSource(), OtherTarget)
+
+    stats = overloader.stats(reset=True)
+    assert stats[(SubSource, Target)][:4] == (3, 1, 1, 0)
+    assert stats[(SubSource, OtherTarget)][:4] == (0, 0, 1, 1)
+    assert overloader.stats()[(SubSource, Target)] == (0, 0, 0, 0, 0.0)
+
+    # off, the resolved implementations are the registered ones
+    overloader.instrument(enabled=False)
+    assert overloader.resolve(SubSource, Target) is overloader[Target].dispatch(Source)
+    assert overloader.stats() == {}
+
+
+@pytest.mark.filterwarnings("error")  # no coroutine is left unawaited
+def test_stats_async(overloader):
+    @overloader.implements(to_format=OtherTarget, from_format=Source)
+    async def source_to_other(cls, obj):
+        return cls()
+
+    @overloader.implements(to_format=Target, from_format=Source, batch=True)
+    async def sources_to_targets(cls, objs):
+        return [cls() for _ in objs]
+
+    # the timed converters are async as the registered ones
+    overloader.instrument()
+    assert overloader.resolve(Source, OtherTarget).is_async
+    with pytest.raises(TypeError, match="the converter from 'Source' to 'OtherTarget' is async"):
+        overloader.to_format_many([Source()], OtherTarget)
+    with pytest.raises(TypeError, match="the batch converter from 'Source' to 'Target' is async"):
+        overloader.to_format_many([Source()], Target)
+
+
+PLUGIN = """
+from tests.unittests.test_overload import OtherTarget, Source
+
+
+def register(overloader):
+    overloader.implements(to_format=OtherTarget, from_format=Source)(lambda cls, obj: cls())
+"""
+
+
+@pytest.mark.parametrize("function", [False, True])
+def test_plugins(overloader, tmp_path, monkeypatch, function):
+    module = f"plugin_{function}"
+    # a module-style plugin registers on import
+    source = (
+        PLUGIN
+        if function
+        else PLUGIN + "\nfrom tests.unittests.test_overload import PLUGIN_TO\n\nregister(PLUGIN_TO)\n"
+    )
+    (tmp_path / f"{module}.py").write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys.modules[__name__], "PLUGIN_TO", overloader, raising=False)
+    monkeypatch.delitem(sys.modules, module, raising=False)
+
+    overloader.register_plugin(f"{__name__}.OtherTarget", f"{module}:register" if function else module)
+    overloader.resolve(Source, Target)
+    assert module not in sys.modules
+
+    assert isinstance(overloader.resolve(SubSource, OtherTarget)(Source(), OtherTarget), OtherTarget)
+    assert module in sys.modules
+    assert not overloader._plugins  # noqa: SLF001
+
+
+def test_plugins_while_registering(overloader, monkeypatch):
+    loading, in_block = threading.Event(), threading.Event()
+
+    def register(overloader):
+        loading.set()
+        in_block.wait(5)
+        overloader.implements(to_format=OtherTarget, from_format=Source)(to_target)
+
+    monkeypatch.setattr(sys.modules[__name__], "PLUGIN_REGISTER", register, raising=False)
+    overloader.register_plugin(f"{__name__}.OtherTarget", f"{__name__}:PLUGIN_REGISTER")
+    results = {}
+
+    def convert():
+        results["convert"] = overloader.resolve(Source, OtherTarget).converter
+
+    def resolve_in_block():
+        loading.wait(5)
+        with overloader.registering():
+            in_block.set()
+            # the plugin is loading in the other thread, which registers when the block ends
+            try:
+                overloader.resolve(Source, OtherTarget)
+            except NotImplementedError as error:
+                results["block"] = error
+
+    threads = [threading.Thread(target=target, daemon=True) for target in (convert, resolve_in_block)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert not any(thread.is_alive() for thread in threads)  # no deadlock
+    assert results["convert"] is to_target
+    assert isinstance(results["block"], NotImplementedError)
+    assert not overloader._plugins  # noqa: SLF001
+
+
+def test_load_entry_points(overloader, monkeypatch):
+    eps = [EntryPoint(f"{__name__}.OtherTarget", "no_such_module", "group")]
+
+    def entry_points(group=None):
+        return {"group": eps} if group is None else [ep for ep in eps if ep.group == group]
+
+    monkeypatch.setattr("importlib.metadata.entry_points", entry_points)
+    overloader.load_entry_points("group")
+    overloader.resolve(Source, Target)  # other formats don't load the plugin
+
+    with pytest.raises(ModuleNotFoundError, match="no_such_module"):
+        overloader.resolve(Source, OtherTarget)
+    with pytest.raises(ModuleNotFoundError):  # still pending
+        overloader.freeze()